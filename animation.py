@@ -1,31 +1,167 @@
 # --- START OF FILE animation.py ---
 
 import tkinter as tk
-from PIL import Image, ImageTk
+from collections import OrderedDict, deque
+from PIL import Image
 import config # Import settings
+import tk_photo
+import log
 
-def _update_animation_step(button, image_to_resize_pil, target_width, target_height):
-    """ Helper: Updates button image to a specific size during animation. """
+_log = log.get_logger("anim")
+
+# --- Speed Setting & Running Animations ---
+class AnimationContext:
+    """
+    Animation speed and running animations of one board (game_session.GameSession.animations,
+    or a replay viewer), so boards sharing a process never skip or wait for each other.
+    Every running animation (card flip or dice roll) registers an object with a skip() method
+    that jumps it straight to its final frame, producing exactly the same outcome.
+    """
+    def __init__(self, speed=config.DEFAULT_ANIMATION_SPEED):
+        self.speed = speed
+        self._running = []
+
+    def set_speed(self, speed_name):
+        """Sets this board's animation speed ("1x", "2x" or "Instant")."""
+        if speed_name not in config.ANIMATION_SPEEDS:
+            _log.warning(f"Unknown animation speed '{speed_name}'. Keeping {self.speed}.")
+            return
+        self.speed = speed_name
+        if _log.debug_on: _log.debug(f"Animation speed set to {speed_name}.")
+        if self.is_instant(): self.skip_all() # Anything still running finishes now
+
+    def is_instant(self):
+        """True when animations should jump straight to their final frame."""
+        return config.ANIMATION_SPEEDS[self.speed] is None
+
+    def scaled_delay(self, delay_ms):
+        """Scales a frame delay by the current speed factor (never below 1 ms)."""
+        factor = config.ANIMATION_SPEEDS[self.speed]
+        if factor is None: return 1
+        return max(1, int(delay_ms / factor))
+
+    def scaled_steps(self, steps):
+        """Scales a frame count by the current speed factor (fewer frames = faster)."""
+        factor = config.ANIMATION_SPEEDS[self.speed]
+        if factor is None: return 0
+        return max(1, int(steps / factor))
+
+    def register(self, animation):
+        if animation not in self._running: self._running.append(animation)
+
+    def unregister(self, animation):
+        if animation in self._running: self._running.remove(animation)
+
+    def is_running(self):
+        return bool(self._running)
+
+    def skip_all(self, event=None):
+        """Jumps every running animation of this board to its final frame."""
+        for running in list(self._running): # skip() unregisters, so iterate a copy
+            running.skip()
+
+    def bind_skip(self, root, frames, escape=True):
+        """
+        A click inside frames (at any depth) skips the running animations. The skip runs on
+        release, after the clicked button's own command: a grid click made during a flip is
+        queued first (input_queue) and replayed once the skip has finished the flip.
+        escape: Escape skips them too (application-wide, so only for a single board per window).
+        """
+        def on_click(event):
+            if self._running and _inside(event.widget, frames): self.skip_all()
+        root.bind_all("<ButtonRelease-1>", on_click, add="+")
+        if escape: root.bind_all("<Escape>", self.skip_all, add="+")
+
+def _inside(widget, frames):
+    """True if widget is one of frames or a descendant of one (Tk path names nest)."""
+    path = str(widget)
+    return any(path == str(frame) or path.startswith(str(frame).rstrip(".") + ".") for frame in frames)
+
+# --- Flip Frame Cache & Prefetch ---
+# The frames of a flip only depend on the image and the step count, so they are built once
+# and kept in the shared asset dict (assets["flip_frames"]): the card back frames (used by
+# every flip) and the face frames of the most recently used faces (FLIP_FRAME_CACHE_SIZE).
+# A FlipPrefetcher builds the frames of the cards likely to be flipped next in idle time,
+# one frame per idle callback, so the next flip starts without resizing anything.
+# Frames still missing when a flip reaches them are built on the spot, as before.
+FLIP_BACK = "back" # Frame cache key of the card back
+
+def face_key(card):
+    """Image key of a card face ("hearts_ace")."""
+    return f"{str(card.get_suit()).lower()}_{str(card.get_rank_string()).lower()}"
+
+def _flip_frames(assets, key, steps):
+    """The frame list (entries None until built) for key (face key or FLIP_BACK) at steps frames."""
+    cache = assets.setdefault("flip_frames", OrderedDict())
+    frames = cache.get((key, steps))
+    if frames is None:
+        frames = cache[(key, steps)] = [None] * steps
+        while len(cache) > config.FLIP_FRAME_CACHE_SIZE: cache.popitem(last=False) # Least recently used
+    else:
+        cache.move_to_end((key, steps))
+    return frames
+
+def _flip_frame(root, assets, key, steps, index):
+    """Frame index of the shrinking back (FLIP_BACK) or growing face (face key) of a flip, built if missing."""
+    frames = _flip_frames(assets, key, steps)
+    if frames[index] is None:
+        if key == FLIP_BACK:
+            image_pil, fraction = assets["card_back_pil_scaled"], 1.0 - (index + 1) / steps
+        else:
+            image_pil, fraction = assets["pil_faces_scaled"][key], (index + 1) / steps
+        size = (max(1, int(assets["width"] * fraction)), max(1, assets["height"]))
+        frames[index] = tk_photo.photo_image(image_pil.resize(size, Image.Resampling.LANCZOS), master=root)
+    return frames[index]
+
+def _update_animation_step(root, button, assets, key, steps, index):
+    """ Helper: Shows one flip frame on the button. """
     if not button.winfo_exists(): return # Check if button still exists
-    target_width = max(1, target_width) # Ensure width is at least 1 pixel
-    target_height = max(1, target_height) # Ensure height is at least 1
     try:
-        # Add check if image_to_resize_pil is valid
-        if image_to_resize_pil is None:
-             print(f"Error in _update_animation_step: Attempted to resize a None image.")
-             return
-        resized_image_pil = image_to_resize_pil.resize((target_width, target_height), Image.Resampling.LANCZOS)
-        new_tk_image = ImageTk.PhotoImage(resized_image_pil)
+        new_tk_image = _flip_frame(root, assets, key, steps, index)
         button.config(image=new_tk_image)
         button.image = new_tk_image # IMPORTANT: Keep reference
     except Exception as e:
         if button.winfo_exists():
              if isinstance(e, tk.TclError): pass
-             else: print(f"Error in _update_animation_step: {e}")
+             else: _log.error(f"Error in _update_animation_step: {e}")
+
+class FlipPrefetcher:
+    """Builds the flip frames of given cards in idle time (one frame per idle callback)."""
+    def __init__(self, root, assets, animations):
+        self.root = root
+        self.assets = assets
+        self.animations = animations # The board's AnimationContext (frame count at its speed)
+        self._work = deque() # (key, steps, index) still to build
+        self._after_id = None
+        self.built = 0
+
+    def prefetch(self, cards):
+        """Replaces the pending work with the frames of cards (and the card back) at the current speed."""
+        steps = self.animations.scaled_steps(config.ANIMATION_STEPS)
+        if steps == 0: return # Instant: no frames
+        pil_faces = self.assets.get("pil_faces_scaled", {})
+        keys = [FLIP_BACK] + [key for key in dict.fromkeys(face_key(card) for card in cards) if pil_faces.get(key) is not None]
+        cache = self.assets.get("flip_frames", {})
+        self._work = deque((key, steps, index) for key in keys for index in range(steps)
+                           if cache.get((key, steps)) is None or cache[(key, steps)][index] is None)
+        if self._work and self._after_id is None:
+            self._after_id = self.root.after_idle(self._step)
+
+    def _step(self):
+        # Each after_idle registered here runs in the next idle pass, so events are handled in between
+        self._after_id = None
+        if not self._work: return
+        _flip_frame(self.root, self.assets, *self._work.popleft())
+        self.built += 1
+        if self._work:
+            self._after_id = self.root.after_idle(self._step)
+        elif _log.debug_on:
+            _log.debug(f"Flip frames prefetched ({self.built} built so far, {len(self.assets['flip_frames'])} images cached).")
 
-def animate_flip(root, button, card, assets, on_reveal_callback, row, col):
+def animate_flip(root, button, card, assets, on_reveal_callback, row, col, animations):
     """
     Simulates a flip using scheduled image updates.
+    Honours the board's animation speed; a running flip can be skipped (AnimationContext.skip_all).
     Args:
         root: The main Tkinter window (for root.after).
         button: The tk.Button widget to animate.
@@ -33,15 +169,14 @@ def animate_flip(root, button, card, assets, on_reveal_callback, row, col):
         assets: Dictionary containing loaded image assets and dimensions.
         on_reveal_callback: Function to call after animation (takes row, col).
         row, col: Grid coordinates of the card.
+        animations: The board's AnimationContext.
     """
     if not card:
-        print(f"Error: No card data for animation at ({row},{col})")
+        _log.error(f"No card data for animation at ({row},{col})")
         if button.winfo_exists(): button.config(state=tk.NORMAL)
         return
 
-    suit_key = str(card.get_suit()).lower()
-    rank_key = str(card.get_rank_string()).lower()
-    image_key = f"{suit_key}_{rank_key}"
+    image_key = face_key(card)
 
     # --- CORRECTED KEY LOOKUPS ---
     card_face_pil_to_grow = assets["pil_faces_scaled"].get(image_key) # Use "pil_faces_scaled"
@@ -50,39 +185,67 @@ def animate_flip(root, button, card, assets, on_reveal_callback, row, col):
 
     # --- Check if images were found ---
     if not card_back_pil_scaled:
-        print(f"FATAL Error in animate_flip: Scaled PIL card back not found in assets.")
+        _log.error("animate_flip: Scaled PIL card back not found in assets.")
         # Cannot proceed with animation without back image
         if on_reveal_callback: on_reveal_callback(row, col) # Reveal instantly
         return
     if not card_face_pil_to_grow:
-        print(f"Error in animate_flip: Could not find PIL face image for key: {image_key} to animate.")
+        _log.error(f"Error in animate_flip: Could not find PIL face image for key: {image_key} to animate.")
         # Cannot proceed with grow phase, reveal instantly
         if on_reveal_callback: on_reveal_callback(row, col)
         return
     # ----------------------------------
 
-    scaled_width = assets["width"]
-    scaled_height = assets["height"]
-
+    flip = _FlipAnimation(root, button, on_reveal_callback, row, col, animations)
+    if animations.is_instant():
+        flip.skip() # Straight to the revealed face
+        return
+    steps = animations.scaled_steps(config.ANIMATION_STEPS)
 
-    # --- 1. Schedule Shrinking Steps (Using CORRECTED card_back_pil_scaled) ---
-    for step in range(config.ANIMATION_STEPS):
+    # --- 1. Schedule Shrinking Steps (card back frames, cached) ---
+    for step in range(steps):
         delay = (step + 1) * config.ANIMATION_DELAY
-        fraction = 1.0 - (step + 1) / config.ANIMATION_STEPS
-        new_width = int(scaled_width * fraction)
-        root.after(delay, _update_animation_step, button, card_back_pil_scaled, new_width, scaled_height) # Pass correct back image
+        flip.schedule(delay, _update_animation_step, root, button, assets, FLIP_BACK, steps, step)
 
-    # --- 2. Schedule Growing Steps (Using CORRECTED card_face_pil_to_grow) ---
-    base_grow_delay = config.ANIMATION_STEPS * config.ANIMATION_DELAY
-    for step in range(config.ANIMATION_STEPS):
+    # --- 2. Schedule Growing Steps (face frames, cached or prefetched) ---
+    base_grow_delay = steps * config.ANIMATION_DELAY
+    for step in range(steps):
         delay = base_grow_delay + (step + 1) * config.ANIMATION_DELAY
-        fraction = (step + 1) / config.ANIMATION_STEPS
-        new_width = int(scaled_width * fraction)
-        root.after(delay, _update_animation_step, button, card_face_pil_to_grow, new_width, scaled_height) # Pass correct face image
+        flip.schedule(delay, _update_animation_step, root, button, assets, image_key, steps, step)
 
     # --- 3. Schedule the final reveal function call ---
-    final_delay = (config.ANIMATION_STEPS * 2) * config.ANIMATION_DELAY + (config.ANIMATION_DELAY // 2)
-    if on_reveal_callback:
-        root.after(final_delay, on_reveal_callback, row, col)
+    final_delay = (steps * 2) * config.ANIMATION_DELAY + (config.ANIMATION_DELAY // 2)
+    flip.schedule(final_delay, flip.finish)
+    animations.register(flip)
+
+
+class _FlipAnimation:
+    """Tracks the scheduled frames of one card flip so it can be skipped."""
+    def __init__(self, root, button, on_reveal_callback, row, col, animations):
+        self.root = root
+        self.animations = animations
+        self.button = button
+        self.on_reveal_callback = on_reveal_callback
+        self.row, self.col = row, col
+        self.after_ids = []
+        self.finished = False
+
+    def schedule(self, delay, func, *args):
+        self.after_ids.append(self.root.after(delay, func, *args))
+
+    def finish(self):
+        """Final frame: hand over to the reveal callback (sets the full-size face image)."""
+        if self.finished: return
+        self.finished = True
+        self.animations.unregister(self)
+        if self.on_reveal_callback: self.on_reveal_callback(self.row, self.col)
+
+    def skip(self):
+        """Cancels the remaining frames and reveals immediately."""
+        for after_id in self.after_ids:
+            try: self.root.after_cancel(after_id)
+            except tk.TclError: pass
+        self.after_ids = []
+        self.finish()
 
 # --- END OF FILE animation.py ---
\ No newline at end of file
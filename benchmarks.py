@@ -0,0 +1,532 @@
+# --- START OF FILE benchmarks.py ---
+
+# Manual performance checks. Run from the project folder, e.g.:
+#   python benchmarks.py combat_views
+# Most benchmarks open a (withdrawn) Tk root, so a display is required.
+
+import os
+import sys
+import time
+import tkinter as tk
+
+import config
+import ui_manager
+import animation
+import log
+from card_logic import Card
+from player import Player
+from hand_model import HandModel
+
+
+def _widget_paths(widget):
+    """Returns the Tk path names of widget and all its descendants."""
+    paths = {str(widget)}
+    for child in widget.winfo_children(): paths |= _widget_paths(child)
+    return paths
+
+
+def bench_combat_views(num_combats=20):
+    """
+    Runs complete fights (setup -> roll -> results -> OK) through combat.manager and reports
+    how many widgets each fight allocated and how long it took. Widget paths are sampled after
+    every phase, so views built and destroyed within one fight are counted too. With view
+    pooling only the first fight should allocate widgets.
+    """
+    from combat import manager as combat_manager
+    from combat.ui_roll import CombatRollView
+    import game_session
+
+    root = tk.Tk()
+    root.withdraw()
+    grid_frame, info_frame = ui_manager.setup_layout(root, 80, 120)
+    hand_frame, hand_card_slots = ui_manager.setup_hand_display(info_frame, 80, 120)
+
+    target_row, target_col = 0, 0
+    target_card = Card("clubs", 9, "nine")
+    card_data_grid = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+    card_state_grid = [[config.STATE_ACTION_TAKEN for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+    button_grid = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+    hand_card_data = HandModel()
+    target_button = tk.Button(grid_frame, text="target")
+    player = Player(1, 0)
+    player.suit = config.PLAYER_SUIT
+    session = game_session.GameSession()
+    session.animations.set_speed("Instant") # Measure the UI work, not the animation delays
+    combat = combat_manager.CombatManager(session)
+    game_state = {
+        "card_data_grid": card_data_grid, "button_grid": button_grid, "card_state_grid": card_state_grid,
+        "hand_card_data": hand_card_data, "hand_card_slots": hand_card_slots,
+        "assets": {"tk_faces": {}, "pil_dice_scaled": {}},
+        "info_frame": info_frame, "hand_frame": hand_frame, "root": root,
+        "session": session, "dice_rng": session.dice_rng,
+    }
+
+    seen_paths = _widget_paths(info_frame)
+    print(f"\n{'fight':>5} {'new widgets':>12} {'ms':>8}")
+    for fight in range(num_combats):
+        # Put the hazard back on the board for every fight
+        card_data_grid[target_row][target_col] = target_card
+        card_state_grid[target_row][target_col] = config.STATE_FACE_UP
+        button_grid[target_row][target_col] = target_button
+        target_button.grid(row=target_row, column=target_col)
+        player.set_position(1, 0)
+
+        fight_paths = set()
+        start = time.perf_counter()
+        combat.initiate_combat(player, target_card, target_row, target_col, game_state)
+        fight_paths |= _widget_paths(info_frame)
+        combat.current_view._confirm_fight() # Fight with no card
+        fight_paths |= _widget_paths(info_frame)
+        view = combat.current_view
+        if isinstance(view, CombatRollView):
+            view._start_diff_dice_roll()   # Instant speed: jumps to the final frame
+            view._start_danger_die_roll()  # ... and finalizes into the results view
+            fight_paths |= _widget_paths(info_frame)
+        combat.current_view._ok()
+        root.update_idletasks() # Include the geometry pass
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        fight_paths |= _widget_paths(info_frame)
+        print(f"{fight + 1:>5} {len(fight_paths - seen_paths):>12} {elapsed_ms:>8.2f}")
+        seen_paths |= fight_paths
+
+    root.destroy()
+
+
+def bench_click_latency(rounds=5):
+    """
+    Click-to-reveal latency (game_logic.handle_card_click -> on_card_revealed) for every
+    card on the board, with logging off versus every subsystem at debug level.
+    Animations run at Instant speed so only the click handling itself is timed.
+    """
+    from PIL import Image, ImageTk
+    import game_logic
+    import game_session
+    from card_logic import create_shuffled_deck
+
+    root = tk.Tk()
+    root.withdraw()
+    grid_frame, info_frame = ui_manager.setup_layout(root, 80, 120)
+    hand_frame, hand_card_slots = ui_manager.setup_hand_display(info_frame, 80, 120)
+    deck = create_shuffled_deck()
+    pil_back = Image.new("RGBA", (80, 120), "navy")
+    pil_faces = {f"{card.get_suit()}_{card.get_rank_string()}": Image.new("RGBA", (80, 120), "white") for card in deck}
+    assets = {
+        "card_back_pil_scaled": pil_back, "pil_faces_scaled": pil_faces, "width": 80, "height": 120,
+        "tk_photo_back": ImageTk.PhotoImage(pil_back, master=root),
+        "tk_faces": {key: ImageTk.PhotoImage(img, master=root) for key, img in pil_faces.items()},
+    }
+    cells = [(r, c) for r in range(config.ROWS) for c in range(config.COLUMNS)]
+    card_data_grid = [[deck[r * config.COLUMNS + c] for c in range(config.COLUMNS)] for r in range(config.ROWS)]
+    button_grid = [[tk.Button(grid_frame, image=assets["tk_photo_back"]) for c in range(config.COLUMNS)] for r in range(config.ROWS)]
+    player = Player(config.ROWS // 2, config.COLUMNS // 2)
+    player.suit = config.PLAYER_SUIT
+
+    def run_round():
+        card_state_grid = [[config.STATE_FACE_DOWN for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+        session = game_session.GameSession()
+        session.animations.set_speed("Instant")
+        session.tracker.reset(card_data_grid, card_state_grid)
+        for r, c in cells: button_grid[r][c].config(state=tk.NORMAL, image=assets["tk_photo_back"])
+        start = time.perf_counter()
+        for r, c in cells:
+            game_logic.handle_card_click(r, c, root, player, session, card_data_grid, button_grid, card_state_grid,
+                                         HandModel(), hand_card_slots, assets, info_frame, hand_frame, "grey20")
+        return (time.perf_counter() - start) * 1000 / len(cells)
+
+    results = {}
+    for level in ("off", "debug"):
+        log.set_level(level)
+        results[level] = min(run_round() for _ in range(rounds))
+    log.configure(config.LOG_LEVELS)
+    print(f"\nClick-to-reveal latency per card (best of {rounds} rounds):")
+    for level, ms in results.items():
+        print(f"  logging {level:>5}: {ms:.3f} ms")
+    root.destroy()
+
+
+def _play_random_game(engine, rng):
+    """Plays a whole game on a GameEngine with random (legal) moves."""
+    from card_logic import create_grid_deal
+    from game_engine import ACTION_COMBAT
+    from combat import setup as combat_setup
+    engine.deal(create_grid_deal(rng))
+    for _ in range(500):
+        cells = [(r, c) for r in range(config.ROWS) for c in range(config.COLUMNS)
+                 if engine.card_state_grid[r][c] != config.STATE_ACTION_TAKEN]
+        if not cells: return
+        if engine.history.can_undo() and rng.random() < 0.05:
+            engine.undo()
+            continue
+        if engine.history.can_redo() and rng.random() < 0.3:
+            engine.redo()
+            continue
+        r, c = rng.choice(cells)
+        if engine.card_state_grid[r][c] == config.STATE_FACE_DOWN:
+            engine.reveal(r, c)
+        elif engine.act(r, c) == ACTION_COMBAT:
+            if rng.random() < 0.1:
+                engine.cancel_combat()
+                continue
+            options = [None] + [card for card, _, _ in engine.hand.find(lambda card: combat_setup.is_value_card(card, engine.player_suit))]
+            if not engine.choose_value_card(rng.choice(options)):
+                n = engine.combat["params"]["num_diff_dice"]
+                engine.roll([rng.randint(1, 6) for _ in range(n)], rng.randint(1, 6))
+
+
+def bench_game_log(num_games=2000):
+    """
+    Size and parse speed of the binary game log versus the same events as JSON lines,
+    plus a full replay check of every game. Headless (no Tk root needed).
+    """
+    import json
+    import random
+    import tempfile
+    import os
+    import game_record
+    from game_engine import GameEngine
+    from game_events import EVENT_NAMES
+
+    rng = random.Random(1234)
+    games = []
+    for _ in range(num_games):
+        events = []
+        _play_random_game(GameEngine(on_event=lambda kind, *payload: events.append((kind, payload))), rng)
+        games.append(events)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "games.jlg")
+        writer = game_record.open_log(log_path)
+        for events in games:
+            for kind, payload in events: writer.put(kind, payload)
+        writer.close()
+        binary_size = os.path.getsize(log_path)
+        json_text = "".join(json.dumps({"event": EVENT_NAMES[kind], "args": payload}) + "\n"
+                            for events in games for kind, payload in events)
+
+        start = time.perf_counter()
+        read_back = list(game_record.read_games(log_path))
+        binary_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        parsed = [json.loads(line) for line in json_text.splitlines()]
+        json_ms = (time.perf_counter() - start) * 1000
+
+    assert read_back == games, "Game log did not round-trip"
+    start = time.perf_counter()
+    for events in read_back: game_record.replay_game(events)
+    replay_ms = (time.perf_counter() - start) * 1000
+
+    num_events = len(parsed)
+    print(f"\n{num_games} games, {num_events} events")
+    print(f"  binary log: {binary_size:>10} bytes ({binary_size / num_games:.0f} per game), parse {binary_ms:.1f} ms")
+    print(f"  JSON lines: {len(json_text):>10} bytes ({len(json_text) / binary_size:.1f}x larger), parse {json_ms:.1f} ms")
+    print(f"  replay + verify all games: {replay_ms:.1f} ms")
+
+
+def bench_undo_memory(num_games=200):
+    """
+    Memory held by a full undo history: distinct row tuples kept alive by the shared
+    snapshots versus deep-copying every grid at every checkpoint. Headless.
+    """
+    import random
+    from game_engine import GameEngine
+
+    rng = random.Random(99)
+    shared_rows = copied_rows = checkpoints = 0
+    for _ in range(num_games):
+        engine = GameEngine()
+        snapshots = []
+        commit = engine.history.commit
+        def recording_commit(snapshot):
+            if commit(snapshot): snapshots.append(snapshot)
+        engine.history.commit = recording_commit
+        _play_random_game(engine, rng)
+        checkpoints += len(snapshots)
+        rows = {id(row): row for snap in snapshots for grid in (snap.cards, snap.states, snap.hand) for row in grid}
+        shared_rows += len(rows)
+        copied_rows += sum(len(snap.cards) + len(snap.states) + len(snap.hand) for snap in snapshots)
+
+    print(f"\n{num_games} games, {checkpoints} undo checkpoints ({checkpoints / num_games:.0f} per game)")
+    print(f"  row tuples, structural sharing: {shared_rows:>9} ({shared_rows / checkpoints:.2f} new rows per checkpoint)")
+    print(f"  row tuples, deep copy per step: {copied_rows:>9} ({copied_rows / shared_rows:.1f}x more)")
+
+
+def bench_savegame(num_games=200):
+    """
+    Autosave cost per checkpoint: packed save size and encode/decode time, against
+    pickling the same snapshot. Headless; round-trips every checkpoint.
+    """
+    import pickle
+    import random
+    import savegame
+    from game_engine import GameEngine
+
+    rng = random.Random(7)
+    snapshots = []
+    for _ in range(num_games):
+        engine = GameEngine()
+        commit = engine.history.commit
+        def recording_commit(snapshot):
+            if commit(snapshot): snapshots.append(snapshot)
+        engine.history.commit = recording_commit
+        _play_random_game(engine, rng)
+
+    rng_state = 0x0123456789ABCDEF
+    start = time.perf_counter()
+    saves = [savegame.encode_save(snap, rng_state) for snap in snapshots]
+    encode_s = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded = [savegame.decode_save(data) for data in saves]
+    decode_s = time.perf_counter() - start
+    start = time.perf_counter()
+    pickles = [pickle.dumps((snap, rng_state), pickle.HIGHEST_PROTOCOL) for snap in snapshots]
+    pickle_s = time.perf_counter() - start
+    mismatches = sum(1 for snap, (loaded_snap, state) in zip(snapshots, loaded) if loaded_snap != snap or state != rng_state)
+
+    n = len(snapshots)
+    print(f"\n{n} checkpoints from {num_games} games")
+    print(f"  packed save: {sum(map(len, saves)) / n:6.1f} bytes, encode {encode_s / n * 1e6:6.1f} us, decode {decode_s / n * 1e6:6.1f} us")
+    print(f"  pickle:      {sum(map(len, pickles)) / n:6.1f} bytes, dumps  {pickle_s / n * 1e6:6.1f} us")
+    print(f"  round-trip mismatches: {mismatches}")
+
+
+def bench_deal_codes(num_deals=5000):
+    """
+    Deal code encode/decode time and size against storing the full deal as card codes.
+    Headless; every code must decode back to the same deal.
+    """
+    import random
+    import deal_codes
+    from card_logic import create_grid_deal
+
+    rng = random.Random(11)
+    deals = [create_grid_deal(rng) for _ in range(num_deals)]
+    start = time.perf_counter()
+    codes = [deal_codes.encode_deal(deal) for deal in deals]
+    encode_s = time.perf_counter() - start
+    start = time.perf_counter()
+    decoded = [deal_codes.decode_deal(code) for code in codes]
+    decode_s = time.perf_counter() - start
+    mismatches = sum(1 for deal, back in zip(deals, decoded) if deal != back)
+
+    print(f"\n{num_deals} deals, code length {deal_codes.CODE_LENGTH} characters (full deal: {len(deals[0])} card codes)")
+    print(f"  encode {encode_s / num_deals * 1e6:6.1f} us, decode {decode_s / num_deals * 1e6:6.1f} us per deal")
+    print(f"  distinct codes: {len(set(codes))}, round-trip mismatches: {mismatches}")
+
+
+def bench_record_store(num_games=3000):
+    """
+    "Win rate vs hostile Kings with no value card": columnar store query against scanning
+    the same games in the row-oriented game log. Headless; uses a temporary directory.
+    """
+    import tempfile
+    import random
+    import bot
+    import utils
+    import game_record
+    import record_store
+    from card_logic import card_from_uid, create_grid_deal
+    from game_events import EV_DEAL, EV_COMBAT_START, EV_VALUE_CARD, EV_OUTCOME
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "games.jlg")
+        store_path = os.path.join(tmp, "store")
+        rng, dice_rng = random.Random(5), utils.DiceRng(5)
+        log_writer = game_record.GameLogWriter(log_path)
+        with record_store.StoreWriter(store_path) as writer:
+            collector = record_store.RecordCollector(writer, record_store.SOURCE_BOT)
+            def on_event(kind, *payload):
+                log_writer.put(kind, payload)
+                collector(kind, *payload)
+            for _ in range(num_games):
+                grid_cards = create_grid_deal(rng)
+                collector.begin_game(grid_cards)
+                result = bot.play_game(grid_cards, dice_rng, on_event=on_event)
+                collector.end_game(result.won, result.turns)
+        log_writer.close()
+
+        start = time.perf_counter()
+        fights = wins = 0
+        for events in game_record.read_games(log_path):
+            grid = defender = used = None
+            for kind, payload in events:
+                if kind == EV_DEAL: grid = payload
+                elif kind == EV_COMBAT_START: defender = card_from_uid(grid[payload[0]] - 1)
+                elif kind == EV_VALUE_CARD: used = payload[0]
+                elif kind == EV_OUTCOME and defender.get_rank() == 13 and not used:
+                    fights += 1
+                    wins += payload[0]
+        scan_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = record_store.RecordStore(store_path)
+        kings = store.combats.select(defender_rank=13, used_card=record_store.USED_NONE)
+        store_rate = kings.mean("won")
+        store_s = time.perf_counter() - start
+        total_fights, king_fights = len(store.combats), len(kings)
+        del store, kings # Unmap the columns before the directory is removed
+
+    print(f"\n{num_games} games, {total_fights} fights; {fights} vs hostile Kings with no value card")
+    print(f"  game log scan: {scan_s * 1000:8.1f} ms  (win rate {wins / max(fights, 1):.1%})")
+    print(f"  column store:  {store_s * 1000:8.1f} ms  (win rate {store_rate:.1%}, {king_fights} fights)")
+
+
+def bench_game_status(num_games=300):
+    """
+    Terminal check after every move of bot games: game_status fed with the events against
+    recounting from the grids after each move. Headless; both must agree at every move.
+    """
+    import random
+    import bot
+    import utils
+    import game_record
+    import game_status
+    from card_logic import create_grid_deal
+    from game_engine import GameEngine
+    from game_events import INPUT_EVENTS
+
+    rng = random.Random(17)
+    games = []
+    for seed in range(num_games):
+        events = []
+        bot.play_game(create_grid_deal(rng), utils.DiceRng(seed + 1), on_event=lambda kind, *payload: events.append((kind, payload)))
+        games.append(events)
+
+    incremental_s = rescan_s = 0.0
+    moves = mismatches = 0
+    for events in games:
+        produced = []
+        engine = GameEngine(on_event=lambda kind, *payload: produced.append((kind, payload)))
+        status = game_status.GameStatus()
+        for kind, payload in events:
+            if kind not in INPUT_EVENTS: continue
+            start = len(produced)
+            game_record.apply_input_event(engine, kind, payload)
+            t0 = time.perf_counter()
+            for event_kind, event_payload in produced[start:]: status.apply(event_kind, *event_payload)
+            incremental = status.outcome()
+            t1 = time.perf_counter()
+            fresh = game_status.GameStatus()
+            fresh.reset(engine.card_data_grid, engine.card_state_grid, engine.hand, engine.player.position)
+            rescanned = fresh.outcome()
+            t2 = time.perf_counter()
+            incremental_s += t1 - t0
+            rescan_s += t2 - t1
+            moves += 1
+            mismatches += incremental != rescanned
+
+    print(f"\n{num_games} bot games, {moves} moves")
+    print(f"  incremental: {incremental_s / moves * 1e6:6.2f} us per move")
+    print(f"  rescan:      {rescan_s / moves * 1e6:6.2f} us per move ({rescan_s / incremental_s:.0f}x)")
+    print(f"  mismatches: {mismatches}")
+
+
+def bench_board_viewport(sizes=(7, 11, 15), steps=200):
+    """
+    Scrolling a large board in a 7x7 BoardViewport: time per scroll step and canvas items
+    created, which should stay flat as the board grows (only visible cells are drawn).
+    """
+    from PIL import Image, ImageTk
+    import board_viewport
+
+    root = tk.Tk()
+    root.withdraw()
+    pil_back = Image.new("RGBA", (80, 120), "navy")
+    assets = {"card_back_pil_scaled": pil_back, "pil_faces_scaled": {}, "tk_faces": {}, "width": 80, "height": 120,
+              "tk_photo_back": ImageTk.PhotoImage(pil_back, master=root)}
+    print(f"\nBoardViewport, 7x7 cells in view, {steps} scroll steps:")
+    for size in sizes:
+        viewport = board_viewport.BoardViewport(root, size, size, 80, 120, assets, visible_rows=7, visible_cols=7)
+        for r in range(size):
+            for c in range(size):
+                viewport.cell(r, c, image=assets["tk_photo_back"]).grid(row=r, column=c)
+        viewport.refresh()
+        start = time.perf_counter()
+        for step in range(steps):
+            direction = 1 if (step // size) % 2 == 0 else -1
+            viewport._yview("scroll", direction, "units")
+            viewport._xview("scroll", direction, "units")
+        ms = (time.perf_counter() - start) * 1000 / steps
+        items = len(viewport.canvas.find_all())
+        print(f"  {size:>2}x{size:<2} ({size * size:>3} cells): {ms:.3f} ms/step, {items} canvas items")
+        viewport.frame.destroy()
+    root.destroy()
+
+
+def bench_flip_frames(scales=(1.0, 1.6, 2.5), rounds=5):
+    """
+    Cost of the flip frames a card flip shows: built on the spot (cold cache) vs already
+    built by the FlipPrefetcher (warm cache), per frame and for the worst single frame.
+    """
+    from PIL import Image
+
+    root = tk.Tk()
+    root.withdraw()
+    steps = config.ANIMATION_STEPS
+    print(f"\nFlip frames ({steps} per half flip), best of {rounds} rounds:")
+    for scale in scales:
+        width, height = int(100 * scale), int(145 * scale)
+        face = Image.new("RGBA", (width, height), "white")
+        assets = {"width": width, "height": height, "card_back_pil_scaled": Image.new("RGBA", (width, height), "navy"),
+                  "pil_faces_scaled": {"hearts_ace": face}}
+        cold = warm = worst = float("inf")
+        for _ in range(rounds):
+            assets.pop("flip_frames", None)
+            times = []
+            for index in range(steps):
+                start = time.perf_counter()
+                animation._flip_frame(root, assets, "hearts_ace", steps, index)
+                times.append(time.perf_counter() - start)
+            cold, worst = min(cold, sum(times) / steps), min(worst, max(times))
+            start = time.perf_counter()
+            for index in range(steps): animation._flip_frame(root, assets, "hearts_ace", steps, index)
+            warm = min(warm, (time.perf_counter() - start) / steps)
+        print(f"  {width}x{height}: built {cold * 1e3:.3f} ms/frame (worst {worst * 1e3:.3f} ms), prefetched {warm * 1e6:.1f} us/frame")
+    root.destroy()
+
+
+def bench_tk_photo(repeats=20):
+    """
+    PIL -> Tk conversion paths (tk_photo) for card and dice sized images, opaque and with
+    transparency, and the path tk_photo picks automatically on this machine.
+    """
+    import tk_photo
+
+    root = tk.Tk()
+    root.withdraw()
+    card = (int(100 * config.CARD_SCALE_FACTOR), int(145 * config.CARD_SCALE_FACTOR))
+    dice = (int(200 * config.DICE_SCALE_FACTOR),) * 2
+    print(f"\nPIL -> Tk conversion, best of {repeats} (encoding included):")
+    for name, size in (("card", card), ("dice", dice)):
+        for alpha in (False, True):
+            image = tk_photo.sample_image(size, alpha)
+            methods = tk_photo.ALPHA_METHODS if alpha else tk_photo.METHODS
+            timings = "  ".join(f"{method} {tk_photo.time_method(method, image, root, repeats) * 1e3:7.3f} ms" for method in methods)
+            print(f"  {name} {size[0]}x{size[1]} {'RGBA' if alpha else 'RGB '}: {timings}")
+    print(f"  auto: opaque -> {tk_photo.choose_method(False, root)}, transparent -> {tk_photo.choose_method(True, root)}")
+    root.destroy()
+
+
+BENCHMARKS = {
+    "combat_views": bench_combat_views,
+    "click_latency": bench_click_latency,
+    "game_log": bench_game_log,
+    "undo_memory": bench_undo_memory,
+    "savegame": bench_savegame,
+    "deal_codes": bench_deal_codes,
+    "record_store": bench_record_store,
+    "game_status": bench_game_status,
+    "board_viewport": bench_board_viewport,
+    "flip_frames": bench_flip_frames,
+    "tk_photo": bench_tk_photo,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}")
+            continue
+        print(f"=== Benchmark: {name} ===")
+        BENCHMARKS[name]()
+
+# --- END OF FILE benchmarks.py ---
@@ -0,0 +1,154 @@
+# --- START OF FILE board_scaler.py ---
+
+from collections import OrderedDict
+import tkinter as tk
+import config
+import tk_photo
+import assets_manager
+import log
+
+_log = log.get_logger("ui")
+
+# Live window resizing. The card scale follows the space the window leaves for the board:
+# <Configure> events are debounced, the new scale is rounded to RESIZE_SCALE_STEP, the card
+# images are rescaled from the originals in a worker thread (workers.WorkerService), their
+# PhotoImages are built a few per idle callback, and only then is everything swapped over
+# in one callback. Until then the old scale stays on screen, so dragging the window edge
+# never blocks the UI. The last RESIZE_CACHE_SCALES scales are kept, so going back to a
+# recent size swaps at once.
+# The board follows the scale change once the window has been resized by the user (or the
+# window manager); the layout's own size changes do not trigger a rescale.
+
+_TK_IMAGES_PER_STEP = 8 # PhotoImages built per idle callback
+
+
+class BoardScaler:
+    """Rescales one game board (session: game_session.GameSession) to the window size."""
+    def __init__(self, root, worker_service, assets, session, grid_frame, info_frame, hand_frame, hand_card_slots):
+        self.root = root
+        self.workers = worker_service
+        self.assets = assets
+        self.session = session
+        self.grid_frame = grid_frame
+        self.info_frame = info_frame
+        self.hand_frame = hand_frame
+        self.hand_card_slots = hand_card_slots
+        self.scale = config.CARD_SCALE_FACTOR
+        self._cache = OrderedDict() # scale -> {pil and tk images, width, height}
+        self._cache[self.scale] = {key: assets[key] for key in
+                                   ("card_back_pil_scaled", "pil_faces_scaled", "width", "height", "tk_photo_back", "tk_faces")}
+        self._base = None        # (board width, height) available at the startup scale
+        self._target = self.scale
+        self._debounce_id = None
+        self._job = None         # (scale, workers.Job) being rescaled
+        self.swaps = 0
+        root.bind("<Configure>", self._on_configure, add="+")
+
+    # --- Window Size -> Scale ---
+    def _board_space(self):
+        return (self.root.winfo_width() - self.info_frame.winfo_reqwidth(), self.root.winfo_height())
+
+    def _on_configure(self, event):
+        if event.widget is not self.root: return # Children report their own <Configure>
+        if self._base is None:
+            self._base = self._board_space() # The window's natural size at the startup scale
+            return
+        if self._debounce_id is not None: self.root.after_cancel(self._debounce_id)
+        self._debounce_id = self.root.after(config.RESIZE_DEBOUNCE_MS, self._resized)
+
+    def _resized(self):
+        self._debounce_id = None
+        width, height = self._board_space()
+        base_width, base_height = self._base
+        scale = config.CARD_SCALE_FACTOR * min(width / max(1, base_width), height / max(1, base_height))
+        scale = round(scale / config.RESIZE_SCALE_STEP) * config.RESIZE_SCALE_STEP
+        self.request_scale(min(config.RESIZE_MAX_SCALE, max(config.RESIZE_MIN_SCALE, round(scale, 3))))
+
+    # --- Rescaling ---
+    def request_scale(self, scale):
+        """Shows the board at scale as soon as its images are ready (the current scale stays until then)."""
+        self._target = scale
+        if self._job is not None and self._job[0] != scale:
+            self._job[1].cancel() # Its result would be outdated
+            self._job = None
+        if scale == self.scale: return
+        if scale in self._cache:
+            self._cache.move_to_end(scale)
+            self._swap(scale)
+        elif self._job is None:
+            if _log.debug_on: _log.debug(f"Rescaling cards to {scale:.2f} in the background...")
+            job = self.workers.submit(assets_manager.scale_card_images, self.assets["card_back_pil_original"],
+                                      self.assets["pil_faces_original"], scale, name="rescale cards",
+                                      on_done=self._scaled, on_error=self._failed)
+            self._job = (scale, job)
+
+    def _failed(self, error):
+        _log.warning(f"Rescaling the cards failed: {error!r}")
+        self._job = None
+
+    def _scaled(self, images):
+        """Worker result (main thread): builds the PhotoImages a few at a time, then swaps."""
+        self._job = None
+        scale = images["scale"]
+        if scale != self._target: # The window changed again meanwhile
+            self.request_scale(self._target)
+            return
+        images["tk_faces"] = {}
+        pending = list(images["pil_faces_scaled"].items())
+
+        def build_step():
+            if scale != self._target: return # Superseded: request_scale() started the new target
+            for key, image in pending[-_TK_IMAGES_PER_STEP:]:
+                images["tk_faces"][key] = tk_photo.photo_image(image, master=self.root)
+            del pending[-_TK_IMAGES_PER_STEP:]
+            if pending:
+                self.root.after_idle(build_step)
+                return
+            images["tk_photo_back"] = tk_photo.photo_image(images["card_back_pil_scaled"], master=self.root)
+            del images["scale"]
+            self._cache[scale] = images
+            while len(self._cache) > config.RESIZE_CACHE_SCALES: self._cache.popitem(last=False)
+            self._swap(scale)
+        build_step()
+
+    def _swap(self, scale):
+        """Puts the images of scale into the shared assets and onto every widget, in one callback."""
+        images = self._cache[scale]
+        assets = self.assets
+        old_keys = {str(assets["tk_photo_back"]): None}
+        old_keys.update({str(photo): key for key, photo in assets["tk_faces"].items()})
+        assets.update(images)
+        assets.pop("flip_frames", None) # Built for the old size
+        new_images = {None: images["tk_photo_back"], **images["tk_faces"]}
+        width, height = images["width"], images["height"]
+
+        def swap_image(widget):
+            if widget is None or not widget.winfo_exists(): return
+            name = str(widget.cget('image'))
+            if name not in old_keys: return # Empty, or a flip frame (the flip ends on the new face)
+            widget.config(image=new_images[old_keys[name]])
+            widget.image = new_images[old_keys[name]]
+
+        undo = self.session.undo
+        for r, row in enumerate(undo.cell_buttons if undo is not None else self.session.button_grid):
+            for c, button in enumerate(row):
+                swap_image(button)
+        for child in self.grid_frame.winfo_children(): # Placeholders of cells empty at the deal
+            if isinstance(child, tk.Frame): child.config(width=width, height=height)
+        self.grid_frame.grid_configure(padx=int(width * config.GRID_PADDING_FACTOR), pady=int(height * config.GRID_PADDING_FACTOR))
+
+        overlap_step_x = max(1, int(width * config.HAND_OVERLAP_FACTOR))
+        for hr, row in enumerate(self.hand_card_slots):
+            for hc, label in enumerate(row):
+                swap_image(label)
+                if label is not None and label.winfo_exists():
+                    label.place(x=hc * overlap_step_x, y=hr * (height + config.HAND_VERTICAL_PADDING), width=width, height=height)
+        self.hand_frame.config(width=max(1, (config.HAND_COLS - 1) * overlap_step_x + width),
+                               height=max(1, config.HAND_ROWS * height + max(0, config.HAND_ROWS - 1) * config.HAND_VERTICAL_PADDING))
+
+        self.scale = scale
+        self.swaps += 1
+        self.session.prefetch_flips() # Flip frames at the new size
+        if _log.info_on: _log.info(f"Board rescaled to {scale:.2f} ({width}x{height} cards).")
+
+# --- END OF FILE board_scaler.py ---
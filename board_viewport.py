@@ -0,0 +1,256 @@
+# --- START OF FILE board_viewport.py ---
+
+import tkinter as tk
+from PIL import Image
+import config
+import tk_photo
+import log
+
+_log = log.get_logger("ui")
+
+# Virtualized board for large variants. Instead of one tk.Button per cell, the board is a
+# scrollable, zoomable Canvas that only has items for the cells in view: a small pool of
+# (image, shade, border, text) canvas items is handed from cells leaving the view to cells
+# entering it, so scrolling, zooming and redraws cost O(visible cells), not O(board).
+# Every cell is a CellView, a plain object that accepts the Button calls the game logic,
+# undo manager, flip animation and hazard overlay make (config, ['state'], grid, ...), so
+# the rest of the game works unchanged on either board.
+# Scrolling: scrollbars, mouse wheel (Shift+wheel: sideways). Zoom: Ctrl+wheel.
+
+_PAD = 1 # Pixels around each card, like the button grid's padx/pady
+
+
+class CellView:
+    """Stand-in for a card tk.Button on a BoardViewport; drawn only while its cell is in view."""
+    def __init__(self, viewport, row, col, image='', command=None, state=tk.NORMAL):
+        self.viewport = viewport
+        self.row, self.col = row, col
+        self.image = image # Reference holder, like button.image
+        self.options = {"image": image, "command": command, "state": state, "text": '', "fg": "black", "font": None,
+                        "highlightbackground": None} # Border colour (input_queue marks queued cells with it)
+        self.mapped = False
+
+    def configure(self, **options):
+        self.options.update(options) # Button-only options (compound, relief, ...) are kept and ignored
+        self.viewport.cell_changed(self)
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key, '')
+    __getitem__ = cget
+
+    def grid(self, **grid_options):
+        self.mapped = True
+        self.viewport.cell_changed(self)
+
+    def grid_forget(self):
+        self.mapped = False
+        self.viewport.cell_changed(self)
+
+    def winfo_exists(self):
+        return self.viewport.exists()
+
+    def invoke(self):
+        if self.options["state"] != tk.DISABLED and self.options["command"]: self.options["command"]()
+
+
+class BoardViewport:
+    """
+    A rows x cols card board on a Canvas, showing visible_rows x visible_cols cells at zoom 1.
+    assets: the shared asset dict; zoomed card images are cached in it (assets["tk_zoomed"])
+    so every viewport in the process reuses them.
+    """
+    def __init__(self, parent, rows, cols, cell_width, cell_height, assets, visible_rows=None, visible_cols=None, bg=None):
+        self.rows, self.cols = rows, cols
+        self.cell_width, self.cell_height = cell_width, cell_height
+        self.zoom = 1.0
+        self.cells = [[None for _ in range(cols)] for _ in range(rows)]
+        self._shown = {} # (row, col) -> (image item, shade item, border item, text item)
+        self._pool = []  # Free item sets (hidden)
+        self._range = (0, -1, 0, -1) # Visible rows r0..r1, columns c0..c1
+        self._zoomed = assets.setdefault("tk_zoomed", {}) # (image name, zoom) -> PhotoImage
+        self._sources = {str(assets["tk_photo_back"]): assets["card_back_pil_scaled"]} # Tk image name -> PIL image
+        pil_faces = assets.get("pil_faces_scaled", {})
+        for key, photo in assets.get("tk_faces", {}).items():
+            if pil_faces.get(key) is not None: self._sources[str(photo)] = pil_faces[key]
+
+        bg = bg or parent.cget('bg')
+        visible_rows = min(rows, visible_rows or config.VIEWPORT_VISIBLE_CELLS[0])
+        visible_cols = min(cols, visible_cols or config.VIEWPORT_VISIBLE_CELLS[1])
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0,
+                                width=visible_cols * (cell_width + 2 * _PAD), height=visible_rows * (cell_height + 2 * _PAD))
+        x_scroll = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self._xview)
+        y_scroll = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._yview)
+        self.canvas.config(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+        self._update_scrollregion()
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<Button-1>", self._click)
+        self.canvas.bind("<MouseWheel>", self._wheel)         # Windows / macOS
+        self.canvas.bind("<Shift-MouseWheel>", self._wheel)
+        self.canvas.bind("<Control-MouseWheel>", self._wheel)
+        for button, delta in ((4, 120), (5, -120)):           # X11
+            self.canvas.bind(f"<Button-{button}>", lambda e, d=delta: self._wheel(e, d))
+            self.canvas.bind(f"<Shift-Button-{button}>", lambda e, d=delta: self._wheel(e, d))
+            self.canvas.bind(f"<Control-Button-{button}>", lambda e, d=delta: self._wheel(e, d))
+
+    # --- Layout ---
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def exists(self):
+        return self.canvas.winfo_exists()
+
+    def cell(self, row, col, **options):
+        """Creates the CellView for (row, col) (not shown until its grid() is called)."""
+        cell = CellView(self, row, col, **options)
+        self.cells[row][col] = cell
+        return cell
+
+    def _pitch(self):
+        return (self.cell_width * self.zoom + 2 * _PAD, self.cell_height * self.zoom + 2 * _PAD)
+
+    def _update_scrollregion(self):
+        pitch_x, pitch_y = self._pitch()
+        self.canvas.config(scrollregion=(0, 0, self.cols * pitch_x, self.rows * pitch_y),
+                           xscrollincrement=pitch_x, yscrollincrement=pitch_y) # Wheel / arrows: one card per step
+
+    def _visible_range(self):
+        pitch_x, pitch_y = self._pitch()
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1: width, height = int(self.canvas.cget('width')), int(self.canvas.cget('height')) # Not mapped yet
+        x1, y1 = self.canvas.canvasx(width), self.canvas.canvasy(height)
+        return (max(0, int(y0 // pitch_y)), min(self.rows - 1, int(y1 // pitch_y)),
+                max(0, int(x0 // pitch_x)), min(self.cols - 1, int(x1 // pitch_x)))
+
+    def _in_range(self, row, col):
+        r0, r1, c0, c1 = self._range
+        return r0 <= row <= r1 and c0 <= col <= c1
+
+    # --- Item Recycling ---
+    def refresh(self):
+        """Brings the canvas items in line with the cells in view (cost: visible cells)."""
+        self._range = self._visible_range()
+        for key in [key for key in self._shown if not self._in_range(*key)]:
+            self._release(key)
+        r0, r1, c0, c1 = self._range
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                cell = self.cells[r][c]
+                if cell is not None and cell.mapped and (r, c) not in self._shown: self._draw(cell)
+
+    def cell_changed(self, cell):
+        """A CellView's options changed: redraw it if it is in view."""
+        key = (cell.row, cell.col)
+        if not cell.mapped:
+            if key in self._shown: self._release(key)
+        elif self._in_range(*key):
+            self._draw(cell)
+
+    def _release(self, key):
+        items = self._shown.pop(key)
+        for item in items: self.canvas.itemconfigure(item, state=tk.HIDDEN)
+        self._pool.append(items)
+
+    def _draw(self, cell):
+        key = (cell.row, cell.col)
+        items = self._shown.get(key)
+        if items is None:
+            items = self._pool.pop() if self._pool else (
+                self.canvas.create_image(0, 0, anchor=tk.CENTER, state=tk.HIDDEN),
+                self.canvas.create_rectangle(0, 0, 0, 0, fill=self.canvas.cget('bg'), stipple="gray50", width=0, state=tk.HIDDEN),
+                self.canvas.create_rectangle(0, 0, 0, 0, width=config.INPUT_QUEUE_BORDER, state=tk.HIDDEN),
+                self.canvas.create_text(0, 0, anchor=tk.CENTER, state=tk.HIDDEN))
+            self._shown[key] = items
+        image_item, shade_item, border_item, text_item = items
+        pitch_x, pitch_y = self._pitch()
+        x, y = (cell.col + 0.5) * pitch_x, (cell.row + 0.5) * pitch_y
+        half_w, half_h = self.cell_width * self.zoom / 2, self.cell_height * self.zoom / 2
+        options = cell.options
+
+        image = self._zoomed_image(options["image"])
+        self.canvas.coords(image_item, x, y)
+        self.canvas.itemconfigure(image_item, image=image, state=tk.NORMAL if image else tk.HIDDEN)
+        self.canvas.coords(shade_item, x - half_w, y - half_h, x + half_w, y + half_h)
+        self.canvas.itemconfigure(shade_item, state=tk.NORMAL if image and options["state"] == tk.DISABLED else tk.HIDDEN)
+        self.canvas.coords(border_item, x - half_w, y - half_h, x + half_w, y + half_h)
+        border = options["highlightbackground"]
+        self.canvas.itemconfigure(border_item, outline=border or '', state=tk.NORMAL if border else tk.HIDDEN)
+        self.canvas.coords(text_item, x, y)
+        text_options = {"text": options["text"], "fill": options["fg"] or "black",
+                        "state": tk.NORMAL if options["text"] else tk.HIDDEN}
+        if options["font"]: text_options["font"] = options["font"]
+        self.canvas.itemconfigure(text_item, **text_options)
+
+    def _zoomed_image(self, image):
+        """The card image at the current zoom (other images, e.g. flip frames, are drawn as they are)."""
+        if not image or self.zoom == 1.0: return image
+        name = str(image)
+        source = self._sources.get(name)
+        if source is None: return image
+        zoomed = self._zoomed.get((name, self.zoom))
+        if zoomed is None:
+            size = (max(1, round(self.cell_width * self.zoom)), max(1, round(self.cell_height * self.zoom)))
+            zoomed = tk_photo.photo_image(source.resize(size, Image.Resampling.LANCZOS), master=self.canvas)
+            self._zoomed[(name, self.zoom)] = zoomed
+        return zoomed
+
+    # --- Input ---
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self.refresh()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _wheel(self, event, delta=None):
+        delta = delta if delta is not None else event.delta
+        if event.state & 0x0004: # Control: zoom around the pointer
+            self.set_zoom(self._next_zoom(1 if delta > 0 else -1), event.x, event.y)
+        elif event.state & 0x0001: # Shift: sideways
+            self._xview("scroll", -1 if delta > 0 else 1, "units")
+        else:
+            self._yview("scroll", -1 if delta > 0 else 1, "units")
+
+    def _next_zoom(self, direction):
+        levels = config.VIEWPORT_ZOOM_LEVELS
+        index = min(range(len(levels)), key=lambda i: abs(levels[i] - self.zoom))
+        return levels[max(0, min(len(levels) - 1, index + direction))]
+
+    def set_zoom(self, zoom, anchor_x=0, anchor_y=0):
+        """Zooms so the board point under the canvas pixel (anchor_x, anchor_y) stays put."""
+        if zoom == self.zoom: return
+        old_pitch_x, old_pitch_y = self._pitch()
+        board_x = self.canvas.canvasx(anchor_x) / old_pitch_x # Anchor in cells
+        board_y = self.canvas.canvasy(anchor_y) / old_pitch_y
+        self.zoom = zoom
+        for key in list(self._shown): self._release(key) # Positions and images all change
+        self._update_scrollregion()
+        pitch_x, pitch_y = self._pitch()
+        width, height = self.cols * pitch_x, self.rows * pitch_y
+        self.canvas.xview_moveto(max(0.0, (board_x * pitch_x - anchor_x) / width))
+        self.canvas.yview_moveto(max(0.0, (board_y * pitch_y - anchor_y) / height))
+        self.refresh()
+        if _log.debug_on: _log.debug(f"Board zoom {zoom:.2f}: {len(self._shown)} cells drawn, {len(self._pool)} items pooled.")
+
+    def _click(self, event):
+        pitch_x, pitch_y = self._pitch()
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        row, col = int(y // pitch_y), int(x // pitch_x)
+        if not (0 <= row < self.rows and 0 <= col < self.cols): return
+        if not (_PAD <= x - col * pitch_x < pitch_x - _PAD and _PAD <= y - row * pitch_y < pitch_y - _PAD): return
+        cell = self.cells[row][col]
+        if cell is not None and cell.mapped: cell.invoke()
+
+# --- END OF FILE board_viewport.py ---
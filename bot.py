@@ -0,0 +1,144 @@
+# --- START OF FILE bot.py ---
+
+from collections import deque, namedtuple
+import config
+import utils
+import game_status
+from game_engine import GameEngine, classify_action, ACTION_PICKUP, ACTION_COMBAT
+from combat import logic as combat_logic
+from combat import advisor as combat_advisor
+from combat import setup as combat_setup
+
+# Reference bot: a fixed, greedy policy played on a GameEngine, used to rate deals and
+# to generate simulation data. On top of the engine rules it follows the rulebook turn
+# structure the live game does not enforce yet: 2 actions per turn, the Jack walks one
+# orthogonal step per action over cleared cells, and may only reveal, pick up or fight
+# cards next to it. A lost fight against a hostile King loses the next turn.
+# Each move the bot goes for the cheapest (fewest actions) of, in order of preference:
+#   1. a face-up Joker,
+#   2. a face-down card to reveal, or a value card to pick up (keeping hand room for
+#      the Jokers still out),
+#   3. the face-up threat it is most likely to beat (hostile Queens last, as a loss
+#      against one empties the hand), choosing the value card like the combat advisor.
+# The game ends as game_status decides (won once both Jokers are in the hand), or is lost
+# when MAX_TURNS turns have passed.
+
+ACTIONS_PER_TURN = 2
+MAX_TURNS = 150
+
+GameResult = namedtuple("GameResult", "won turns fights_won fights_lost")
+
+_NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def reachable_targets(grid, states, start):
+    """
+    Cards the Jack can act on from start, walking over empty cells.
+    Returns {(row, col): (steps needed, cell to stand on)}; the card under the Jack counts as adjacent.
+    """
+    targets = {}
+    if grid[start[0]][start[1]] is not None and states[start[0]][start[1]] != config.STATE_ACTION_TAKEN:
+        targets[start] = (0, start)
+    steps = {start: 0}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for dr, dc in _NEIGHBOURS:
+            r, c = cell[0] + dr, cell[1] + dc
+            if not (0 <= r < config.ROWS and 0 <= c < config.COLUMNS) or (r, c) in steps: continue
+            if grid[r][c] is None: # Cleared: walkable
+                steps[(r, c)] = steps[cell] + 1
+                queue.append((r, c))
+            elif states[r][c] != config.STATE_ACTION_TAKEN and (r, c) not in targets:
+                targets[(r, c)] = (steps[cell], cell) # BFS order: first found is the nearest
+    return targets
+
+def jokers_in_hand(engine):
+    return len(engine.hand.find(lambda card: card.get_color() == "joker"))
+
+
+def choose_move(engine, position):
+    """Returns (kind, (row, col), steps, stand_cell) with kind "act" or "reveal", or None if nothing is left to do."""
+    grid, states = engine.card_data_grid, engine.card_state_grid
+    targets = reachable_targets(grid, states, position)
+    free_slots = engine.hand.rows * engine.hand.cols - engine.hand.card_count()
+    jokers_needed = 2 - jokers_in_hand(engine)
+    value_cards = None
+
+    best = None # ((preference, cost, cell), move)
+    for cell, (steps, stand) in targets.items():
+        card = grid[cell[0]][cell[1]]
+        if states[cell[0]][cell[1]] == config.STATE_FACE_DOWN:
+            key, kind = (1, steps, 0.0, cell), "reveal"
+        else:
+            action = classify_action(card, engine.player_suit)
+            if action == ACTION_PICKUP:
+                if card.get_color() == "joker": key = (0, steps, 0.0, cell)
+                elif free_slots > jokers_needed: key = (1, steps, 0.0, cell)
+                else: continue # No room to spare: the card stays in the way
+            elif action == ACTION_COMBAT:
+                if value_cards is None:
+                    value_cards = combat_setup.get_value_cards_from_hand(engine.hand, engine.player_suit)
+                    best_value = max((combat_logic.get_card_combat_value(held) for held, _, _ in value_cards), default=0)
+                defender = combat_logic.get_card_combat_value(card)
+                key = (3 if card.get_rank() == 12 else 2, steps, -combat_advisor.win_probability(best_value, defender), cell)
+            else: continue # Disabled cards (Aces) are walls
+            kind = "act"
+        if best is None or key < best[0]: best = (key, (kind, cell, steps, stand))
+    return best[1] if best else None
+
+def choose_value_card(engine):
+    """The value card for the pending fight (None = no card), ranked by the combat advisor."""
+    combat = engine.combat
+    target = engine.card_data_grid[combat["row"]][combat["col"]]
+    value_cards = combat_setup.get_value_cards_from_hand(engine.hand, engine.player_suit)
+    if not value_cards: return None
+    threat_profile = combat_advisor.get_threat_profile(engine.card_data_grid, engine.card_state_grid,
+                                                       engine.player_suit, exclude=(combat["row"], combat["col"]))
+    best = combat_advisor.rank_value_card_options(value_cards, target, threat_profile)[0]["card_info"]
+    return best[0] if best else None
+
+
+def play_game(grid_cards, dice_rng, player_suit=config.PLAYER_SUIT, on_event=None, max_turns=MAX_TURNS):
+    """
+    Plays one deal to the end with the reference policy and dice from dice_rng (a utils.DiceRng).
+    on_event is passed to the GameEngine, so callers can watch every event. Returns a GameResult
+    (turns = turns used, including lost ones).
+    """
+    engine = GameEngine(player_suit, on_event)
+    engine.deal(grid_cards)
+    position = engine.player.position
+    actions = skipped_turns = 0
+    fights_won = fights_lost = 0
+    def turns(): return -(-actions // ACTIONS_PER_TURN) + skipped_turns
+
+    while turns() < max_turns:
+        outcome = engine.status.outcome()
+        if outcome == game_status.OUTCOME_WON: return GameResult(True, turns(), fights_won, fights_lost)
+        if outcome is not None: break # Joker lost, boxed in or nothing left to do
+        move = choose_move(engine, position)
+        if move is None: break # Only pickups left and no hand room to spare
+        kind, (r, c), steps, position = move
+        actions += steps + 1 # Walk next to the card, then act
+        engine.player.set_position(*position)
+        if kind == "reveal":
+            engine.reveal(r, c)
+            continue
+        if engine.act(r, c) != ACTION_COMBAT: continue
+        if engine.choose_value_card(choose_value_card(engine)):
+            won = True
+        else:
+            num_diff_dice = engine.combat["params"]["num_diff_dice"]
+            won = engine.roll(utils.roll_dice(num_diff_dice, dice_rng), utils.roll_dice(1, dice_rng)[0])
+        if won:
+            fights_won += 1
+            position = (r, c) # The Jack moves onto the defeated card's cell
+        else:
+            fights_lost += 1
+            if engine.player.should_skip_turn(): # Lost to a hostile King: the next turn is lost
+                actions = -(-actions // ACTIONS_PER_TURN) * ACTIONS_PER_TURN
+                skipped_turns += 1
+                engine.player.clear_skip_turn_flag()
+    return GameResult(False, min(turns(), max_turns), fights_won, fights_lost)
+
+# --- END OF FILE bot.py ---
@@ -4,10 +4,11 @@ import tkinter as tk
 import config
 import hand_manager # Import hand management functions
 from card_logic import Card # Keep Card import
-# --- MODIFIED IMPORT ---
-# Import the main entry point function from the combat package
-from combat.manager import initiate_combat
-# ---------------------
+import log
+import flight_recorder
+from game_events import EV_ACTION, EV_PICKUP, EV_DISABLE, EV_COMBAT_START, cell_of
+
+_log = log.get_logger("game")
 # Import helpers from main needed for combat UI management
 # This is slightly awkward; ideally these helpers would be in a dedicated UI manager module.
 try:
@@ -17,12 +18,12 @@ try:
     # For now, we rely on them being passed as arguments where needed.
     pass # from main import hide_hand, show_hand, disable_grid, enable_grid, clear_combat_view
 except ImportError:
-    print("Warning: Could not pre-import UI helpers from main in card_actions.py")
+    _log.warning("Could not pre-import UI helpers from main in card_actions.py")
 
 
 def handle_card_action(
     row, col,
-    root, player, # Pass root and player
+    root, player, session, # Pass root, player and the game_session.GameSession
     card_data_grid, button_grid, card_state_grid, # Grids
     hand_card_data, hand_card_slots, # Hand components
     assets, # Asset components
@@ -31,7 +32,7 @@ def handle_card_action(
     ):
     """
     Determines and executes the action for a revealed card.
-    Initiates combat via combat.manager if appropriate, passing UI frames.
+    Initiates combat via the session's combat.manager.CombatManager if appropriate, passing UI frames.
     """
     # Access button/card data (no change here)
     button = button_grid[row][col] if (0 <= row < config.ROWS and 0 <= col < config.COLUMNS and button_grid[row][col]) else None
@@ -39,18 +40,21 @@ def handle_card_action(
 
     # --- Validate ---
     if not card:
-        print(f"Error in handle_card_action: No card data at ({row},{col}).")
+        _log.error(f"Error in handle_card_action: No card data at ({row},{col}).")
         if 0 <= row < config.ROWS and 0 <= col < config.COLUMNS:
              if card_state_grid[row][col] != config.STATE_ACTION_TAKEN: card_state_grid[row][col] = config.STATE_ACTION_TAKEN
         if button and button.winfo_exists(): button.config(state=tk.DISABLED)
         return
     if not button or not button.winfo_exists():
-        print(f"Error in handle_card_action: Button missing or destroyed at ({row},{col}).")
+        _log.error(f"Error in handle_card_action: Button missing or destroyed at ({row},{col}).")
         if 0 <= row < config.ROWS and 0 <= col < config.COLUMNS:
             if card_state_grid[row][col] != config.STATE_ACTION_TAKEN: card_state_grid[row][col] = config.STATE_ACTION_TAKEN
         return
 
-    print(f"--- Action triggered for card {card} at ({row}, {col}) ---")
+    flight_recorder.record("action", row=row, col=col, card=card, player=player.position)
+    if _log.info_on: _log.info(f"--- Action triggered for card {card} at ({row}, {col}) ---")
+    cell = cell_of(row, col)
+    session.record(EV_ACTION, cell)
 
     card_suit = card.get_suit().lower()
     card_rank = card.rank
@@ -69,7 +73,9 @@ def handle_card_action(
         # Pass UI elements needed by combat manager
         "info_frame": info_frame,
         "hand_frame": hand_frame,
-        "root": root # Pass root if needed for 'after' calls within combat (e.g. animation delays)
+        "root": root, # Pass root if needed for 'after' calls within combat (e.g. animation delays)
+        "session": session, # Events, undo and autosave of this game
+        "dice_rng": session.dice_rng, # This game's dice
     }
 
     # --- Determine Action Logic ---
@@ -78,96 +84,115 @@ def handle_card_action(
 
     # Jokers (Add to Hand)
     if card_color == "joker":
-        print(f"Action: Found Joker ({card})! Attempting to add to hand.")
+        if _log.debug_on: _log.debug(f"Action: Found Joker ({card})! Attempting to add to hand.")
         if hand_manager.add_card_to_hand_display(card, hand_card_data, hand_card_slots, tk_card_face_images, info_frame_bg):
             button.grid_forget() # Remove button from grid layout
             button_grid[row][col] = None # Clear button reference
             card_data_grid[row][col] = None # Clear card data reference
             card_state_grid[row][col] = config.STATE_ACTION_TAKEN # Mark grid slot as done
-            print(f"   - Successfully moved {card} to hand. Grid slot cleared.")
+            if _log.debug_on: _log.debug(f"   - Successfully moved {card} to hand. Grid slot cleared.")
+            session.record(EV_PICKUP, cell)
             action_taken = True
         else:
-            print(f"   - Could not add {card} to hand (Hand full?). Card remains on grid.")
+            if _log.debug_on: _log.debug(f"   - Could not add {card} to hand (Hand full?). Card remains on grid.")
             # Card remains, disable button as action failed/completed for now
             button.config(state=tk.DISABLED)
             card_state_grid[row][col] = config.STATE_ACTION_TAKEN # Or keep FACE_UP? Rule dependent. Assume action done for now.
+            session.record(EV_DISABLE, cell)
+            action_taken = True # Disabling is the action (GameEngine.act emits EV_DISABLE once)
 
     # Black Number Cards (Hazards) -> Initiate Combat
     elif card_color == "black" and card_rank is not None and 2 <= card_rank <= 10:
-        print(f"Action: Initiate Combat vs Hazard ({card})")
+        if _log.debug_on: _log.debug(f"Action: Initiate Combat vs Hazard ({card})")
         # Don't disable the button here; combat manager will disable grid
         # card_state_grid[row][col] = config.STATE_ACTION_TAKEN # Mark as busy during combat
-        initiate_combat(player, card, row, col, game_state_for_combat)
+        session.record(EV_COMBAT_START, cell)
+        session.combat_started()
+        session.combat.initiate_combat(player, card, row, col, game_state_for_combat)
         action_taken = True # Combat initiation is the action
 
     # Red Number Cards (Equipment - Add to Hand)
     elif card_color == "red" and card_rank is not None and 2 <= card_rank <= 10:
-        print(f"Action: Attempting Pickup Equipment ({card})")
+        if _log.debug_on: _log.debug(f"Action: Attempting Pickup Equipment ({card})")
         if hand_manager.add_card_to_hand_display(card, hand_card_data, hand_card_slots, tk_card_face_images, info_frame_bg):
             button.grid_forget()
             button_grid[row][col] = None
             card_data_grid[row][col] = None
             card_state_grid[row][col] = config.STATE_ACTION_TAKEN
-            print(f"   - Successfully moved {card} to hand. Grid slot cleared.")
+            if _log.debug_on: _log.debug(f"   - Successfully moved {card} to hand. Grid slot cleared.")
+            session.record(EV_PICKUP, cell)
             action_taken = True
         else:
-            print(f"   - Could not add {card} to hand (Hand full?). Card remains on grid.")
+            if _log.debug_on: _log.debug(f"   - Could not add {card} to hand (Hand full?). Card remains on grid.")
             button.config(state=tk.DISABLED)
             card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+            session.record(EV_DISABLE, cell)
+            action_taken = True
 
     # Face Cards (J, Q, K) AND Aces
     elif card_rank is not None and (card_rank == 1 or 11 <= card_rank <= 13):
         is_player_suit = (card_suit == player.suit) if hasattr(player, 'suit') else False
         card_type = "Ace" if card_rank == 1 else ("Jack" if card_rank == 11 else ("Queen" if card_rank == 12 else "King"))
-        print(f"Action: Encounter {card_type} ({card})")
+        if _log.debug_on: _log.debug(f"Action: Encounter {card_type} ({card})")
 
         if card_rank == 1: # Aces (Ability - Placeholder)
-             print("   - Action: Use Ace ability (Reveal adjacent) - (Not Implemented Yet)")
+             if _log.debug_on: _log.debug("   - Action: Use Ace ability (Reveal adjacent) - (Not Implemented Yet)")
              # For now, just disable the card as its action is "done"
              card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+             session.record(EV_DISABLE, cell)
              button.config(state=tk.DISABLED)
              action_taken = True
 
         elif card_rank == 11: # Jacks (Shouldn't be on grid based on rules)
-             print(f"   - Warning: Encountered Jack ({card}) on grid. Disabling.")
+             if _log.debug_on: _log.debug(f"   - Warning: Encountered Jack ({card}) on grid. Disabling.")
              card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+             session.record(EV_DISABLE, cell)
              button.config(state=tk.DISABLED)
              action_taken = True
 
         elif card_rank in [12, 13]: # Queens and Kings (NPCs)
             if is_player_suit: # Friendly NPC (Add to Hand)
-                print(f"   - Friendly NPC ({card_type}). Action: Add to hand.")
+                if _log.debug_on: _log.debug(f"   - Friendly NPC ({card_type}). Action: Add to hand.")
                 if hand_manager.add_card_to_hand_display(card, hand_card_data, hand_card_slots, tk_card_face_images, info_frame_bg):
                      button.grid_forget()
                      button_grid[row][col] = None
                      card_data_grid[row][col] = None
                      card_state_grid[row][col] = config.STATE_ACTION_TAKEN
-                     print(f"     - Successfully moved {card} to hand. Grid slot cleared.")
+                     if _log.debug_on: _log.debug(f"     - Successfully moved {card} to hand. Grid slot cleared.")
+                     session.record(EV_PICKUP, cell)
                      action_taken = True
                 else:
-                     print(f"     - Could not add {card} to hand (Hand full?). Card remains.")
+                     if _log.debug_on: _log.debug(f"     - Could not add {card} to hand (Hand full?). Card remains.")
                      button.config(state=tk.DISABLED)
                      card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+                     session.record(EV_DISABLE, cell)
+                     action_taken = True
             else: # Hostile NPC -> Initiate Combat
-                print(f"   - Hostile NPC ({card_type}). Action: Initiate Combat.")
+                if _log.debug_on: _log.debug(f"   - Hostile NPC ({card_type}). Action: Initiate Combat.")
                 # card_state_grid[row][col] = config.STATE_ACTION_TAKEN # Mark busy
-                initiate_combat(player, card, row, col, game_state_for_combat)
+                session.record(EV_COMBAT_START, cell)
+                session.combat_started()
+                session.combat.initiate_combat(player, card, row, col, game_state_for_combat)
                 action_taken = True # Combat initiation is the action
 
     # Unknown Card Type
     else:
-        print(f"Action: Unknown card type - {card} (Rank: {card_rank}, Color: {card_color}). Disabling.")
+        if _log.debug_on: _log.debug(f"Action: Unknown card type - {card} (Rank: {card_rank}, Color: {card_color}). Disabling.")
         card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+        session.record(EV_DISABLE, cell)
         button.config(state=tk.DISABLED)
         action_taken = True
 
     # If no specific action resulted in combat or state change, ensure button is disabled
     if not action_taken and button.winfo_exists():
-         print(f"Warning: No specific action handler triggered for {card}, but action considered complete. Disabling button.")
+         _log.warning(f"No specific action handler triggered for {card}, but action considered complete. Disabling button.")
          card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+         session.record(EV_DISABLE, cell)
          button.config(state=tk.DISABLED)
 
 
-    print("--- Action Handling Complete ---")
+    flight_recorder.record("state", row=row, col=col, card=card, state=card_state_grid[row][col])
+    session.checkpoint() # No-op while the fight just started is pending
+    if _log.info_on: _log.info("--- Action Handling Complete ---")
 
 # --- END OF FILE card_actions.py ---
\ No newline at end of file
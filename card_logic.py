@@ -1,7 +1,9 @@
 # --- START OF FILE card_logic.py ---
 
 # card_logic.py
+import itertools
 import random
+import config
 
 # --- Define Standard Suits and Ranks ---
 # These are fundamental properties of a standard deck
@@ -12,9 +14,15 @@ ranks_string = ["two", "three", "four", "five", "six", "seven",
 ranks_int = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 1] # Jack=11, Ace=1 (adjust if Ace high)
 
 # --- Card Class ---
+# Every Card has a uid: deck number * NUM_CARD_CODES + card code. Cards compare and hash by
+# uid, so with several decks the two Aces of Hearts are different cards (hand removals,
+# sets and dict keys keep them apart), while the same card of the same deck - e.g. rebuilt
+# from a save or a game log - is still equal. Use same_value() to compare suit and rank only.
+_loose_uids = itertools.count(-1, -1) # Cards without a card code get unique negative uids
+
 class Card:
     """ Represents a single playing card. """
-    def __init__(self, suit=None, rank=None, rank_string=None):
+    def __init__(self, suit=None, rank=None, rank_string=None, deck=0):
         # Ensure rank is integer if provided
         try:
             self.rank = int(rank) if rank is not None else None
@@ -26,6 +34,9 @@ class Card:
         self.suit = suit
         # self.rank = rank # The integer value (e.g., 1-13)
         self.rank_string = rank_string # The string value ("two", "ace", etc.)
+        self.deck = deck # Which deck the card came from (multi-deck variants)
+        code = _value_code(suit, self.rank)
+        self.uid = deck * NUM_CARD_CODES + code if code is not None else next(_loose_uids)
 
     def get_rank(self):
         """ Returns the integer rank of the card. """
@@ -70,22 +81,71 @@ class Card:
 
 
     def __eq__(self, other):
-        """ Checks for equality based on suit and rank. Handles None types. """
+        """ Checks for identity: the same card of the same deck (see same_value for suit and rank). """
         if not isinstance(other, Card):
             return NotImplemented # Let Python handle comparison with other types
-        # Both suits and ranks must match (or both be None)
-        return self.suit == other.suit and self.rank == other.rank
+        return self.uid == other.uid
 
     def __hash__(self):
-        """ Allows Cards to be used in sets or as dictionary keys. """
-        return hash((self.suit, self.rank))
+        """ Allows Cards to be used in sets or as dictionary keys (one entry per physical card). """
+        return hash(self.uid)
+
+    def same_value(self, other):
+        """ True if other has the same suit and rank (from any deck). """
+        return other is not None and self.suit == other.suit and self.rank == other.rank
+
+
+# --- Compact Card Codes ---
+# Every card maps to a small integer: suit index * 13 + rank index for the 52 standard
+# cards, then the two Jokers. Saves and the binary game log store the card's uid, which
+# adds its deck (deck * NUM_CARD_CODES + code), so a card of the second deck comes back as
+# that card; for the first deck the uid is the code. Deal codes rank a single deck's codes.
+BLACK_JOKER_CODE = 52
+RED_JOKER_CODE = 53
+NUM_CARD_CODES = 54
+
+def _value_code(suit, rank):
+    """ Code of a suit and rank, or None if they are not a card of the deck. """
+    if suit == config.BLACK_JOKER_SUIT: return BLACK_JOKER_CODE
+    if suit == config.RED_JOKER_SUIT: return RED_JOKER_CODE
+    if suit not in suits or rank not in ranks_int: return None
+    return suits.index(suit) * len(ranks_int) + ranks_int.index(rank)
+
+def card_to_code(card):
+    """ Returns the code (0-53) of a card. Raises ValueError for unknown cards. """
+    if card.uid < 0: raise ValueError(f"Card {card!r} has no card code.")
+    return card.uid % NUM_CARD_CODES
+
+def card_to_uid(card):
+    """ Returns the uid (deck * NUM_CARD_CODES + code) of a card. Raises ValueError for unknown cards. """
+    if card.uid < 0: raise ValueError(f"Card {card!r} has no card code.")
+    return card.uid
+
+def card_from_uid(uid):
+    """ Creates the Card with a uid (card_to_uid()). """
+    deck, code = divmod(uid, NUM_CARD_CODES)
+    return card_from_code(code, deck)
+
+def card_from_code(code, deck=0):
+    """ Creates the Card for a code (0-53), as a card of the given deck. """
+    if code == BLACK_JOKER_CODE:
+        return Card(config.BLACK_JOKER_SUIT, config.BLACK_JOKER_RANK, config.BLACK_JOKER_RANK_STR, deck)
+    if code == RED_JOKER_CODE:
+        return Card(config.RED_JOKER_SUIT, config.RED_JOKER_RANK, config.RED_JOKER_RANK_STR, deck)
+    if not 0 <= code < BLACK_JOKER_CODE:
+        raise ValueError(f"Invalid card code: {code}")
+    suit_index, rank_index = divmod(code, len(ranks_int))
+    return Card(suits[suit_index], ranks_int[rank_index], ranks_string[rank_index], deck)
 
 
 # --- Deck Creation Function ---
-def create_shuffled_deck():
+def create_shuffled_deck(deck_number=0):
     """
     Creates a standard 52-card deck and shuffles it.
 
+    Args:
+        deck_number: Deck number given to the cards (multi-deck variants).
+
     Returns:
         list: A list of Card objects, shuffled.
     """
@@ -102,7 +162,7 @@ def create_shuffled_deck():
             if rank_int_value is None or rank_string_value is None:
                  print(f"Warning: Skipping card creation due to None rank/string for suit {suit_value} at index {i}")
                  continue
-            card = Card(suit=suit_value, rank=rank_int_value, rank_string=rank_string_value)
+            card = Card(suit=suit_value, rank=rank_int_value, rank_string=rank_string_value, deck=deck_number)
             deck.append(card)
 
     print(f"Standard deck created with {len(deck)} cards.")
@@ -110,6 +170,32 @@ def create_shuffled_deck():
     print("Deck shuffled.")
     return deck
 
+# --- Dungeon Deal ---
+def create_grid_deal(rng=random):
+    """
+    Builds the grid deal following the rulebook setup: Jacks set aside, one black 10
+    (whichever comes first after shuffling) removed, the Black Joker shuffled in,
+    and the Red Joker in the centre cell.
+
+    Args:
+        rng: Source of randomness with a shuffle() method (random module or random.Random).
+
+    Returns:
+        list: config.ROWS * config.COLUMNS Card objects in row-major grid order.
+    """
+    deck = [Card(suit, rank, rank_string) for suit in suits
+            for rank, rank_string in zip(ranks_int, ranks_string) if rank != 11]
+    rng.shuffle(deck)
+    black_10 = next(card for card in deck if card.get_color() == "black" and card.get_rank() == 10)
+    deck.remove(black_10)
+    deck.append(Card(config.BLACK_JOKER_SUIT, config.BLACK_JOKER_RANK, config.BLACK_JOKER_RANK_STR))
+    rng.shuffle(deck)
+    center_index = (config.ROWS // 2) * config.COLUMNS + config.COLUMNS // 2
+    deck.insert(center_index, Card(config.RED_JOKER_SUIT, config.RED_JOKER_RANK, config.RED_JOKER_RANK_STR))
+    if len(deck) != config.ROWS * config.COLUMNS:
+        raise ValueError(f"Grid deal has {len(deck)} cards, expected {config.ROWS * config.COLUMNS}.")
+    return deck
+
 # Example of using the function (optional, for testing this file directly)
 if __name__ == "__main__":
     try:
@@ -131,6 +217,8 @@ if __name__ == "__main__":
         print(f" c1 == c2: {c1 == c2}")
         c3 = Card("hearts", 1, "ace")
         print(f" c1 == c3: {c1 == c3}")
+        c4 = Card("hearts", 1, "ace", deck=1)
+        print(f" c1 == c4 (second deck): {c1 == c4}, same value: {c1.same_value(c4)}")
 
     except Exception as e:
         print(f"\nAn error occurred during testing: {e}")
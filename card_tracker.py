@@ -0,0 +1,159 @@
+# --- START OF FILE card_tracker.py ---
+
+import config
+
+# Card counting. The deal composition is fixed by the setup (create_grid_deal: no Jacks,
+# one black 10 out, both Jokers in, the Red Joker face down in the centre), so the cards
+# not seen yet are always known as counts per category. The tracker keeps those counts
+# and updates them in O(1) per reveal; undo and resume rebuild them from the grids.
+# Every face-down cell other than the centre is equally likely to hold any unseen card,
+# so the posterior of such a cell is simply count / unseen total.
+
+HAZARD_VALUES = tuple(range(2, 11))
+CATEGORIES = tuple(f"hazard_{value}" for value in HAZARD_VALUES) + (
+    "equipment", "hostile_npc", "friendly_npc", "joker", "ace")
+CATEGORY_INDEX = {name: index for index, name in enumerate(CATEGORIES)}
+EQUIPMENT = CATEGORY_INDEX["equipment"]
+HOSTILE_NPC = CATEGORY_INDEX["hostile_npc"]
+FRIENDLY_NPC = CATEGORY_INDEX["friendly_npc"]
+JOKER = CATEGORY_INDEX["joker"]
+ACE = CATEGORY_INDEX["ace"]
+THREATS = tuple(range(len(HAZARD_VALUES))) + (HOSTILE_NPC,) # Categories that have to be fought
+
+CENTER = (config.ROWS // 2, config.COLUMNS // 2)
+
+def card_category(card, player_suit):
+    """Category index of a card."""
+    color = card.get_color()
+    rank = card.get_rank()
+    if color == "joker": return JOKER
+    if rank == 1: return ACE
+    if rank in (12, 13): return FRIENDLY_NPC if card.get_suit() == player_suit else HOSTILE_NPC
+    if color == "black": return CATEGORY_INDEX[f"hazard_{rank}"]
+    return EQUIPMENT
+
+
+class CardTracker:
+    """
+    Unseen-card counts per category for one game. Listeners (e.g. the heat-map overlay)
+    are called with no arguments after every change.
+    """
+    def __init__(self, player_suit=config.PLAYER_SUIT):
+        self.player_suit = player_suit
+        self.counts = [0] * len(CATEGORIES)
+        self.unseen = 0
+        self.face_down = set()
+        self.pinned = {} # Face-down cell -> category known from the setup (the Red Joker in the centre)
+        self._pinned_counts = [0] * len(CATEGORIES)
+        self.resets = 0 # Bumped by reset(): the buttons were redrawn along with the state
+        self.listeners = []
+
+    def reset(self, card_data_grid, card_state_grid):
+        """
+        Recounts from the grids (new deal, undo, resume). The face-down cards are exactly the
+        unseen ones, so counting them gives the same numbers as deck composition minus seen cards.
+        """
+        self.counts = [0] * len(CATEGORIES)
+        self.face_down = set()
+        for r in range(config.ROWS):
+            for c in range(config.COLUMNS):
+                card = card_data_grid[r][c]
+                if card is not None and card_state_grid[r][c] == config.STATE_FACE_DOWN:
+                    self.counts[card_category(card, self.player_suit)] += 1
+                    self.face_down.add((r, c))
+        self.unseen = len(self.face_down)
+        self.pinned = {}
+        self._pinned_counts = [0] * len(CATEGORIES)
+        centre_card = card_data_grid[CENTER[0]][CENTER[1]]
+        if CENTER in self.face_down and centre_card.get_suit() == config.RED_JOKER_SUIT:
+            self.pinned[CENTER] = JOKER
+            self._pinned_counts[JOKER] = 1
+        self.resets += 1
+        self._changed()
+
+    def reveal(self, row, col, card):
+        """A face-down card was turned face up: O(1)."""
+        if (row, col) not in self.face_down: return
+        self.face_down.discard((row, col))
+        category = card_category(card, self.player_suit)
+        self.counts[category] -= 1
+        self.unseen -= 1
+        if self.pinned.pop((row, col), None) is not None: self._pinned_counts[category] -= 1
+        self._changed()
+
+    def _changed(self):
+        for listener in self.listeners: listener()
+
+    # --- Queries ---
+    def probability(self, category):
+        """Chance that a face-down cell with nothing known about it holds a card of category."""
+        free = self.unseen - len(self.pinned)
+        return (self.counts[category] - self._pinned_counts[category]) / free if free > 0 else 0.0
+
+    def threat_probability(self):
+        """Chance that such a cell holds a card that has to be fought (hazard or hostile NPC)."""
+        return sum(self.probability(category) for category in THREATS)
+
+    def cell_posterior(self, row, col):
+        """Tuple of probabilities per category for a cell, or None if the cell is not face down."""
+        if (row, col) not in self.face_down: return None
+        pinned = self.pinned.get((row, col))
+        if pinned is not None: return tuple(1.0 if category == pinned else 0.0 for category in range(len(CATEGORIES)))
+        return tuple(self.probability(category) for category in range(len(CATEGORIES)))
+
+    def cell_threat_probability(self, row, col):
+        """Chance that a cell holds a threat (None if it is not face down)."""
+        if (row, col) not in self.face_down: return None
+        if (row, col) in self.pinned: return 1.0 if self.pinned[(row, col)] in THREATS else 0.0
+        return self.threat_probability()
+
+
+# --- Heat-Map Overlay ---
+def heat_color(probability):
+    """Green (safe) to red (certain threat)."""
+    p = min(1.0, max(0.0, probability))
+    return f"#{int(255 * p):02x}{int(200 * (1 - p)):02x}30"
+
+class HeatmapOverlay:
+    """
+    Shows the threat probability as text over the face-down card buttons. Refreshes itself
+    on every tracker change, reconfiguring only the buttons whose text changed.
+    """
+    def __init__(self, tracker, button_grid, enabled=False):
+        self.tracker = tracker
+        self.button_grid = button_grid
+        self.enabled = enabled
+        self._shown = {} # Cell -> probability text it shows (None = unknown, redraw it)
+        self._resets = tracker.resets
+        tracker.listeners.append(self.refresh)
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        self.refresh()
+
+    def toggle(self, event=None):
+        self.set_enabled(not self.enabled)
+
+    def refresh(self):
+        if self._resets != self.tracker.resets: # Undo/resume redrew the buttons: the shown text is unknown
+            self._resets = self.tracker.resets
+            self._shown = dict.fromkeys(self._shown)
+        for cell in list(self._shown):
+            if not self.enabled or cell not in self.tracker.face_down: self._set_text(cell, None)
+        if not self.enabled: return
+        for cell in self.tracker.face_down:
+            self._set_text(cell, self.tracker.cell_threat_probability(*cell))
+
+    def _set_text(self, cell, probability):
+        button = self.button_grid[cell[0]][cell[1]]
+        if button is None or not button.winfo_exists(): return
+        if probability is None:
+            button.config(text='')
+            self._shown.pop(cell, None)
+            return
+        text = f"{probability:.0%}"
+        if self._shown.get(cell) == text: return # Same rounded value: nothing to redraw
+        button.config(text=text, compound="center", fg=heat_color(probability), font=("Arial", 12, "bold"))
+        self._shown[cell] = text
+
+# --- END OF FILE card_tracker.py ---
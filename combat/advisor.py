@@ -0,0 +1,97 @@
+# --- START OF FILE combat/advisor.py ---
+
+from functools import lru_cache
+import config
+from . import logic as combat_logic
+
+# --- Win Probability Lookup Table ---
+# Combat values run from 0 (no card) up to 13 (King). The table is built once at import,
+# so ranking a full hand is just a handful of tuple lookups.
+MAX_COMBAT_VALUE = 13
+
+def _exact_win_probability(attacker_total, defender_total):
+    """Exact chance to win: automatic win, or the danger die misses every difference die."""
+    num_diff_dice = combat_logic.get_num_diff_dice(attacker_total, defender_total)
+    if num_diff_dice == 0: return 1.0
+    # Each difference die independently misses the danger die face with probability 5/6
+    return (5 / 6) ** num_diff_dice
+
+WIN_PROBABILITY_TABLE = tuple(
+    tuple(_exact_win_probability(a, d) for d in range(MAX_COMBAT_VALUE + 1))
+    for a in range(MAX_COMBAT_VALUE + 1)
+)
+
+def win_probability(attacker_total, defender_total):
+    """Looks up the exact win probability for two combat values."""
+    return WIN_PROBABILITY_TABLE[attacker_total][defender_total]
+
+
+# --- Future Threats ---
+def is_threat(card, player_suit):
+    """True for cards that start a fight: black hazards 2-10 and hostile Q/K."""
+    if not card: return False
+    rank = card.get_rank()
+    if card.get_color() == "black" and rank is not None and 2 <= rank <= 10: return True
+    return rank in [12, 13] and card.get_suit() != player_suit
+
+def get_threat_profile(card_data_grid, card_state_grid, player_suit, exclude=None):
+    """
+    Counts the combat values of threats still face down on the board.
+    Only the deck composition is used (a count per value), never which cell holds what.
+    Returns a tuple indexed by defender value so it can be used as a cache key.
+    """
+    counts = [0] * (MAX_COMBAT_VALUE + 1)
+    for r in range(config.ROWS):
+        for c in range(config.COLUMNS):
+            if (r, c) == exclude or card_state_grid[r][c] != config.STATE_FACE_DOWN: continue
+            card = card_data_grid[r][c]
+            if is_threat(card, player_suit):
+                counts[combat_logic.get_card_combat_value(card)] += 1
+    return tuple(counts)
+
+@lru_cache(maxsize=512)
+def keep_value(card_value, threat_profile):
+    """
+    Option value of keeping a card: the expected win-probability gain it would give
+    against a random future threat, compared to fighting that threat with no card.
+    """
+    total_threats = sum(threat_profile)
+    if total_threats == 0 or card_value == 0: return 0.0
+    gain = 0.0
+    for defender_value, count in enumerate(threat_profile):
+        if count:
+            gain += count * (win_probability(card_value, defender_value) - win_probability(0, defender_value))
+    return gain / total_threats
+
+
+# --- Ranking ---
+def rank_value_card_options(value_cards, target_card, threat_profile):
+    """
+    Ranks every combat option (each value card, plus fighting with no card).
+
+    Args:
+        value_cards: List of (Card, row, col) tuples from get_value_cards_from_hand.
+        target_card: The card being fought.
+        threat_profile: Tuple from get_threat_profile.
+
+    Returns:
+        list: Dicts with "card_info" (None for no card), "win_probability" and "score",
+              best option first. Score = win probability now minus the weighted option
+              value of the card spent.
+    """
+    defender_total = combat_logic.get_card_combat_value(target_card)
+    options = [{
+        "card_info": None,
+        "win_probability": win_probability(0, defender_total),
+        "score": win_probability(0, defender_total),
+    }]
+    for card_info in value_cards:
+        card_value = combat_logic.get_card_combat_value(card_info[0])
+        p_win = win_probability(card_value, defender_total)
+        score = p_win - config.ADVISOR_KEEP_WEIGHT * keep_value(card_value, threat_profile)
+        options.append({"card_info": card_info, "win_probability": p_win, "score": score})
+    # Stable sort keeps "no card" ahead of an equally scored card (cheaper to keep the card)
+    options.sort(key=lambda option: option["score"], reverse=True)
+    return options
+
+# --- END OF FILE combat/advisor.py ---
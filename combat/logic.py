@@ -1,5 +1,9 @@
 # --- START OF FILE combat/logic.py ---
 
+import log
+
+_log = log.get_logger("combat")
+
 # Needs Card definition if type hinting or checking card properties
 # from card_logic import Card # Assuming card_logic.py is at the project root
 
@@ -12,20 +16,22 @@ def get_card_combat_value(card):
     if rank is not None and 2 <= rank <= 10: return rank
     return 0 # Default for Aces, Jokers, etc. (and invalid cards)
 
+def get_num_diff_dice(attacker_total, defender_total):
+    """Number of difference dice for the given combat values (0 means automatic win)."""
+    difference = abs(attacker_total - defender_total)
+    if attacker_total > defender_total: return 0 # Automatic win case handled before rolling
+    elif difference <= 1: return 2
+    elif difference <= 3: return 3
+    elif difference <= 6: return 4
+    elif difference <= 8: return 5
+    else: return 6 # 9+ difference
+
 def calculate_combat_parameters(attacker_card, defender_card):
     """Calculates attacker/defender values, difference, and number of dice."""
     attacker_total = get_card_combat_value(attacker_card)
     defender_total = get_card_combat_value(defender_card)
     difference = abs(attacker_total - defender_total) # Absolute difference for dice count
-
-    num_diff_dice = 0
-    if attacker_total > defender_total:
-        num_diff_dice = 0 # Automatic win case handled before rolling
-    elif difference <= 1: num_diff_dice = 2
-    elif difference <= 3: num_diff_dice = 3
-    elif difference <= 6: num_diff_dice = 4
-    elif difference <= 8: num_diff_dice = 5
-    else: num_diff_dice = 6 # 9+ difference
+    num_diff_dice = get_num_diff_dice(attacker_total, defender_total)
 
     return {
         "attacker_total": attacker_total,
@@ -37,13 +43,13 @@ def calculate_combat_parameters(attacker_card, defender_card):
 def check_combat_win_condition(diff_dice_rolls, danger_die_roll, num_diff_dice):
     """Determines if combat is won based on dice rolls."""
     if danger_die_roll is None: # Safety check
-        print("  Warning: Danger die was not rolled. Assuming loss.")
+        _log.warning("  Danger die was not rolled. Assuming loss.")
         return False
     if num_diff_dice > 0 and danger_die_roll in diff_dice_rolls:
-        print(f"  Danger die ({danger_die_roll}) matches a difference roll. LOSS!")
+        if _log.debug_on: _log.debug(f"  Danger die ({danger_die_roll}) matches a difference roll. LOSS!")
         return False
     else:
-        print(f"  Danger die ({danger_die_roll}) does not match difference rolls. WIN!")
+        if _log.debug_on: _log.debug(f"  Danger die ({danger_die_roll}) does not match difference rolls. WIN!")
         return True
 
 # --- END OF FILE combat/logic.py ---
\ No newline at end of file
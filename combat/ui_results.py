@@ -2,100 +2,153 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import ImageTk, Image # Ensure Image is imported
+from PIL import Image # Ensure Image is imported
+import tk_photo # PIL -> Tk conversion
+import log
+
+_log = log.get_logger("combat")
 
 # No longer a Toplevel window
 
+MAX_DIFF_DICE = 6 # combat.logic never asks for more than 6 difference dice
+INITIAL_CONSEQUENCE_LABELS = 6 # Enough for any current win/loss; the pool grows if ever needed
+
 class CombatResultsView: # Renamed from CombatResultsWindow
-    """View to display combat results, displayed within a parent frame."""
-    def __init__(self, parent_frame, results_data, pil_dice_images, ok_callback):
+    """
+    View to display combat results, displayed within a parent frame.
+    Built once and pooled by combat.manager: configure() loads new results into the
+    existing widgets, display()/hide() swap it in and out with pack/pack_forget.
+    """
+    def __init__(self, parent_frame, pil_dice_images):
         # self.parent = parent # No longer need Toplevel parent
         self.parent_frame = parent_frame # The frame to build UI into (info_frame)
-        self.results_data = results_data
+        self.results_data = None
         self.pil_dice_images = pil_dice_images if pil_dice_images else {} # Ensure dict
-        self.tk_dice_images = {} # Cache Tk images locally
-        self.ok_callback = ok_callback # Called when OK is clicked
+        self.tk_dice_images = {} # Cache Tk images locally (kept across fights)
+        self.ok_callback = None # Called when OK is clicked
 
         # Create the main frame for this view's content
         self.frame = ttk.Frame(self.parent_frame, padding=(15, 15))
 
-        # --- UI Elements packed into self.frame ---
+        # --- UI Elements packed into self.frame (texts filled in by configure) ---
 
         # --- 1. Outcome Header ---
-        outcome_text = "YOU WIN!" if results_data["win"] else "YOU LOSE..."
-        outcome_color = "dark green" if results_data["win"] else "dark red"
-        ttk.Label(self.frame, text=outcome_text, font=("Arial", 16, "bold"), foreground=outcome_color).pack(pady=(0,15))
+        self.outcome_label = ttk.Label(self.frame, font=("Arial", 16, "bold"))
+        self.outcome_label.pack(pady=(0,15))
 
         # --- 2. Details Frame ---
         details_frame = ttk.LabelFrame(self.frame, text="Details", padding=(10, 5))
         details_frame.pack(fill='x', pady=5)
+        self.target_label = ttk.Label(details_frame)
+        self.target_label.pack(anchor='w', padx=5, pady=2)
+        self.used_card_label = ttk.Label(details_frame)
+        self.used_card_label.pack(anchor='w', padx=5, pady=2)
+        # Result line: automatic win / no dice / difference (foreground set per fight)
+        self.result_label = ttk.Label(details_frame)
+        self.result_label.pack(anchor='w', padx=5, pady=2)
+
+        # Dice rows (packed only for fights decided by dice)
+        self.dice_rows_frame = ttk.Frame(details_frame)
+        diff_dice_frame = ttk.Frame(self.dice_rows_frame)
+        diff_dice_frame.pack(anchor='w', padx=5, pady=2)
+        self.diff_dice_title = ttk.Label(diff_dice_frame)
+        self.diff_dice_title.pack(side=tk.LEFT, padx=(0, 5))
+        self.diff_dice_label_pool = [ttk.Label(diff_dice_frame, font=("Arial", 12)) for _ in range(MAX_DIFF_DICE)]
+        danger_die_frame = ttk.Frame(self.dice_rows_frame)
+        danger_die_frame.pack(anchor='w', padx=5, pady=2)
+        ttk.Label(danger_die_frame, text="Danger Die:").pack(side=tk.LEFT, padx=(0, 5))
+        self.danger_die_label = ttk.Label(danger_die_frame, font=("Arial", 12))
+        self.danger_die_label.pack(side=tk.LEFT, padx=2)
+
+
+        # --- 3. Consequences Frame ---
+        self.consequences_frame = ttk.LabelFrame(self.frame, text="Consequences", padding=(10, 5))
+        self.consequences_frame.pack(fill='x', pady=10)
+        self.consequence_label_pool = [self._new_consequence_label() for _ in range(INITIAL_CONSEQUENCE_LABELS)]
+
+
+        # --- 4. OK Button ---
+        # Command calls the ok_callback of the fight currently shown
+        self.ok_button = ttk.Button(self.frame, text="OK", command=self._ok)
+        self.ok_button.pack(pady=(15, 0))
+
+        # --- Removed centering logic and wait_window ---
+
+    def _new_consequence_label(self):
+        return ttk.Label(self.consequences_frame, wraplength=350)
+
+    def configure(self, results_data, ok_callback):
+        """Loads new results into the existing widgets."""
+        self.results_data = results_data
+        self.ok_callback = ok_callback
 
-        # (Attacker/Defender/Dice info packing remains the same as before)
-        ttk.Label(details_frame, text=f"Target: {results_data['target']} (Value: {results_data['defender_total']})").pack(anchor='w', padx=5, pady=2)
+        # --- 1. Outcome Header ---
+        outcome_text = "YOU WIN!" if results_data["win"] else "YOU LOSE..."
+        outcome_color = "dark green" if results_data["win"] else "dark red"
+        self.outcome_label.config(text=outcome_text, foreground=outcome_color)
+
+        # --- 2. Details ---
+        self.target_label.config(text=f"Target: {results_data['target']} (Value: {results_data['defender_total']})")
         used_card_text = f"Used: {results_data['used_card']} (Value: {results_data['attacker_total']})" if results_data['used_card'] else f"Used: None (Value: {results_data['attacker_total']})"
-        ttk.Label(details_frame, text=used_card_text).pack(anchor='w', padx=5, pady=2)
+        self.used_card_label.config(text=used_card_text)
 
+        self.dice_rows_frame.pack_forget()
         if results_data.get("automatic_win", False):
-             ttk.Label(details_frame, text="Result: Automatic Win (Attacker Value > Defender Value)", foreground="blue").pack(anchor='w', padx=5, pady=2)
+             self.result_label.config(text="Result: Automatic Win (Attacker Value > Defender Value)", foreground="blue")
         elif results_data['num_diff_dice'] is not None and results_data['danger_die'] is not None :
-            ttk.Label(details_frame, text=f"Difference: {results_data['difference']}").pack(anchor='w', padx=5, pady=2)
+            self.result_label.config(text=f"Difference: {results_data['difference']}", foreground="")
+            self.dice_rows_frame.pack(anchor='w', fill='x')
             # Display Difference Dice Rolls
-            diff_dice_frame = ttk.Frame(details_frame)
-            diff_dice_frame.pack(anchor='w', padx=5, pady=2)
-            ttk.Label(diff_dice_frame, text=f"Difference Dice ({results_data['num_diff_dice']}):").pack(side=tk.LEFT, padx=(0, 5))
-            if not results_data['diff_dice_rolls']:
-                 ttk.Label(diff_dice_frame, text="N/A").pack(side=tk.LEFT, padx=2)
+            self.diff_dice_title.config(text=f"Difference Dice ({results_data['num_diff_dice']}):")
+            for lbl in self.diff_dice_label_pool: lbl.pack_forget()
+            rolls = results_data['diff_dice_rolls']
+            if not rolls:
+                 self._show_die(self.diff_dice_label_pool[0], None, "N/A")
+                 self.diff_dice_label_pool[0].pack(side=tk.LEFT, padx=2)
             else:
-                for roll in results_data['diff_dice_rolls']:
-                    img = self._get_tk_dice_image(roll)
-                    if img:
-                        lbl = ttk.Label(diff_dice_frame, image=img); lbl.image = img
-                        lbl.pack(side=tk.LEFT, padx=2)
-                    else:
-                        ttk.Label(diff_dice_frame, text=f"[{roll}]", font=("Arial", 12)).pack(side=tk.LEFT, padx=2)
+                for lbl, roll in zip(self.diff_dice_label_pool, rolls):
+                    self._show_die(lbl, roll, f"[{roll}]")
+                    lbl.pack(side=tk.LEFT, padx=2)
             # Display Danger Die Roll
-            danger_die_frame = ttk.Frame(details_frame)
-            danger_die_frame.pack(anchor='w', padx=5, pady=2)
-            ttk.Label(danger_die_frame, text="Danger Die:").pack(side=tk.LEFT, padx=(0, 5))
             danger_roll = results_data['danger_die']
-            img = self._get_tk_dice_image(danger_roll)
-            if img:
-                lbl = ttk.Label(danger_die_frame, image=img); lbl.image = img
-                lbl.pack(side=tk.LEFT, padx=2)
-            else:
-                 roll_text = f"[{danger_roll}]" if danger_roll is not None else "N/A"
-                 ttk.Label(danger_die_frame, text=roll_text, font=("Arial", 12)).pack(side=tk.LEFT, padx=2)
+            self._show_die(self.danger_die_label, danger_roll, f"[{danger_roll}]" if danger_roll is not None else "N/A")
         else:
-             ttk.Label(details_frame, text="Result determined without dice roll.").pack(anchor='w', padx=5, pady=2)
-
-
-        # --- 3. Consequences Frame ---
-        consequences_frame = ttk.LabelFrame(self.frame, text="Consequences", padding=(10, 5))
-        consequences_frame.pack(fill='x', pady=10)
-        if not results_data.get("consequences"):
-             ttk.Label(consequences_frame, text="- None").pack(anchor='w', padx=5, pady=2)
+             self.result_label.config(text="Result determined without dice roll.", foreground="")
+
+        # --- 3. Consequences ---
+        lines = [f"- {line}" for line in results_data.get("consequences", [])] or ["- None"]
+        while len(self.consequence_label_pool) < len(lines):
+            self.consequence_label_pool.append(self._new_consequence_label())
+        for lbl in self.consequence_label_pool: lbl.pack_forget()
+        for lbl, line in zip(self.consequence_label_pool, lines):
+            lbl.config(text=line)
+            lbl.pack(anchor='w', padx=5, pady=1)
+
+    def _show_die(self, label, value, fallback_text):
+        """Shows a die face image on a pooled label, or the text fallback."""
+        img = self._get_tk_dice_image(value) if value is not None else None
+        if img:
+            label.config(image=img, text=''); label.image = img
         else:
-            for line in results_data["consequences"]:
-                ttk.Label(consequences_frame, text=f"- {line}", wraplength=350).pack(anchor='w', padx=5, pady=1)
-
-
-        # --- 4. OK Button ---
-        # Command now calls the ok_callback provided by the manager
-        ok_button = ttk.Button(self.frame, text="OK", command=self.ok_callback)
-        ok_button.pack(pady=(15, 0))
-        ok_button.focus_set() # Set focus
-
-        # --- Removed centering logic and wait_window ---
+            label.config(image='', text=fallback_text); label.image = None
 
     def display(self):
         """Packs the view's frame into the parent frame."""
         self.frame.pack(fill='x', pady=20) # Example packing
+        self.ok_button.focus_set() # Set focus
+
+    def hide(self):
+        """Unpacks the view's frame, keeping its widgets for the next fight."""
+        if self.frame.winfo_exists(): self.frame.pack_forget()
 
     def destroy_view(self):
         """Destroys the view's main frame."""
         if self.frame and self.frame.winfo_exists():
             self.frame.destroy()
 
+    def _ok(self):
+        if self.ok_callback: self.ok_callback()
+
     # --- _get_tk_dice_image (remains the same, uses self.frame as master) ---
     def _get_tk_dice_image(self, value):
         if not self.frame or not self.frame.winfo_exists(): return None
@@ -105,11 +158,11 @@ class CombatResultsView: # Renamed from CombatResultsWindow
         pil_img = self.pil_dice_images.get(key)
         if pil_img and isinstance(pil_img, Image.Image):
             try:
-                tk_image = ImageTk.PhotoImage(pil_img, master=self.frame) # MASTER is self.frame
+                tk_image = tk_photo.photo_image(pil_img, master=self.frame) # MASTER is self.frame
                 self.tk_dice_images[key] = tk_image
                 return tk_image
             except Exception as e:
-                print(f"Error creating Tk image for {key} in ResultsView: {e}")
+                _log.error(f"Could not create Tk image for {key} in ResultsView: {e}")
                 if key not in self.tk_dice_images:
                      if self.frame.winfo_exists():
                         messagebox.showerror("Image Error", f"Failed to load dice image {key}.\nError: {e}", parent=self.frame)
@@ -117,4 +170,4 @@ class CombatResultsView: # Renamed from CombatResultsWindow
         else:
              self.tk_dice_images[key] = None; return None
 
-# --- END OF FILE combat/ui_results.py ---
\ No newline at end of file
+# --- END OF FILE combat/ui_results.py ---
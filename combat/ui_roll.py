@@ -3,32 +3,42 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import random
-from PIL import ImageTk, Image # Ensure Image is imported
+from PIL import Image # Ensure Image is imported
+import tk_photo # PIL -> Tk conversion
 import config
 import utils # For roll_dice
 import sys # For exit
+import log
+import flight_recorder
+
+_log = log.get_logger("combat")
 
 # No longer a Toplevel window
 
+MAX_DIFF_DICE = 6 # combat.logic never asks for more than 6 difference dice
+
 class CombatRollView: # Renamed from CombatRollWindow
-    """View for interactively rolling combat dice, displayed within a parent frame."""
-    def __init__(self, parent_frame, player, target_card,
-                 selected_value_card_info, game_state, combat_params, finalize_callback):
+    """
+    View for interactively rolling combat dice, displayed within a parent frame.
+    Built once and pooled by combat.manager: configure() loads a new fight into the
+    existing widgets, display()/hide() swap it in and out with pack/pack_forget.
+    """
+    def __init__(self, parent_frame, pil_dice_images, animations):
         # self.parent = parent # No longer need Toplevel parent
         self.parent_frame = parent_frame # The frame to build UI into (info_frame)
-
-        # Store necessary data (remains the same)
-        self.player = player
-        self.target_card = target_card
-        self.selected_value_card_info = selected_value_card_info
-        self.game_state = game_state
-        self.pil_dice_images = game_state["assets"].get("pil_dice_scaled", {})
-        self.tk_dice_images = {} # Cache Tk images for this view instance
-        self.attacker_total = combat_params["attacker_total"]
-        self.defender_total = combat_params["defender_total"]
-        self.difference = combat_params["difference"]
-        self.num_diff_dice = combat_params["num_diff_dice"]
-        self.finalize_callback = finalize_callback # Called with roll results or None
+        self.pil_dice_images = pil_dice_images if pil_dice_images else {}
+        self.animations = animations # The board's animation.AnimationContext (speed and skip registry)
+        self.tk_dice_images = {} # Cache Tk images for this view (kept across fights)
+
+        # Per-fight data, filled in by configure()
+        self.player = None
+        self.target_card = None
+        self.selected_value_card_info = None
+        self.game_state = None
+        self.attacker_total = self.defender_total = self.difference = 0
+        self.num_diff_dice = 0
+        self.finalize_callback = None # Called with roll results or None
+        self.preset_rolls = None # Replays: {"diff_rolls", "danger_roll"} shown instead of rolling
 
         # State for rolling / animation (remains the same)
         self.diff_dice_rolls = []
@@ -41,11 +51,14 @@ class CombatRollView: # Renamed from CombatRollWindow
         self.max_shuffle_steps = 0
         self._after_id_diff = None # Store after ID for cancellation
         self._after_id_danger = None # Store after ID for cancellation
+        self._after_id_finalize = None # Pause before finalize (skippable)
+        # Cosmetic shuffle faces use their own RNG so skipping frames never changes later rolls
+        self._shuffle_rng = random.Random()
 
-        print(f"[CombatRollView Init] PIL Dice Images available: {list(self.pil_dice_images.keys())}")
+        if _log.debug_on: _log.debug(f"[CombatRollView Init] PIL Dice Images available: {list(self.pil_dice_images.keys())}")
         # (Warnings about missing images remain the same)
-        if not self.pil_dice_images: print("  WARNING: No PIL dice images loaded.")
-        elif 'icon' not in self.pil_dice_images: print("  WARNING: Placeholder icon not loaded.")
+        if not self.pil_dice_images: _log.warning("No PIL dice images loaded.")
+        elif 'icon' not in self.pil_dice_images: _log.warning("Placeholder icon not loaded.")
 
 
         # Create the main frame for this view's content
@@ -56,13 +69,12 @@ class CombatRollView: # Renamed from CombatRollWindow
         # --- 1. Info Frame ---
         info_frame_ui = ttk.LabelFrame(self.frame, text="Combat Details", padding=(10, 5))
         info_frame_ui.pack(fill='x', pady=(0, 10))
-        used_card = selected_value_card_info[0] if selected_value_card_info else "None"
-        ttk.Label(info_frame_ui, text=f"Attacker: {self.attacker_total} (Card: {used_card})").pack(anchor='w', padx=5, pady=1)
-        ttk.Label(info_frame_ui, text=f"Defender: {self.target_card} (Value: {self.defender_total})").pack(anchor='w', padx=5, pady=1)
-        if self.num_diff_dice > 0:
-            ttk.Label(info_frame_ui, text=f"Difference: {self.difference} -> Roll {self.num_diff_dice} Difference Dice vs Danger Die").pack(anchor='w', padx=5, pady=1)
-        else:
-             ttk.Label(info_frame_ui, text=f"Difference: {self.difference} -> No dice roll needed.").pack(anchor='w', padx=5, pady=1)
+        self.attacker_label = ttk.Label(info_frame_ui)
+        self.attacker_label.pack(anchor='w', padx=5, pady=1)
+        self.defender_label = ttk.Label(info_frame_ui)
+        self.defender_label.pack(anchor='w', padx=5, pady=1)
+        self.difference_label = ttk.Label(info_frame_ui)
+        self.difference_label.pack(anchor='w', padx=5, pady=1)
 
 
         # --- 2. Determine Dice Size for Layout --- (remains the same)
@@ -71,7 +83,7 @@ class CombatRollView: # Renamed from CombatRollWindow
         if ref_pil_img and isinstance(ref_pil_img, Image.Image):
              estimated_dice_w = int(ref_pil_img.width * 1.15)
              estimated_dice_h = int(ref_pil_img.height * 1.2)
-             print(f"  Estimated dice display size: {estimated_dice_w}x{estimated_dice_h}")
+             if _log.debug_on: _log.debug(f"  Estimated dice display size: {estimated_dice_w}x{estimated_dice_h}")
 
 
         # --- 3. Difference Dice Display Area --- (Layout remains the same)
@@ -81,6 +93,9 @@ class CombatRollView: # Renamed from CombatRollWindow
         diff_outer_frame.pack_propagate(False)
         self.diff_dice_display_frame = ttk.Frame(diff_outer_frame)
         self.diff_dice_display_frame.pack(fill='none', expand=True)
+        # Label pool: the most dice any fight can need, shown/hidden per fight
+        self.diff_dice_label_pool = [ttk.Label(self.diff_dice_display_frame) for _ in range(MAX_DIFF_DICE)]
+        self.no_dice_label = ttk.Label(self.diff_dice_display_frame, text="N/A")
 
 
         # --- 4. Danger Die Display Area --- (Layout remains the same)
@@ -91,11 +106,6 @@ class CombatRollView: # Renamed from CombatRollWindow
         self.danger_die_display_frame = ttk.Frame(danger_outer_frame)
         self.danger_die_display_frame.pack(fill='none', expand=True)
         self.danger_die_label = ttk.Label(self.danger_die_display_frame)
-        icon_img = self._get_tk_dice_image('icon')
-        if icon_img:
-            self.danger_die_label.config(image=icon_img); self.danger_die_label.image = icon_img
-        else:
-            self.danger_die_label.config(text="?", font=("Arial", 24, "bold"), anchor='center')
         self.danger_die_label.pack(expand=True)
 
 
@@ -104,14 +114,8 @@ class CombatRollView: # Renamed from CombatRollWindow
         button_frame.pack(fill='x')
 
         # --- Roll Difference Dice Button ---
-        # Now enabled by default if dice > 0, command triggers roll
-        self.roll_diff_button = None
-        if self.num_diff_dice > 0:
-            self.roll_diff_button = ttk.Button(button_frame, text=f"Roll {self.num_diff_dice} Dice",
-                                               command=self._start_diff_dice_roll, state=tk.NORMAL) # Start NORMAL
-            self.roll_diff_button.pack(side=tk.LEFT, padx=5, expand=True, fill='x')
-        else:
-            ttk.Label(self.diff_dice_display_frame, text="N/A").pack(expand=True)
+        # Packed by configure() only when the fight needs difference dice
+        self.roll_diff_button = ttk.Button(button_frame, command=self._start_diff_dice_roll)
 
         # --- Roll Danger Die Button ---
         # Starts disabled, enabled after diff dice finish
@@ -119,13 +123,63 @@ class CombatRollView: # Renamed from CombatRollWindow
                                              command=self._start_danger_die_roll, state=tk.DISABLED)
         self.roll_danger_button.pack(side=tk.RIGHT, padx=5, expand=True, fill='x')
 
+        # --- Removed centering logic (handled by parent frame) ---
+        # --- Removed automatic roll trigger ---
 
-        # --- 6. Initial Setup ---
+    def configure(self, player, target_card, selected_value_card_info, game_state, combat_params, finalize_callback,
+                  preset_rolls=None):
+        """
+        Loads a new fight into the existing widgets and resets the roll state.
+        With preset_rolls ({"diff_rolls": [...], "danger_roll": n}, used by replays) the view
+        shows those results instead of rolling, and play_preset() runs both rolls unattended.
+        """
+        self._cancel_pending()
+        self.player = player
+        self.target_card = target_card
+        self.selected_value_card_info = selected_value_card_info
+        self.game_state = game_state
+        self.attacker_total = combat_params["attacker_total"]
+        self.defender_total = combat_params["defender_total"]
+        self.difference = combat_params["difference"]
+        self.num_diff_dice = combat_params["num_diff_dice"]
+        self.finalize_callback = finalize_callback
+        self.preset_rolls = preset_rolls
+
+        self.diff_dice_rolls = []
+        self.danger_die_roll = None
+        self.is_shuffling = False
+        self.animation_frame_count = 0
+        self.die_total_shuffle_steps = []
+        self.max_shuffle_steps = 0
+
+        # --- 1. Info texts ---
+        used_card = selected_value_card_info[0] if selected_value_card_info else "None"
+        self.attacker_label.config(text=f"Attacker: {self.attacker_total} (Card: {used_card})")
+        self.defender_label.config(text=f"Defender: {self.target_card} (Value: {self.defender_total})")
         if self.num_diff_dice > 0:
-             self._setup_diff_dice_labels() # Setup placeholders
+            self.difference_label.config(text=f"Difference: {self.difference} -> Roll {self.num_diff_dice} Difference Dice vs Danger Die")
+        else:
+            self.difference_label.config(text=f"Difference: {self.difference} -> No dice roll needed.")
 
-        # --- Removed centering logic (handled by parent frame) ---
-        # --- Removed automatic roll trigger ---
+        # --- 2. Dice placeholders ---
+        self._show_placeholder(self.danger_die_label)
+        self.roll_diff_button.pack_forget()
+        self.no_dice_label.pack_forget()
+        if self.num_diff_dice > 0:
+            self.roll_diff_button.config(text=f"Roll {self.num_diff_dice} Dice", state=tk.NORMAL) # Start NORMAL
+            self.roll_diff_button.pack(side=tk.LEFT, padx=5, expand=True, fill='x')
+            self._setup_diff_dice_labels() # Setup placeholders
+        else:
+            for lbl in self.diff_dice_label_pool: lbl.pack_forget()
+            self.diff_dice_labels = []
+            self.no_dice_label.pack(expand=True)
+        self.roll_danger_button.config(state=tk.DISABLED)
+        if preset_rolls: self.roll_diff_button.config(state=tk.DISABLED) # Replay drives the rolls
+
+    def play_preset(self):
+        """Animates the preset rolls (difference dice, then the danger die) without button presses."""
+        if self.num_diff_dice > 0: self._start_diff_dice_roll()
+        else: self._start_danger_die_roll()
 
     # --- Methods ---
 
@@ -133,20 +187,31 @@ class CombatRollView: # Renamed from CombatRollWindow
         """Packs the view's frame into the parent frame."""
         self.frame.pack(fill='x', pady=20) # Example packing
 
-    def destroy_view(self):
-        """Destroys the view's main frame and cancels pending animations."""
-        print("Destroying CombatRollView")
-        # Cancel any pending 'after' calls
+    def hide(self):
+        """Stops any animation and unpacks the view's frame, keeping its widgets."""
+        self._cancel_pending()
+        if self.frame.winfo_exists(): self.frame.pack_forget()
+
+    def _cancel_pending(self):
+        """Cancels any pending 'after' calls and leaves the skip registry."""
         if self._after_id_diff:
             self.frame.after_cancel(self._after_id_diff)
             self._after_id_diff = None
         if self._after_id_danger:
             self.frame.after_cancel(self._after_id_danger)
             self._after_id_danger = None
+        if self._after_id_finalize:
+            self.frame.after_cancel(self._after_id_finalize)
+            self._after_id_finalize = None
+        self.animations.unregister(self)
+        self.is_shuffling = False # Ensure shuffling stops
 
+    def destroy_view(self):
+        """Destroys the view's main frame and cancels pending animations."""
+        if _log.debug_on: _log.debug("Destroying CombatRollView")
+        self._cancel_pending()
         if self.frame and self.frame.winfo_exists():
             self.frame.destroy()
-        self.is_shuffling = False # Ensure shuffling stops
 
     # --- _get_tk_dice_image (remains the same, uses self.frame as master) ---
     def _get_tk_dice_image(self, value):
@@ -157,11 +222,11 @@ class CombatRollView: # Renamed from CombatRollWindow
         pil_img = self.pil_dice_images.get(key)
         if pil_img and isinstance(pil_img, Image.Image):
             try:
-                tk_image = ImageTk.PhotoImage(pil_img, master=self.frame) # MASTER is self.frame
+                tk_image = tk_photo.photo_image(pil_img, master=self.frame) # MASTER is self.frame
                 self.tk_dice_images[key] = tk_image
                 return tk_image
             except Exception as e:
-                print(f"  ERROR creating Tk image for key {key}: {e}")
+                _log.error(f"  Could not create Tk image for key {key}: {e}")
                 if key not in self.tk_dice_images:
                      if self.frame.winfo_exists(): # Check frame before showing error
                         messagebox.showerror("Image Error", f"Failed to load dice image '{key}'.\nError: {e}", parent=self.frame) # Parent is frame
@@ -170,20 +235,21 @@ class CombatRollView: # Renamed from CombatRollWindow
              self.tk_dice_images[key] = None; return None
 
 
-    # --- _setup_diff_dice_labels (remains the same) ---
+    def _show_placeholder(self, label):
+        """Shows the '?' die icon (or text fallback) on a label."""
+        icon_img = self._get_tk_dice_image('icon')
+        if icon_img:
+            label.config(image=icon_img, text=''); label.image = icon_img
+        else:
+            label.config(text="?", image='', font=("Arial", 24, "bold"), anchor='center')
+
     def _setup_diff_dice_labels(self):
+        """Shows the first num_diff_dice pooled labels as placeholders, hides the rest."""
+        for lbl in self.diff_dice_label_pool: lbl.pack_forget()
+        self.diff_dice_labels = self.diff_dice_label_pool[:self.num_diff_dice]
         for lbl in self.diff_dice_labels:
-             if lbl.winfo_exists(): lbl.destroy()
-        self.diff_dice_labels = []
-        icon_img = self._get_tk_dice_image('icon')
-        for i in range(self.num_diff_dice):
-             lbl = ttk.Label(self.diff_dice_display_frame)
-             if icon_img:
-                 lbl.config(image=icon_img); lbl.image = icon_img
-             else:
-                 lbl.config(text="?", font=("Arial", 24, "bold"), anchor='center')
+             self._show_placeholder(lbl)
              lbl.pack(side=tk.LEFT, padx=5, pady=0, anchor='center')
-             self.diff_dice_labels.append(lbl)
 
     # --- Animation Logic (remains mostly the same, but uses self.frame.after) ---
 
@@ -193,15 +259,16 @@ class CombatRollView: # Renamed from CombatRollWindow
         if not self.frame.winfo_exists() or self.is_shuffling: return
         if self.num_diff_dice <= 0: return
 
-        print(f"Starting roll animation for {self.num_diff_dice} difference dice...")
+        if _log.debug_on: _log.debug(f"Starting roll animation for {self.num_diff_dice} difference dice...")
         self.is_shuffling = True
         # --- Disable BOTH buttons during animation ---
         if self.roll_diff_button: self.roll_diff_button.config(state=tk.DISABLED)
         if self.roll_danger_button: self.roll_danger_button.config(state=tk.DISABLED)
         # ---------------------------------------------
 
-        self.diff_dice_rolls = utils.roll_dice(self.num_diff_dice)
-        print(f"  Pre-rolled results: {self.diff_dice_rolls}")
+        if self.preset_rolls: self.diff_dice_rolls = list(self.preset_rolls["diff_rolls"])
+        else: self.diff_dice_rolls = utils.roll_dice(self.num_diff_dice, self.game_state.get("dice_rng"))
+        if _log.debug_on: _log.debug(f"  Pre-rolled results: {self.diff_dice_rolls}")
 
         self.die_total_shuffle_steps = []
         self.max_shuffle_steps = 0
@@ -210,16 +277,18 @@ class CombatRollView: # Renamed from CombatRollWindow
             self.die_total_shuffle_steps.append(steps)
             self.max_shuffle_steps = max(self.max_shuffle_steps, steps)
 
-        print(f"  Animation steps per die: {self.die_total_shuffle_steps}")
-        print(f"  Total animation frames needed: {self.max_shuffle_steps}")
+        if _log.debug_on: _log.debug(f"  Animation steps per die: {self.die_total_shuffle_steps}")
+        if _log.debug_on: _log.debug(f"  Total animation frames needed: {self.max_shuffle_steps}")
 
         self.animation_frame_count = 0
-        self._animate_diff_dice() # Start the animation loop
+        self.animations.register(self)
+        if self.animations.is_instant(): self.skip()
+        else: self._animate_diff_dice() # Start the animation loop
 
     def _animate_diff_dice(self):
         """Animates difference dice, stopping them sequentially."""
         if not self.frame.winfo_exists():
-            print("  Animation stopped: View destroyed.")
+            if _log.debug_on: _log.debug("  Animation stopped: View destroyed.")
             self.is_shuffling = False; self._after_id_diff = None; return
 
         # (Animation update logic remains the same as before)
@@ -230,11 +299,12 @@ class CombatRollView: # Renamed from CombatRollWindow
                 required_steps = self.die_total_shuffle_steps[i]
                 if self.animation_frame_count < required_steps:
                     animation_still_running = True
-                    temp_roll = random.randint(1, 6); img = self._get_tk_dice_image(temp_roll)
+                    temp_roll = self._shuffle_rng.randint(1, 6); img = self._get_tk_dice_image(temp_roll)
                     if img: lbl.config(image=img, text=''); lbl.image = img
                     else: lbl.config(text=f"[{temp_roll}]", image='', font=("Arial", 24, "bold"))
                 elif self.animation_frame_count == required_steps:
-                     final_roll = self.diff_dice_rolls[i]; print(f"  Die {i+1} stopping: {final_roll}")
+                     final_roll = self.diff_dice_rolls[i]
+                     if _log.debug_on: _log.debug(f"  Die {i+1} stopping: {final_roll}")
                      img = self._get_tk_dice_image(final_roll)
                      if img: lbl.config(image=img, text=''); lbl.image = img
                      else: lbl.config(text=f"[{final_roll}]", image='', font=("Arial", 24, "bold"))
@@ -242,21 +312,27 @@ class CombatRollView: # Renamed from CombatRollWindow
             # Schedule next frame using self.frame.after
             if animation_still_running or self.animation_frame_count < self.max_shuffle_steps:
                  self.animation_frame_count += 1
-                 self._after_id_diff = self.frame.after(config.DICE_SHUFFLE_DELAY, self._animate_diff_dice) # Use self.frame
+                 self._after_id_diff = self.frame.after(self.animations.scaled_delay(config.DICE_SHUFFLE_DELAY), self._animate_diff_dice) # Use self.frame
             else: # Animation finished
                 self._after_id_diff = None
-                print("Difference dice rolling animation finished.")
-                self.is_shuffling = False # Mark shuffling as done *before* enabling button
-                # Enable danger die button
-                if self.frame.winfo_exists() and self.roll_danger_button:
-                    self.roll_danger_button.config(state=tk.NORMAL)
-                    self.roll_danger_button.focus_set()
+                if _log.debug_on: _log.debug("Difference dice rolling animation finished.")
+                self._finish_diff_dice()
         else: # Should not happen if logic above is correct, but safety catch
              self._after_id_diff = None
-             print("Difference dice animation finished (final check).")
-             self.is_shuffling = False
-             if self.frame.winfo_exists() and self.roll_danger_button:
-                 self.roll_danger_button.config(state=tk.NORMAL); self.roll_danger_button.focus_set()
+             if _log.debug_on: _log.debug("Difference dice animation finished (final check).")
+             self._finish_diff_dice()
+
+    def _finish_diff_dice(self):
+        """Marks the difference roll done and hands over to the danger die button."""
+        self.animations.unregister(self)
+        self.is_shuffling = False # Mark shuffling as done *before* enabling button
+        if self.preset_rolls and self.frame.winfo_exists():
+            self._start_danger_die_roll() # Replay: no button press needed
+            return
+        # Enable danger die button
+        if self.frame.winfo_exists() and self.roll_danger_button:
+            self.roll_danger_button.config(state=tk.NORMAL)
+            self.roll_danger_button.focus_set()
 
 
     def _start_danger_die_roll(self):
@@ -264,9 +340,9 @@ class CombatRollView: # Renamed from CombatRollWindow
         # Added check for is_shuffling
         if not self.frame.winfo_exists() or self.is_shuffling: return
         if not self.danger_die_label or not self.danger_die_label.winfo_exists():
-             print("Error: Danger die label missing."); self._finalize_error("Danger die label missing"); return
+             _log.error("Danger die label missing."); self._finalize_error("Danger die label missing"); return
 
-        print("Rolling danger die (with shuffle)...")
+        if _log.debug_on: _log.debug("Rolling danger die (with shuffle)...")
         self.is_shuffling = True
         # --- Disable Danger button during animation ---
         if self.roll_danger_button: self.roll_danger_button.config(state=tk.DISABLED)
@@ -274,62 +350,102 @@ class CombatRollView: # Renamed from CombatRollWindow
         if self.roll_diff_button: self.roll_diff_button.config(state=tk.DISABLED)
         # ---------------------------------------------
 
-        self.danger_die_roll = utils.roll_dice(1)[0]
-        print(f"  Pre-rolled danger die: {self.danger_die_roll}")
+        if self.preset_rolls: self.danger_die_roll = self.preset_rolls["danger_roll"]
+        else: self.danger_die_roll = utils.roll_dice(1, self.game_state.get("dice_rng"))[0]
+        if _log.debug_on: _log.debug(f"  Pre-rolled danger die: {self.danger_die_roll}")
 
         self.animation_frame_count = 0
         self.max_shuffle_steps = config.DICE_BASE_SHUFFLE_STEPS + config.DICE_INCREMENTAL_SHUFFLE_STEPS
-        print(f"  Danger die animation frames: {self.max_shuffle_steps}")
+        if _log.debug_on: _log.debug(f"  Danger die animation frames: {self.max_shuffle_steps}")
 
-        self._animate_danger_die() # Start the animation loop
+        self.animations.register(self)
+        if self.animations.is_instant(): self.skip()
+        else: self._animate_danger_die() # Start the animation loop
 
     def _animate_danger_die(self):
         """Animates the danger die."""
         if not self.frame.winfo_exists():
-            print("  Animation stopped: View destroyed.")
+            if _log.debug_on: _log.debug("  Animation stopped: View destroyed.")
             self.is_shuffling = False; self._after_id_danger = None; return
         if not self.danger_die_label or not self.danger_die_label.winfo_exists():
-             print("Error: Danger die label destroyed."); self.is_shuffling = False; self._after_id_danger = None; self._finalize_error("Danger die label missing"); return
+             _log.error("Danger die label destroyed."); self.is_shuffling = False; self._after_id_danger = None; self._finalize_error("Danger die label missing"); return
 
         # (Animation update logic remains the same)
         if self.animation_frame_count <= self.max_shuffle_steps:
             if self.animation_frame_count < self.max_shuffle_steps:
-                temp_roll = random.randint(1, 6); img = self._get_tk_dice_image(temp_roll)
+                temp_roll = self._shuffle_rng.randint(1, 6); img = self._get_tk_dice_image(temp_roll)
                 if img: self.danger_die_label.config(image=img, text=''); self.danger_die_label.image = img
                 else: self.danger_die_label.config(text=f"[{temp_roll}]", image='', font=("Arial", 24, "bold"))
             else: # Last frame, show result
-                print(f"  Danger die stopping: {self.danger_die_roll}")
+                if _log.debug_on: _log.debug(f"  Danger die stopping: {self.danger_die_roll}")
                 img = self._get_tk_dice_image(self.danger_die_roll)
                 if img: self.danger_die_label.config(image=img, text=''); self.danger_die_label.image = img
                 else: self.danger_die_label.config(text=f"[{self.danger_die_roll}]", image='', font=("Arial", 24, "bold"))
 
             # Schedule next frame using self.frame.after
             self.animation_frame_count += 1
-            self._after_id_danger = self.frame.after(config.DICE_SHUFFLE_DELAY, self._animate_danger_die) # Use self.frame
+            self._after_id_danger = self.frame.after(self.animations.scaled_delay(config.DICE_SHUFFLE_DELAY), self._animate_danger_die) # Use self.frame
         else: # Animation finished
              self._after_id_danger = None
-             print("Danger die animation finished.")
+             if _log.debug_on: _log.debug("Danger die animation finished.")
              self.is_shuffling = False
-             # Proceed to finalize combat after a short pause
+             # Proceed to finalize combat after a short pause (still skippable)
              if self.frame.winfo_exists():
                  # Use self.frame.after to schedule the finalize call
-                 self.frame.after(400, self._finalize)
+                 self._after_id_finalize = self.frame.after(self.animations.scaled_delay(config.COMBAT_FINALIZE_PAUSE), self._finalize)
+
+    # --- Skip / Fast-Forward ---
+
+    def skip(self):
+        """
+        Jumps the running dice animation to its final frame.
+        Rolls are pre-rolled before animating, so the outcome is identical to watching it.
+        """
+        if not self.frame.winfo_exists():
+            self.animations.unregister(self); return
+        if self._after_id_diff: # Difference dice mid-shuffle
+            self.frame.after_cancel(self._after_id_diff); self._after_id_diff = None
+        if self.is_shuffling and self.danger_die_roll is None: # Difference dice: show all final faces
+            for i, lbl in enumerate(self.diff_dice_labels):
+                if lbl.winfo_exists() and i < len(self.diff_dice_rolls): self._show_die_face(lbl, self.diff_dice_rolls[i])
+            self.animation_frame_count = self.max_shuffle_steps
+            self._finish_diff_dice()
+            return
+        if self._after_id_danger: # Danger die mid-shuffle
+            self.frame.after_cancel(self._after_id_danger); self._after_id_danger = None
+        if self._after_id_finalize: # Pause before results
+            self.frame.after_cancel(self._after_id_finalize); self._after_id_finalize = None
+        if self.danger_die_roll is not None:
+            if self.danger_die_label and self.danger_die_label.winfo_exists():
+                self._show_die_face(self.danger_die_label, self.danger_die_roll)
+            self.is_shuffling = False
+            self.animations.unregister(self)
+            self._finalize()
+        else:
+            self.animations.unregister(self)
+
+    def _show_die_face(self, label, value):
+        img = self._get_tk_dice_image(value)
+        if img: label.config(image=img, text=''); label.image = img
+        else: label.config(text=f"[{value}]", image='', font=("Arial", 24, "bold"))
 
     # --- Finalization ---
 
     def _finalize(self):
         """Gathers results and calls the finalize_callback passed during init."""
+        self._after_id_finalize = None
+        self.animations.unregister(self)
         if not self.frame.winfo_exists():
-            print("Roll view destroyed before finalizing.")
+            if _log.debug_on: _log.debug("Roll view destroyed before finalizing.")
             # Don't call callback again if already destroyed
             return
 
         if self.danger_die_roll is None:
-            print("Error: Finalizing but danger die was not rolled.")
+            _log.error("Finalizing but danger die was not rolled.")
             self._finalize_error("Danger die result missing")
             return
 
-        print("Finalizing CombatRollView, calling finalize callback.")
+        if _log.debug_on: _log.debug("Finalizing CombatRollView, calling finalize callback.")
         results = { "diff_rolls": self.diff_dice_rolls, "danger_roll": self.danger_die_roll }
 
         # Call the callback provided by the manager
@@ -337,18 +453,20 @@ class CombatRollView: # Renamed from CombatRollWindow
             try:
                 self.finalize_callback(results)
             except Exception as e:
-                 print(f"Error executing finalize_callback: {e}")
+                 _log.error(f"Error executing finalize_callback: {e}")
         # No need to destroy self here, the manager will handle it
 
 
     def _finalize_error(self, message):
         """Calls finalize callback with None to indicate failure."""
-        print(f"Finalizing CombatRollView with error: {message}")
+        if _log.debug_on: _log.debug(f"Finalizing CombatRollView with error: {message}")
+        flight_recorder.record("combat_error", message=message)
+        flight_recorder.dump(reason=f"combat error: {message}")
         if self.finalize_callback:
             try:
                 self.finalize_callback(None) # Signal error to manager
             except Exception as e:
-                 print(f"Error executing finalize_callback during error handling: {e}")
+                 _log.error(f"Error executing finalize_callback during error handling: {e}")
         # Let the manager handle destroying the view
 
 
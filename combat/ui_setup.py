@@ -2,58 +2,51 @@
 
 import tkinter as tk
 from tkinter import ttk
+import config
 
 # No longer a Toplevel window
 
 class CombatSetupView: # Renamed from CombatSetupWindow
-    """View for selecting a value card before combat, displayed within a parent frame."""
-    def __init__(self, parent_frame, target_card, value_cards_in_hand, callback):
+    """
+    View for selecting a value card before combat, displayed within a parent frame.
+    Built once and pooled by combat.manager: configure() loads a new fight into the
+    existing widgets, display()/hide() swap it in and out with pack/pack_forget.
+    """
+    def __init__(self, parent_frame):
         # self.parent = parent # No longer need Toplevel parent
         self.parent_frame = parent_frame # The frame to build UI into (info_frame)
-        self.target_card = target_card
-        self.value_cards = value_cards_in_hand # List of (Card, row, col) tuples
-        self.callback = callback # Called with selection or False on cancel
+        self.target_card = None
+        self.value_cards = [] # List of (Card, row, col) tuples
+        self.callback = None # Called with selection or False on cancel
         self.selected_card_info = None
+        # Ranked options from combat.advisor (best first), or None to hide percentages
+        self.advice = None
 
         # Create the main frame for this view's content
         self.frame = ttk.Frame(self.parent_frame, padding=(15, 15))
         # self.frame.pack(fill='x', expand=True) # Don't pack here, display() method will do it
 
-        # --- UI Elements packed into self.frame ---
-        target_rank = target_card.get_rank()
-        target_value_display = "N/A" # Default
-        if target_rank == 12: target_value_display = 12
-        elif target_rank == 13: target_value_display = 13
-        elif target_rank is not None and 2 <= target_rank <= 10: target_value_display = target_rank
-
-        ttk.Label(self.frame, text=f"Fight {target_card} (Value: {target_value_display})?",
-                  font=("Arial", 14, "bold")).pack(pady=(0, 10))
+        # --- UI Elements packed into self.frame (texts filled in by configure) ---
+        self.title_label = ttk.Label(self.frame, font=("Arial", 14, "bold"))
+        self.title_label.pack(pady=(0, 10))
         ttk.Label(self.frame, text="Use Equipment or Friendly Face Card from hand (optional):").pack(pady=5)
 
         self.selection_var = tk.StringVar(self.frame) # Master is the frame
         self.selection_var.set("None") # Default selection
 
-        rb_none = ttk.Radiobutton(self.frame, text="Use No Card (Value: 0)", variable=self.selection_var,
-                                  value="None", command=self._update_selection)
-        rb_none.pack(anchor='w', padx=10)
-
+        self.rb_none = ttk.Radiobutton(self.frame, variable=self.selection_var,
+                                       value="None", command=self._update_selection)
+        self.rb_none.pack(anchor='w', padx=10)
+
+        # One radio button per hand slot is created up front, so no fight ever allocates widgets
+        self.cards_frame = ttk.Frame(self.frame)
+        self.cards_frame.pack(fill='x')
+        self.no_cards_label = ttk.Label(self.cards_frame, text="(No valid value cards in hand)")
+        self.card_radio_pool = [
+            ttk.Radiobutton(self.cards_frame, variable=self.selection_var, command=self._update_selection)
+            for _ in range(config.HAND_ROWS * config.HAND_COLS)
+        ]
         self.radio_buttons = {}
-        if not self.value_cards:
-             ttk.Label(self.frame, text="(No valid value cards in hand)").pack(anchor='w', padx=10)
-        else:
-            for card, r, c in self.value_cards:
-                value_str = f"card_{r}_{c}" # Unique value for radio button
-                card_rank = card.get_rank()
-                card_value_display = "N/A" # Default
-                if card_rank == 12: card_value_display = 12
-                elif card_rank == 13: card_value_display = 13
-                elif card_rank is not None and 2 <= card_rank <= 10: card_value_display = card_rank
-
-                rb = ttk.Radiobutton(self.frame, text=f"{card} (Value: {card_value_display})",
-                                     variable=self.selection_var,
-                                     value=value_str, command=self._update_selection)
-                rb.pack(anchor='w', padx=10)
-                self.radio_buttons[value_str] = (card, r, c) # Map value_str to card info
 
         ttk.Separator(self.frame, orient='horizontal').pack(fill='x', pady=10)
 
@@ -66,17 +59,65 @@ class CombatSetupView: # Renamed from CombatSetupWindow
         cancel_button.pack(side=tk.RIGHT, expand=True, padx=5, fill='x')
         # --- Removed wait_window ---
 
+    def configure(self, target_card, value_cards_in_hand, callback, advice=None):
+        """Loads a new fight into the existing widgets."""
+        self.target_card = target_card
+        self.value_cards = value_cards_in_hand
+        self.callback = callback
+        self.advice = advice
+        self.selected_card_info = None
+        self.selection_var.set("None")
+
+        target_rank = target_card.get_rank()
+        target_value_display = "N/A" # Default
+        if target_rank == 12: target_value_display = 12
+        elif target_rank == 13: target_value_display = 13
+        elif target_rank is not None and 2 <= target_rank <= 10: target_value_display = target_rank
+        self.title_label.config(text=f"Fight {target_card} (Value: {target_value_display})?")
+        self.rb_none.config(text="Use No Card (Value: 0)" + self._advice_suffix(None))
+
+        # Reconfigure pooled radio buttons; hide the ones this fight does not need
+        for rb in self.card_radio_pool: rb.pack_forget()
+        self.no_cards_label.pack_forget()
+        self.radio_buttons = {}
+        if not self.value_cards:
+            self.no_cards_label.pack(anchor='w', padx=10)
+        for rb, (card, r, c) in zip(self.card_radio_pool, self.value_cards):
+            value_str = f"card_{r}_{c}" # Unique value for radio button
+            card_rank = card.get_rank()
+            card_value_display = "N/A" # Default
+            if card_rank == 12: card_value_display = 12
+            elif card_rank == 13: card_value_display = 13
+            elif card_rank is not None and 2 <= card_rank <= 10: card_value_display = card_rank
+
+            rb.config(text=f"{card} (Value: {card_value_display})" + self._advice_suffix((card, r, c)), value=value_str)
+            rb.pack(anchor='w', padx=10)
+            self.radio_buttons[value_str] = (card, r, c) # Map value_str to card info
+
     def display(self):
         """Packs the view's frame into the parent frame."""
         # Pack the main frame into the parent (e.g., info_frame)
         # Use appropriate pack options depending on where in info_frame it should go
         self.frame.pack(fill='x', pady=20) # Example packing
 
+    def hide(self):
+        """Unpacks the view's frame, keeping its widgets for the next fight."""
+        if self.frame.winfo_exists(): self.frame.pack_forget()
+
     def destroy_view(self):
         """Destroys the view's main frame."""
         if self.frame and self.frame.winfo_exists():
             self.frame.destroy()
 
+    def _advice_suffix(self, card_info):
+        """Win percentage text for a radio button, with a marker on the recommended option."""
+        if not self.advice: return ""
+        for index, option in enumerate(self.advice):
+            if option["card_info"] == card_info:
+                marker = "  <- recommended" if index == 0 else ""
+                return f"  [{option['win_probability']:.0%} win]{marker}"
+        return ""
+
     def _update_selection(self):
         """Updates the internal selection based on the radio button."""
         selection = self.selection_var.get()
@@ -93,4 +134,4 @@ class CombatSetupView: # Renamed from CombatSetupWindow
         # No need to destroy here, the manager calling the callback will handle it
         self.callback(False) # Indicate cancellation
 
-# --- END OF FILE combat/ui_setup.py ---
\ No newline at end of file
+# --- END OF FILE combat/ui_setup.py ---
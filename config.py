@@ -15,8 +15,14 @@ COLUMNS = 7
 # --- Animation ---
 ANIMATION_DELAY = 6 # Milliseconds between animation steps (Card Flip)
 ANIMATION_STEPS = 36 # How many steps for shrink/grow (Card Flip)
+FLIP_FRAME_CACHE_SIZE = 8 # Card images (back + faces) whose flip frames are kept, least recently used dropped first
+# Speed settings: factor divides flip frame count and dice frame delays. None = instant (jump to final frame)
+ANIMATION_SPEEDS = {"1x": 1.0, "2x": 2.0, "Instant": None}
+DEFAULT_ANIMATION_SPEED = "1x"
+COMBAT_FINALIZE_PAUSE = 400 # Milliseconds to show the danger die result before the results view
 
 # --- Card Visuals ---
+TK_IMAGE_CONVERSION = "auto" # PIL -> Tk path: "auto" (fastest here, timed once), "imagetk", "ppm" or "png" (tk_photo)
 CARD_SCALE_FACTOR = 1.6
 
 # --- UI Layout ---
@@ -31,6 +37,74 @@ HAND_VERTICAL_PADDING = 10
 
 # --- Game Rules ---
 PLAYER_SUIT = "spades"
+ADJACENCY_RULE = False # Only cards next to the Jack's cleared area can be clicked (game_status); off: any card
+
+# --- Logging ---
+# Per-subsystem levels ("debug", "info", "warning", "error", "off"), e.g. "warning,combat=debug".
+# The JOKERS_LOG environment variable overrides this; JOKERS_LOG_FILE overrides LOG_FILE.
+LOG_LEVELS = "warning"
+LOG_FILE = None # None = log to stdout
+
+# --- Background Workers ---
+WORKER_MAX_THREADS = 2       # Thread pool size (I/O and light work)
+WORKER_MAX_PROCESSES = 2     # Process pool size (CPU-heavy work, keeps the GIL free for Tk)
+WORKER_POLL_INTERVAL = 15    # Milliseconds between main-thread result pump ticks
+WORKER_PUMP_BUDGET_MS = 4    # Max time per pump tick spent running callbacks
+
+# --- Flight Recorder ---
+# Ring buffer of recent game events, written to a file when an error escapes (or on F12)
+FLIGHT_RECORDER_CAPACITY = 512
+FLIGHT_RECORDER_DUMP_ON_ERROR = True
+FLIGHT_RECORDER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flight_logs")
+
+# --- Game Log ---
+# Every game is appended to a compact binary event log (see game_record.py)
+GAME_LOG_ENABLED = True
+GAME_LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_logs", "games.jlg")
+
+# --- Replays ---
+REPLAY_KEYFRAME_INTERVAL = 32 # Full state snapshot every N moves (seeking replays at most N-1 moves)
+REPLAY_MOVE_DELAY = 500       # Milliseconds between moves during playback (scaled by animation speed)
+
+# --- Save Games ---
+AUTOSAVE_ENABLED = True # Save after every completed move; resume with: python main.py --resume
+SAVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves", "autosave.jls")
+
+# --- Deal Difficulty Ratings ---
+DIFFICULTY_ROLLOUTS = 64       # Reference bot games per deal (one per dice seed)
+DIFFICULTY_MAX_WORKERS = None  # Rating processes (None = one per CPU)
+DIFFICULTY_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "difficulty_cache", "ratings")
+
+# --- Card Tracker ---
+HAZARD_OVERLAY_ENABLED = False # Show threat odds on face-down cards at startup (toggle with Ctrl+H)
+
+# --- Live Resize ---
+LIVE_RESIZE_ENABLED = True     # Rescale the cards when the window is resized (button board only)
+RESIZE_DEBOUNCE_MS = 150       # Wait this long after the last <Configure> before rescaling
+RESIZE_SCALE_STEP = 0.1        # Scales are rounded to this step (fewer distinct scales to build)
+RESIZE_MIN_SCALE = 0.6
+RESIZE_MAX_SCALE = 3.0
+RESIZE_CACHE_SCALES = 3        # Scaled image sets kept, for quick swaps back to recent sizes
+
+# --- Input Queue ---
+INPUT_QUEUE_DEPTH = 3          # Grid clicks kept while an animation or fight is running (0 = off: handled at once)
+INPUT_QUEUE_COLOR = "#ffd700"  # Border of the cards whose clicks wait in the queue
+INPUT_QUEUE_BORDER = 3         # Border width in pixels (reserved around every grid card while the queue is on)
+
+# --- Board Viewport ---
+VIEWPORT_ENABLED = False             # Draw the board on a scrollable, zoomable canvas (only the visible cells are drawn)
+VIEWPORT_VISIBLE_CELLS = (7, 7)      # Cells in view at zoom 1 (rows, columns); larger boards scroll
+VIEWPORT_ZOOM_LEVELS = (0.5, 0.75, 1.0, 1.25, 1.5) # Ctrl+wheel steps through these
+
+# --- Scoring ---
+SCORE_WIN = 1000        # Both Jokers collected
+SCORE_JOKER = 200       # Per Joker in the hand
+SCORE_CLEARED = 10      # Per card taken off the grid
+SCORE_REVEALED = 2      # Per card turned face up
+SCORE_FIGHT_LOST = 25   # Per lost fight
+
+# --- Combat Advisor ---
+ADVISOR_KEEP_WEIGHT = 0.5 # How much the option value of keeping a card counts against using it now
 
 # --- Card States ---
 STATE_FACE_DOWN = 0
@@ -0,0 +1,97 @@
+# --- START OF FILE deal_codes.py ---
+
+import config
+from card_logic import (Card, card_from_code, card_to_code, suits, ranks_int,
+                        BLACK_JOKER_CODE, RED_JOKER_CODE)
+
+# Short codes for grid deals (sharing a deal, daily challenges, deduping simulated deals).
+# A create_grid_deal() deal is fixed by which black 10 was removed plus the order of the
+# 48 cards around the Red Joker. The order is ranked as a permutation (Lehmer code, i.e.
+# digits in the factorial number system), so every deal gets a distinct integer
+#     rank * 2 + (1 if the 10 of spades was removed else 0)    < 2 * 48!  (204 bits)
+# written as CODE_LENGTH Crockford base-32 characters.
+
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ" # Crockford base 32: no I, L, O, U
+_DECODE = {char: value for value, char in enumerate(_ALPHABET)}
+_DECODE.update({"I": 1, "L": 1, "O": 0}) # Commonly misread characters
+
+CENTER_INDEX = (config.ROWS // 2) * config.COLUMNS + config.COLUMNS // 2
+_TEN_OF_CLUBS = suits.index("clubs") * len(ranks_int) + ranks_int.index(10)
+_TEN_OF_SPADES = suits.index("spades") * len(ranks_int) + ranks_int.index(10)
+
+def _deck_codes(removed_ten):
+    """Sorted card codes of the cells around the centre when removed_ten was taken out."""
+    codes = [code for code in range(BLACK_JOKER_CODE) if ranks_int[code % len(ranks_int)] != 11 and code != removed_ten]
+    return codes + [BLACK_JOKER_CODE]
+
+_DECKS = (_deck_codes(_TEN_OF_CLUBS), _deck_codes(_TEN_OF_SPADES))
+DECK_SIZE = len(_DECKS[0]) # 48 cards around the centre
+
+def _factorial(n):
+    result = 1
+    for i in range(2, n + 1): result *= i
+    return result
+
+NUM_DEALS = 2 * _factorial(DECK_SIZE)
+CODE_LENGTH = -(-(NUM_DEALS - 1).bit_length() // 5) # 41 characters
+
+
+# --- Ranking ---
+def deal_rank(grid_cards):
+    """
+    Returns the integer (0 <= n < NUM_DEALS) identifying a deal.
+    grid_cards: config.ROWS * config.COLUMNS cards in row-major order, as create_grid_deal() returns.
+    Raises ValueError if it is not a rulebook deal.
+    """
+    if len(grid_cards) != config.ROWS * config.COLUMNS:
+        raise ValueError(f"Deal has {len(grid_cards)} cards, expected {config.ROWS * config.COLUMNS}.")
+    if grid_cards[CENTER_INDEX] is None or card_to_code(grid_cards[CENTER_INDEX]) != RED_JOKER_CODE:
+        raise ValueError("Deal does not have the Red Joker in the centre.")
+    codes = [card_to_code(card) for i, card in enumerate(grid_cards) if i != CENTER_INDEX]
+    spades_removed = _TEN_OF_SPADES not in codes
+    remaining = list(_DECKS[spades_removed])
+    if sorted(codes) != remaining:
+        raise ValueError("Deal is not a rulebook deal (wrong set of cards).")
+    rank = 0
+    for i, code in enumerate(codes): # Lehmer digit = index among the cards not yet placed
+        digit = remaining.index(code)
+        del remaining[digit]
+        rank = rank * (DECK_SIZE - i) + digit
+    return rank * 2 + spades_removed
+
+def deal_from_rank(number):
+    """Rebuilds the deal (list of Cards, row-major, Red Joker in the centre) from deal_rank()."""
+    if not 0 <= number < NUM_DEALS: raise ValueError(f"Deal number out of range: {number}")
+    rank, spades_removed = divmod(number, 2)
+    digits = []
+    for radix in range(1, DECK_SIZE + 1): # Least significant digit has radix 1
+        rank, digit = divmod(rank, radix)
+        digits.append(digit)
+    remaining = list(_DECKS[spades_removed])
+    cards = [card_from_code(remaining.pop(digit)) for digit in reversed(digits)]
+    cards.insert(CENTER_INDEX, Card(config.RED_JOKER_SUIT, config.RED_JOKER_RANK, config.RED_JOKER_RANK_STR))
+    return cards
+
+
+# --- Codes ---
+def encode_deal(grid_cards):
+    """Returns the CODE_LENGTH-character code of a deal."""
+    number = deal_rank(grid_cards)
+    chars = []
+    for _ in range(CODE_LENGTH):
+        number, digit = divmod(number, 32)
+        chars.append(_ALPHABET[digit])
+    return "".join(reversed(chars))
+
+def decode_deal(code):
+    """Rebuilds a deal from encode_deal(). Case, spaces and dashes are ignored. Raises ValueError."""
+    number = 0
+    chars = code.strip().upper().replace("-", "").replace(" ", "")
+    if len(chars) != CODE_LENGTH: raise ValueError(f"Deal code must have {CODE_LENGTH} characters, got {len(chars)}.")
+    for char in chars:
+        if char not in _DECODE: raise ValueError(f"Invalid character in deal code: {char!r}")
+        number = number * 32 + _DECODE[char]
+    if number >= NUM_DEALS: raise ValueError("Not a valid deal code.")
+    return deal_from_rank(number)
+
+# --- END OF FILE deal_codes.py ---
@@ -0,0 +1,181 @@
+# --- START OF FILE difficulty.py ---
+
+import bisect
+import hashlib
+import os
+import random
+import shelve
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import config
+import utils
+import bot
+import deal_codes
+from card_logic import create_grid_deal
+import log
+
+_log = log.get_logger("workers")
+
+# Deal difficulty ratings for picking daily challenges.
+# A deal is rated by playing it DIFFICULTY_ROLLOUTS times with the reference bot (bot.py),
+# once per dice seed 0..n-1 (the same seeds for every deal, so deals are compared on the
+# same dice). Its difficulty is the mean number of turns the bot needs to win, a lost game
+# counting as bot.MAX_TURNS. Ratings are computed in a process pool and cached on disk
+# (shelve) under a hash of the deal and the rating settings, so re-rating is free and the
+# percentiles grow with every batch.
+#
+#     python difficulty.py rate COUNT [SEED]      rate COUNT new candidate deals
+#     python difficulty.py pick COUNT LOW HIGH    print COUNT deal codes between the LOW-HIGH percentiles
+
+RATING_VERSION = 1 # Bump when the bot or the rating changes: old cache entries are then ignored
+
+Rating = namedtuple("Rating", "difficulty win_rate mean_turns mean_fights_lost rollouts deal_code")
+
+
+def rating_key(deal_code, rollouts):
+    """Cache key: a hash of the deal and everything that affects its rating."""
+    text = f"{RATING_VERSION}:{rollouts}:{bot.MAX_TURNS}:{config.PLAYER_SUIT}:{deal_code}"
+    return hashlib.blake2b(text.encode("ascii"), digest_size=16).hexdigest()
+
+def rate_deal(deal_number, rollouts):
+    """Rates one deal (a deal_codes.deal_rank() number, cheap to send to a worker process)."""
+    grid_cards = deal_codes.deal_from_rank(deal_number)
+    wins = turns = scored_turns = fights_lost = 0
+    for seed in range(rollouts):
+        result = bot.play_game(grid_cards, utils.DiceRng(seed + 1))
+        wins += result.won
+        turns += result.turns
+        scored_turns += result.turns if result.won else bot.MAX_TURNS # A lost game uses up every turn
+        fights_lost += result.fights_lost
+    return Rating(scored_turns / rollouts, wins / rollouts, turns / rollouts, fights_lost / rollouts, rollouts,
+                  deal_codes.encode_deal(grid_cards))
+
+
+def candidate_deals(seed=None):
+    """Endless stream of new deals, dealt the same way main.main deals a game."""
+    rng = random.Random(seed)
+    while True:
+        yield create_grid_deal(rng)
+
+
+class DifficultyCache:
+    """On-disk cache of Ratings (a shelve file), keyed by rating_key()."""
+    def __init__(self, path=None):
+        self.path = path or config.DIFFICULTY_CACHE_FILE
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._shelf = shelve.open(self.path)
+
+    def get(self, key):
+        return self._shelf.get(key)
+
+    def put(self, key, rating):
+        self._shelf[key] = tuple(rating) # Plain tuples: the file does not depend on this module
+
+    def ratings(self, rollouts=None):
+        """Every cached Rating (of the current RATING_VERSION; with rollouts given, only those)."""
+        rollouts = rollouts or config.DIFFICULTY_ROLLOUTS
+        for key in self._shelf:
+            rating = Rating(*self._shelf[key])
+            if rating.rollouts == rollouts and key == rating_key(rating.deal_code, rollouts): yield rating
+
+    def sync(self):
+        self._shelf.sync()
+
+    def close(self):
+        self._shelf.close()
+
+
+def rate_deals(deals, cache, count, rollouts=None, max_workers=None, on_rating=None):
+    """
+    Rates count distinct deals from the iterable deals, skipping deals already in the cache.
+    Deals are fanned out to a process pool with a bounded number in flight, so deals can be
+    an endless stream. Calls on_rating(rating) as results arrive. Returns the number rated.
+    """
+    rollouts = rollouts or config.DIFFICULTY_ROLLOUTS
+    max_workers = max_workers or config.DIFFICULTY_MAX_WORKERS or os.cpu_count() or 1
+    seen = set() # deal_rank() numbers: dedupes the stream without keeping grids around
+    rated = 0
+    deals = iter(deals)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = {}
+        while rated + len(in_flight) < count or in_flight:
+            while rated + len(in_flight) < count and len(in_flight) < max_workers * 4:
+                grid_cards = next(deals, None)
+                if grid_cards is None: count = rated + len(in_flight); break
+                number = deal_codes.deal_rank(grid_cards)
+                key = rating_key(deal_codes.encode_deal(grid_cards), rollouts)
+                if number in seen or cache.get(key) is not None: continue
+                seen.add(number)
+                in_flight[pool.submit(rate_deal, number, rollouts)] = key
+            if not in_flight: break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = in_flight.pop(future)
+                rating = future.result()
+                cache.put(key, rating)
+                rated += 1
+                if on_rating: on_rating(rating)
+    cache.sync()
+    return rated
+
+
+class DifficultyIndex:
+    """Cached ratings sorted by difficulty, for percentile lookups and band queries."""
+    def __init__(self, ratings):
+        self.ratings = sorted(ratings, key=lambda rating: (rating.difficulty, rating.deal_code))
+        self._difficulties = [rating.difficulty for rating in self.ratings]
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def percentile(self, difficulty):
+        """Percentage of rated deals easier than difficulty (ties count half)."""
+        if not self.ratings: return 0.0
+        below = bisect.bisect_left(self._difficulties, difficulty)
+        ties = bisect.bisect_right(self._difficulties, difficulty) - below
+        return 100.0 * (below + ties / 2) / len(self.ratings)
+
+    def band(self, low_percentile, high_percentile):
+        """Ratings between two percentiles (0-100), easiest first."""
+        n = len(self.ratings)
+        return self.ratings[int(n * low_percentile / 100):int(n * high_percentile / 100)]
+
+    def pick(self, count, low_percentile, high_percentile, seed=0):
+        """count different deals from the band, drawn reproducibly (fewer if the band is smaller)."""
+        band = self.band(low_percentile, high_percentile)
+        if len(band) < count:
+            _log.warning(f"Only {len(band)} rated deals between the {low_percentile}th and "
+                         f"{high_percentile}th percentile (asked for {count}); rate more deals.")
+            return list(band)
+        return random.Random(seed).sample(band, count)
+
+
+# --- Command Line ---
+def main(argv):
+    if len(argv) >= 2 and argv[0] == "rate":
+        count = int(argv[1])
+        seed = int(argv[2]) if len(argv) > 2 else None
+        cache = DifficultyCache()
+        start = time.perf_counter()
+        def progress(rating):
+            if _log.info_on: _log.info(f"{rating.deal_code}: difficulty {rating.difficulty:.1f}, win rate {rating.win_rate:.0%}")
+        rated = rate_deals(candidate_deals(seed), cache, count, on_rating=progress)
+        total = len(DifficultyIndex(cache.ratings()))
+        cache.close()
+        print(f"Rated {rated} deals in {time.perf_counter() - start:.1f} s ({total} rated deals in {config.DIFFICULTY_CACHE_FILE}).")
+    elif len(argv) == 4 and argv[0] == "pick":
+        count, low, high = int(argv[1]), float(argv[2]), float(argv[3])
+        cache = DifficultyCache()
+        index = DifficultyIndex(cache.ratings())
+        cache.close()
+        for rating in sorted(index.pick(count, low, high), key=lambda rating: rating.difficulty):
+            print(f"{rating.deal_code}  difficulty {rating.difficulty:6.1f}  percentile {index.percentile(rating.difficulty):5.1f}")
+    else:
+        print("Usage: python difficulty.py rate COUNT [SEED] | pick COUNT LOW HIGH")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+
+# --- END OF FILE difficulty.py ---
@@ -0,0 +1,99 @@
+# --- START OF FILE flight_recorder.py ---
+
+import os
+import sys
+import time
+import json
+import traceback
+import config
+import log
+
+_log = log.get_logger("diag")
+
+class FlightRecorder:
+    """
+    Keeps the last N structured events in a preallocated ring buffer.
+    record() is a few list stores (no formatting, no I/O); events are only turned into
+    text when dump() writes them to a file, on error or on demand.
+    """
+    def __init__(self, capacity=config.FLIGHT_RECORDER_CAPACITY):
+        self.capacity = max(1, capacity)
+        self._times = [0.0] * self.capacity
+        self._kinds = [None] * self.capacity
+        self._data = [None] * self.capacity
+        self._next = 0 # Slot the next event goes into
+        self._count = 0 # Number of valid slots (<= capacity)
+
+    def record(self, kind, **data):
+        """Stores one event, overwriting the oldest once the buffer is full."""
+        i = self._next
+        self._times[i] = time.time()
+        self._kinds[i] = kind
+        self._data[i] = data
+        self._next = (i + 1) % self.capacity
+        if self._count < self.capacity: self._count += 1
+
+    def record_exception(self, exc_type, exc_value, exc_tb):
+        """Records an exception (with traceback) and dumps the buffer if configured to."""
+        self.record("exception", type=exc_type.__name__, message=str(exc_value),
+                    traceback="".join(traceback.format_exception(exc_type, exc_value, exc_tb)))
+        if config.FLIGHT_RECORDER_DUMP_ON_ERROR:
+            self.dump(reason=f"exception: {exc_type.__name__}")
+
+    def events(self):
+        """Returns the buffered events, oldest first, as (timestamp, kind, data) tuples."""
+        start = (self._next - self._count) % self.capacity
+        return [(self._times[(start + i) % self.capacity], self._kinds[(start + i) % self.capacity],
+                 self._data[(start + i) % self.capacity]) for i in range(self._count)]
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def dump(self, reason="on demand", path=None):
+        """
+        Writes the buffered events as JSON lines (one header line first).
+        Returns the file path, or None if writing failed.
+        """
+        if path is None:
+            os.makedirs(config.FLIGHT_RECORDER_DIR, exist_ok=True)
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(config.FLIGHT_RECORDER_DIR, f"flight_{stamp}_{os.getpid()}.jsonl")
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"reason": reason, "dumped_at": time.time(), "events": self._count}) + "\n")
+                for timestamp, kind, data in self.events():
+                    # default=repr turns Cards, tuples of cards, etc. into readable text
+                    f.write(json.dumps({"t": round(timestamp, 4), "kind": kind, **data}, default=repr) + "\n")
+        except OSError as e:
+            _log.error(f"Could not write flight recorder dump to {path}: {e}")
+            return None
+        _log.warning(f"Flight recorder dumped {self._count} events to {path} ({reason}).")
+        return path
+
+
+# --- Process-wide recorder used by the game hooks ---
+RECORDER = FlightRecorder()
+record = RECORDER.record
+dump = RECORDER.dump
+
+def install_hooks(root):
+    """
+    Dumps the buffer when an exception escapes a Tk callback or the main thread,
+    and on demand with the F12 key.
+    """
+    original_tk_handler = root.report_callback_exception
+    def tk_exception_handler(exc_type, exc_value, exc_tb):
+        RECORDER.record_exception(exc_type, exc_value, exc_tb)
+        original_tk_handler(exc_type, exc_value, exc_tb) # Still print the traceback
+    root.report_callback_exception = tk_exception_handler
+
+    original_excepthook = sys.excepthook
+    def excepthook(exc_type, exc_value, exc_tb):
+        RECORDER.record_exception(exc_type, exc_value, exc_tb)
+        original_excepthook(exc_type, exc_value, exc_tb)
+    sys.excepthook = excepthook
+
+    root.bind_all("<F12>", lambda e: RECORDER.dump(reason="F12 pressed"), add="+")
+
+# --- END OF FILE flight_recorder.py ---
@@ -0,0 +1,227 @@
+# --- START OF FILE game_engine.py ---
+
+import config
+from card_logic import card_to_uid
+from player import Player
+from hand_model import HandModel
+import game_history
+import card_tracker
+import game_status
+from combat import logic as combat_logic
+from combat import setup as combat_setup
+from game_events import (EV_DEAL, EV_REVEAL, EV_ACTION, EV_VALUE_CARD, EV_CANCEL, EV_DICE,
+                         EV_PICKUP, EV_DISABLE, EV_COMBAT_START, EV_OUTCOME, EV_DISCARD,
+                         EV_REMOVE, EV_MOVE, EV_CLEAR_HAND, EV_SKIP_TURN, EV_UNDO, EV_REDO, cell_of)
+import log
+
+_log = log.get_logger("game")
+
+# Action kinds returned by classify_action()
+ACTION_PICKUP = "pickup"
+ACTION_COMBAT = "combat"
+ACTION_DISABLE = "disable"
+
+def classify_action(card, player_suit):
+    """What acting on a face-up card does (same rules as card_actions.handle_card_action)."""
+    card_color = card.get_color()
+    card_rank = card.rank
+    if card_color == "joker": return ACTION_PICKUP
+    if card_rank is not None and 2 <= card_rank <= 10:
+        if card_color == "black": return ACTION_COMBAT # Hazard
+        if card_color == "red": return ACTION_PICKUP # Equipment
+    if card_rank in (12, 13): # Queens and Kings
+        return ACTION_PICKUP if card.get_suit().lower() == player_suit else ACTION_COMBAT
+    return ACTION_DISABLE # Aces, Jacks, unknown cards
+
+
+class GameEngine:
+    """
+    The game rules without any Tk: grids, hand, player and the pending fight.
+    Every state change is reported through on_event(kind, *payload), in the same order the
+    live game records it, so a recorded game can be fed back in and checked event by event.
+    Invalid moves raise ValueError.
+    The state is checkpointed into an undo history after every move that leaves no fight
+    pending - the same points at which undo_manager checkpoints the live game.
+    """
+    def __init__(self, player_suit=config.PLAYER_SUIT, on_event=None):
+        self.player_suit = player_suit
+        self.on_event = on_event
+        self.card_data_grid = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+        self.card_state_grid = [[config.STATE_FACE_DOWN for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+        self.hand = HandModel()
+        self.player = Player(config.ROWS // 2, config.COLUMNS // 2)
+        self.player.suit = player_suit
+        self.combat = None # Pending fight: {"row", "col", "used_card", "params"}
+        self.history = game_history.UndoHistory()
+        self.tracker = card_tracker.CardTracker(player_suit) # Unseen-card counts, for bots
+        self.status = game_status.GameStatus(player_suit) # Terminal check and score, fed by _emit()
+
+    # --- Snapshots ---
+    def state(self):
+        """The board, hand and player as a game_history.GameSnapshot (rows shared with the last checkpoint)."""
+        return game_history.capture(self.card_data_grid, self.card_state_grid, self.hand,
+                                    self.player.position, self.player.should_skip_turn(), self.history.current)
+
+    def load_state(self, state):
+        """Puts the board, hand and player back into a GameSnapshot."""
+        self.card_data_grid = [list(row) for row in state.cards]
+        self.card_state_grid = [list(row) for row in state.states]
+        self.hand.restore(state.hand)
+        self.player.set_position(*state.position)
+        self.player.set_skip_turn(state.skip_turn)
+        self.tracker.reset(self.card_data_grid, self.card_state_grid)
+        self.status.reset(self.card_data_grid, self.card_state_grid, self.hand, self.player.position)
+
+    def snapshot(self):
+        """Returns the complete engine state (including the pending fight and undo history)."""
+        combat = None
+        if self.combat is not None:
+            combat = (self.combat["row"], self.combat["col"], self.combat["used_card"], self.combat["params"])
+        return (self.state(), combat, self.history.export())
+
+    def restore(self, snapshot):
+        """Puts the engine back into a snapshot() state."""
+        state, combat, history = snapshot
+        self.load_state(state)
+        self.history.load(history)
+        self.combat = None
+        if combat is not None:
+            row, col, used_card, params = combat
+            self.combat = {"row": row, "col": col, "used_card": used_card, "params": params}
+
+    def _checkpoint(self):
+        if self.combat is None: self.history.commit(self.state())
+
+    def _emit(self, kind, *payload):
+        self.status.apply(kind, *payload)
+        if self.on_event: self.on_event(kind, *payload)
+
+    # --- Input Events ---
+    def deal(self, grid_cards):
+        """Places grid_cards (row-major, None = empty cell) face down."""
+        if len(grid_cards) != config.ROWS * config.COLUMNS:
+            raise ValueError(f"Deal has {len(grid_cards)} cards, expected {config.ROWS * config.COLUMNS}.")
+        self._emit(EV_DEAL, *[card_to_uid(card) + 1 if card else 0 for card in grid_cards])
+        for i, card in enumerate(grid_cards):
+            r, c = divmod(i, config.COLUMNS)
+            self.card_data_grid[r][c] = card
+            self.card_state_grid[r][c] = config.STATE_FACE_DOWN if card else config.STATE_ACTION_TAKEN
+        self.tracker.reset(self.card_data_grid, self.card_state_grid)
+        self.history.reset(self.state()) # The deal itself cannot be undone
+
+    def reveal(self, row, col):
+        """Flips a face-down card face up."""
+        if self.card_data_grid[row][col] is None or self.card_state_grid[row][col] != config.STATE_FACE_DOWN:
+            raise ValueError(f"Cannot reveal ({row},{col}): no face-down card there.")
+        self._emit(EV_REVEAL, cell_of(row, col))
+        self.card_state_grid[row][col] = config.STATE_FACE_UP
+        self.tracker.reveal(row, col, self.card_data_grid[row][col])
+        self._checkpoint()
+
+    def act(self, row, col):
+        """Acts on a face-up card. Returns the action kind (ACTION_PICKUP/COMBAT/DISABLE)."""
+        card = self.card_data_grid[row][col]
+        if self.combat is not None: raise ValueError("Cannot act while a fight is pending.")
+        if card is None or self.card_state_grid[row][col] != config.STATE_FACE_UP:
+            raise ValueError(f"Cannot act on ({row},{col}): no face-up card there.")
+        cell = cell_of(row, col)
+        self._emit(EV_ACTION, cell)
+        action = classify_action(card, self.player_suit)
+
+        if action == ACTION_PICKUP and self.hand.add(card) is not None:
+            self.card_data_grid[row][col] = None
+            self.card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+            self._emit(EV_PICKUP, cell)
+        elif action == ACTION_COMBAT:
+            self.combat = {"row": row, "col": col, "used_card": None, "params": None}
+            self._emit(EV_COMBAT_START, cell)
+        else: # Disabled card, or pickup with a full hand: the card stays, its action is done
+            action = ACTION_DISABLE
+            self.card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+            self._emit(EV_DISABLE, cell)
+        self._checkpoint()
+        return action
+
+    def choose_value_card(self, card):
+        """
+        Picks the value card for the pending fight (None = fight with no card).
+        Returns True when the fight was won automatically, otherwise the dice decide (roll()).
+        """
+        combat = self._pending_combat()
+        if combat["params"] is not None: raise ValueError("Value card already chosen for this fight.")
+        if card is not None and (card not in self.hand or not combat_setup.is_value_card(card, self.player_suit)):
+            raise ValueError(f"{card} is not a value card in the hand.")
+        self._emit(EV_VALUE_CARD, card_to_uid(card) + 1 if card else 0)
+        target = self.card_data_grid[combat["row"]][combat["col"]]
+        combat["used_card"] = card
+        combat["params"] = combat_logic.calculate_combat_parameters(card, target)
+        if combat["params"]["attacker_total"] > combat["params"]["defender_total"]:
+            self._emit(EV_OUTCOME, 1, 1)
+            self._resolve(True)
+            return True
+        return False
+
+    def cancel_combat(self):
+        """Abandons the pending fight; the card stays face up."""
+        combat = self._pending_combat()
+        self._emit(EV_CANCEL)
+        self.card_state_grid[combat["row"]][combat["col"]] = config.STATE_FACE_UP
+        self.combat = None
+        self._checkpoint()
+
+    def roll(self, diff_rolls, danger_roll):
+        """Resolves the pending fight with the given dice. Returns True if it was won."""
+        combat = self._pending_combat()
+        if combat["params"] is None: raise ValueError("Choose a value card before rolling.")
+        num_diff_dice = combat["params"]["num_diff_dice"]
+        if len(diff_rolls) != num_diff_dice:
+            raise ValueError(f"Fight needs {num_diff_dice} difference dice, got {len(diff_rolls)}.")
+        self._emit(EV_DICE, *diff_rolls, danger_roll)
+        won = combat_logic.check_combat_win_condition(diff_rolls, danger_roll, num_diff_dice)
+        self._emit(EV_OUTCOME, int(won), 0)
+        self._resolve(won)
+        return won
+
+    def undo(self):
+        """Steps back to the previous checkpoint."""
+        if self.combat is not None: raise ValueError("Cannot undo while a fight is pending.")
+        if not self.history.can_undo(): raise ValueError("Nothing to undo.")
+        self._emit(EV_UNDO)
+        self.load_state(self.history.undo())
+
+    def redo(self):
+        """Re-applies the last undone step."""
+        if self.combat is not None: raise ValueError("Cannot redo while a fight is pending.")
+        if not self.history.can_redo(): raise ValueError("Nothing to redo.")
+        self._emit(EV_REDO)
+        self.load_state(self.history.redo())
+
+    # --- Fight Consequences (same order as combat.effects) ---
+    def _pending_combat(self):
+        if self.combat is None: raise ValueError("No fight is pending.")
+        return self.combat
+
+    def _resolve(self, won):
+        combat = self.combat
+        self.combat = None
+        row, col, used_card = combat["row"], combat["col"], combat["used_card"]
+        target = self.card_data_grid[row][col]
+        if used_card is not None and self.hand.remove(used_card) is not None:
+            self._emit(EV_DISCARD, card_to_uid(used_card))
+        if won:
+            self.card_data_grid[row][col] = None
+            self.card_state_grid[row][col] = config.STATE_ACTION_TAKEN
+            self._emit(EV_REMOVE, cell_of(row, col))
+            self.player.set_position(row, col)
+            self._emit(EV_MOVE, cell_of(row, col))
+            self._checkpoint()
+            return
+        self.card_state_grid[row][col] = config.STATE_FACE_UP # Blocked; may fight again
+        if target.get_rank() == 12: # Hostile Queen
+            self._emit(EV_CLEAR_HAND, self.hand.clear())
+        elif target.get_rank() == 13: # Hostile King
+            self.player.set_skip_turn(True)
+            self._emit(EV_SKIP_TURN)
+        self._checkpoint()
+
+# --- END OF FILE game_engine.py ---
@@ -0,0 +1,58 @@
+# --- START OF FILE game_events.py ---
+
+import config
+
+# Event kinds of the game log. Each event is (kind, payload) with a payload of small
+# non-negative ints: cells are row * COLUMNS + col, cards are card_logic card uids
+# (card_to_uid: deck and card code; the plain card code for the first deck).
+#
+# Input events drive the game (they are what a replay feeds back into the engine);
+# derived events are consequences the engine recomputes and checks during a replay.
+
+# --- Input Events ---
+EV_DEAL = 0         # card uid + 1 for every cell in row-major order (0 = empty cell)
+EV_REVEAL = 1       # cell: face-down card flipped face up
+EV_ACTION = 2       # cell: face-up card clicked (pickup / fight / disable)
+EV_VALUE_CARD = 3   # card uid + 1 of the value card used in the fight (0 = no card)
+EV_CANCEL = 4       # (): pending fight cancelled before the dice decided it
+EV_DICE = 5         # difference rolls..., danger roll
+EV_UNDO = 15        # (): back to the previous checkpoint (see game_history)
+EV_REDO = 16        # (): forward again after an undo
+
+# --- Derived Events ---
+EV_PICKUP = 6       # cell: card moved from the grid into the hand
+EV_DISABLE = 7      # cell: card left on the grid, action done (hand full, Ace, ...)
+EV_COMBAT_START = 8 # cell: fight against the card started
+EV_OUTCOME = 9      # win (0/1), automatic win (0/1)
+EV_DISCARD = 10     # card uid: value card discarded from the hand
+EV_REMOVE = 11      # cell: defeated card removed from the grid
+EV_MOVE = 12        # cell: player moved
+EV_CLEAR_HAND = 13  # number of cards discarded (lost to a hostile Queen)
+EV_SKIP_TURN = 14   # (): lost to a hostile King
+
+INPUT_EVENTS = frozenset({EV_DEAL, EV_REVEAL, EV_ACTION, EV_VALUE_CARD, EV_CANCEL, EV_DICE, EV_UNDO, EV_REDO})
+
+# Payload length per kind; None = variable (the encoded payload starts with its length)
+EVENT_ARITY = {
+    EV_DEAL: None, EV_REVEAL: 1, EV_ACTION: 1, EV_VALUE_CARD: 1, EV_CANCEL: 0, EV_DICE: None,
+    EV_PICKUP: 1, EV_DISABLE: 1, EV_COMBAT_START: 1, EV_OUTCOME: 2, EV_DISCARD: 1,
+    EV_REMOVE: 1, EV_MOVE: 1, EV_CLEAR_HAND: 1, EV_SKIP_TURN: 0, EV_UNDO: 0, EV_REDO: 0,
+}
+
+EVENT_NAMES = {
+    EV_DEAL: "deal", EV_REVEAL: "reveal", EV_ACTION: "action", EV_VALUE_CARD: "value_card",
+    EV_CANCEL: "cancel", EV_DICE: "dice", EV_PICKUP: "pickup", EV_DISABLE: "disable",
+    EV_COMBAT_START: "combat_start", EV_OUTCOME: "outcome", EV_DISCARD: "discard",
+    EV_REMOVE: "remove", EV_MOVE: "move", EV_CLEAR_HAND: "clear_hand", EV_SKIP_TURN: "skip_turn",
+    EV_UNDO: "undo", EV_REDO: "redo",
+}
+
+def cell_of(row, col):
+    """Cell index of a grid position."""
+    return row * config.COLUMNS + col
+
+def position_of(cell):
+    """(row, col) of a cell index."""
+    return divmod(cell, config.COLUMNS)
+
+# --- END OF FILE game_events.py ---
@@ -0,0 +1,86 @@
+# --- START OF FILE game_history.py ---
+
+from collections import namedtuple
+
+# Immutable game state snapshots with structural sharing. Grids and the hand are tuples
+# of row tuples; a new snapshot reuses every row tuple of the previous one that did not
+# change, so keeping a snapshot per move costs O(changed rows), not a copy of every grid.
+
+GameSnapshot = namedtuple("GameSnapshot", "cards states hand position skip_turn")
+
+def _same_row(old_row, row):
+    return len(old_row) == len(row) and all(a is b or a == b for a, b in zip(old_row, row))
+
+def share_rows(rows, previous_rows=None):
+    """Tuple of row tuples for rows, reusing previous_rows' tuples wherever a row is unchanged."""
+    if previous_rows is None or len(previous_rows) != len(rows):
+        return tuple(tuple(row) for row in rows)
+    return tuple(old_row if _same_row(old_row, row) else tuple(row) for row, old_row in zip(rows, previous_rows))
+
+def capture(card_data_grid, card_state_grid, hand_rows, position, skip_turn, previous=None):
+    """
+    Builds a GameSnapshot from live state, sharing unchanged rows with previous.
+    hand_rows is anything indexable as rows of cards (a HandModel works).
+    """
+    if previous is None:
+        return GameSnapshot(share_rows(card_data_grid), share_rows(card_state_grid), share_rows(hand_rows),
+                            tuple(position), bool(skip_turn))
+    return GameSnapshot(share_rows(card_data_grid, previous.cards), share_rows(card_state_grid, previous.states),
+                        share_rows(hand_rows, previous.hand), tuple(position), bool(skip_turn))
+
+
+class UndoHistory:
+    """
+    Unlimited undo/redo over GameSnapshots: the current snapshot plus two stacks.
+    Committing a snapshot equal to the current one does nothing (nothing to undo).
+    """
+    def __init__(self, initial=None):
+        self.current = initial
+        self._undo = []
+        self._redo = []
+
+    def reset(self, snapshot):
+        """Starts a new history (e.g. after the deal)."""
+        self.current = snapshot
+        self._undo.clear()
+        self._redo.clear()
+
+    def commit(self, snapshot):
+        """Makes snapshot the current state. Returns False if nothing changed."""
+        if snapshot == self.current: return False
+        if self.current is not None: self._undo.append(self.current)
+        self.current = snapshot
+        self._redo.clear()
+        return True
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Steps back. Returns the snapshot to restore, or None if there is nothing to undo."""
+        if not self._undo: return None
+        self._redo.append(self.current)
+        self.current = self._undo.pop()
+        return self.current
+
+    def redo(self):
+        """Steps forward again. Returns the snapshot to restore, or None."""
+        if not self._redo: return None
+        self._undo.append(self.current)
+        self.current = self._redo.pop()
+        return self.current
+
+    def export(self):
+        """(current, undo stack, redo stack) as tuples, for engine keyframes."""
+        return (self.current, tuple(self._undo), tuple(self._redo))
+
+    def load(self, exported):
+        current, undo_stack, redo_stack = exported
+        self.current = current
+        self._undo = list(undo_stack)
+        self._redo = list(redo_stack)
+
+# --- END OF FILE game_history.py ---
@@ -4,6 +4,11 @@ import tkinter as tk
 import config
 import animation # Import animation functions
 import card_actions # Import the actions module
+import log
+import flight_recorder
+from game_events import EV_REVEAL, cell_of
+
+_log = log.get_logger("game")
 # No combat_manager needed here directly if card_actions handles initiation
 
 # --- Callback function after flip animation ---
@@ -11,7 +16,8 @@ import card_actions # Import the actions module
 def on_card_revealed(
     row, col,
     button_grid, card_data_grid, card_state_grid, # Grids
-    assets # Asset components
+    assets, # Asset components
+    session # game_session.GameSession of this game
     ):
     """
     Finalizes reveal after animation, sets final image, RE-ENABLES button for second click.
@@ -31,9 +37,14 @@ def on_card_revealed(
             button.config(image=tk_photo_final, state=tk.NORMAL) # Set image and re-enable
             button.image = tk_photo_final
             card_state_grid[row][col] = config.STATE_FACE_UP # State: Face Up
-            print(f"Card at ({row},{col}) revealed as {card}. State set to FACE_UP.")
+            session.card_revealed(row, col, card)
+            flight_recorder.record("reveal", row=row, col=col, card=card)
+            session.record(EV_REVEAL, cell_of(row, col))
+            session.checkpoint()
+            if session.inputs is not None: session.inputs.wake() # Clicks made during the flip
+            if _log.debug_on: _log.debug(f"Card at ({row},{col}) revealed as {card}. State set to FACE_UP.")
         else:
-            print(f"Error: Could not find Tk image for key: {image_key} in on_card_revealed")
+            _log.error(f"Could not find Tk image for key: {image_key} in on_card_revealed")
             tk_back_image = assets.get("tk_photo_back")
             fallback_text = "Error"
             if tk_back_image:
@@ -42,7 +53,7 @@ def on_card_revealed(
                  fallback_text = f"!\n{image_key[:5]}" # Show partial key on back
             button.config(text=fallback_text, compound=tk.CENTER, fg="red") # Show text over image
             card_state_grid[row][col] = config.STATE_ACTION_TAKEN # State: Disabled (Error)
-            print(f"State for ({row},{col}) set to ACTION_TAKEN due to missing image.")
+            if _log.debug_on: _log.debug(f"State for ({row},{col}) set to ACTION_TAKEN due to missing image.")
 
     elif card and not button:
          if card_state_grid[row][col] != config.STATE_ACTION_TAKEN:
@@ -53,7 +64,7 @@ def on_card_revealed(
 # --- Main Click Handler ---
 def handle_card_click(
     row, col,
-    root, player, # Core components
+    root, player, session, # Core components
     card_data_grid, button_grid, card_state_grid, # Grids
     hand_card_data, hand_card_slots, # Hand components
     assets, # Asset components
@@ -63,18 +74,28 @@ def handle_card_click(
     """
     Called when a button on the grid is clicked.
     Routes to flip animation OR calls card_actions.handle_card_action.
-    Includes basic player adjacency check (still commented out).
+    Applies the adjacency rule when config.ADJACENCY_RULE is on.
     Passes UI frames needed for embedded combat display.
     """
     # Bounds check
     if not (0 <= row < config.ROWS and 0 <= col < config.COLUMNS):
-         print(f"Error: Click coordinates ({row},{col}) out of bounds.")
+         _log.error(f"Click coordinates ({row},{col}) out of bounds.")
          return
 
+    # While a flip, dice roll or fight is running, the click waits (input_queue) and is replayed afterwards
+    if session.inputs is not None and session.inputs.accepts():
+        session.inputs.push(row, col, lambda: handle_card_click(
+            row, col, root, player, session, card_data_grid, button_grid, card_state_grid,
+            hand_card_data, hand_card_slots, assets, info_frame, hand_frame, info_frame_bg))
+        return
+
+    session.ui.flush() # A click may arrive before batched changes were drawn: apply them first
+
     # --- Player Interaction Rule (Optional) ---
-    # if not player.can_interact(row, col):
-    #     print(f"Player at {player.position} cannot interact with non-adjacent card at ({row}, {col}).")
-    #     return
+    # The same rule game_status uses for the boxed-in outcome: cards next to the Jack's cleared area
+    if config.ADJACENCY_RULE and not session.status.can_act_on(row, col):
+        if _log.debug_on: _log.debug(f"Ignoring click on ({row},{col}) - not next to the Jack's cleared area.")
+        return
     # --- End Player Interaction Rule ---
 
     button = button_grid[row][col] # Might be None if card was taken
@@ -82,50 +103,52 @@ def handle_card_click(
     try:
         current_state = card_state_grid[row][col]
     except IndexError:
-        print(f"Error: State grid index out of bounds for ({row},{col})")
+        _log.error(f"State grid index out of bounds for ({row},{col})")
         return
 
-    button_exists = button is not None and isinstance(button, tk.Button) and button.winfo_exists()
+    button_exists = button is not None and button.winfo_exists() # tk.Button, or a board_viewport.CellView
     button_state = button['state'] if button_exists else None
 
-    print(f"Click on ({row},{col}). Card: {card}. Current State: {current_state}. Button Exists: {button_exists}. Button State: {button_state}")
+    flight_recorder.record("click", row=row, col=col, card=card, state=current_state, button_state=button_state)
+    if _log.debug_on: _log.debug(f"Click on ({row},{col}). Card: {card}. Current State: {current_state}. Button Exists: {button_exists}. Button State: {button_state}")
 
     # Ignore clicks on fully processed/removed slots or empty center
     if current_state == config.STATE_ACTION_TAKEN or card is None:
-        print(f"Ignoring click on ({row},{col}) - State is ACTION_TAKEN or no card.")
+        if _log.debug_on: _log.debug(f"Ignoring click on ({row},{col}) - State is ACTION_TAKEN or no card.")
         return
 
     # Ignore clicks if button is disabled (e.g., during animation or combat)
     if button_exists and button_state == tk.DISABLED:
-        print(f"Ignoring click on ({row},{col}) - Button is DISABLED.")
+        if _log.debug_on: _log.debug(f"Ignoring click on ({row},{col}) - Button is DISABLED.")
         return
 
     # Handle clicks based on state
     if current_state == config.STATE_FACE_DOWN: # Face Down -> Flip
         if button_exists: # Should always exist if state is FACE_DOWN unless error
-            print(f"First click on ({row},{col}). Flipping card...")
-            button.config(state=tk.DISABLED) # Disable during animation
+            if _log.debug_on: _log.debug(f"First click on ({row},{col}). Flipping card...")
+            button.config(state=tk.DISABLED, text='') # Disable during animation (and drop any overlay text)
 
             # --- Lambda for callback needs all args required by on_card_revealed ---
             reveal_callback_with_args = lambda r=row, c=col: on_card_revealed(
                 r, c,
                 button_grid, card_data_grid, card_state_grid, # Pass grids
-                assets # Pass assets
+                assets, # Pass assets
+                session
             )
 
             # Pass the lambda function to animate_flip
-            animation.animate_flip(root, button, card, assets, reveal_callback_with_args, row, col)
+            animation.animate_flip(root, button, card, assets, reveal_callback_with_args, row, col, session.animations)
         else:
-             print(f"Error: Clicked face-down slot ({row},{col}) but button is missing.")
+             _log.error(f"Clicked face-down slot ({row},{col}) but button is missing.")
              card_state_grid[row][col] = config.STATE_ACTION_TAKEN # Mark as error/disabled
 
     elif current_state == config.STATE_FACE_UP: # Face Up -> Action
         if button_exists:
-            print(f"Second click on ({row},{col}). Performing action...")
+            if _log.debug_on: _log.debug(f"Second click on ({row},{col}). Performing action...")
             # Call the action handler, passing all required state *and UI frames*
             card_actions.handle_card_action(
                 row, col,
-                root, player, # Core components
+                root, player, session, # Core components
                 card_data_grid, button_grid, card_state_grid, # Game state grids
                 hand_card_data, hand_card_slots, # Hand state
                 assets, # Assets
@@ -133,10 +156,10 @@ def handle_card_click(
                 info_frame_bg # Styling
             )
         else:
-             print(f"Error: Clicked face-up slot ({row},{col}) but button is missing.")
+             _log.error(f"Clicked face-up slot ({row},{col}) but button is missing.")
              card_state_grid[row][col] = config.STATE_ACTION_TAKEN # Mark as error/disabled
 
     else: # Should not happen
-        print(f"Warning: Unhandled click state for ({row},{col}) - GridState: {current_state}")
+        _log.warning(f"Unhandled click state for ({row},{col}) - GridState: {current_state}")
 
 # --- END OF FILE game_logic.py ---
\ No newline at end of file
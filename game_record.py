@@ -0,0 +1,195 @@
+# --- START OF FILE game_record.py ---
+
+import os
+import queue
+import threading
+import config
+from card_logic import card_from_uid
+from game_events import (EV_DEAL, EV_REVEAL, EV_ACTION, EV_VALUE_CARD, EV_CANCEL, EV_DICE, EV_UNDO, EV_REDO,
+                         EVENT_ARITY, EVENT_NAMES, INPUT_EVENTS, position_of)
+import log
+
+_log = log.get_logger("record")
+
+# Binary game log: an append-only file of events, each written as unsigned LEB128 varints:
+#     kind, [payload length if the kind's arity is variable], payload...
+# Nearly every value is < 128, so most events take 2-3 bytes and a whole game a few hundred.
+# A file starts with FILE_MAGIC; every EV_DEAL starts a new game.
+
+FILE_MAGIC = b"JLGLOG1\n"
+
+
+# --- Varint Codec ---
+def encode_varint(value, out):
+    """Appends value (a non-negative int) to the bytearray out."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def encode_event(kind, payload, out):
+    """Appends one event to the bytearray out."""
+    encode_varint(kind, out)
+    if EVENT_ARITY[kind] is None: encode_varint(len(payload), out)
+    for value in payload: encode_varint(value, out)
+
+def _read_varint(data, pos):
+    """Returns (value, next pos). Raises EOFError if the data ends inside the varint."""
+    value = shift = 0
+    while True:
+        if pos >= len(data): raise EOFError
+        byte = data[pos]; pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80: return value, pos
+        shift += 7
+
+def decode_events(data, pos=0):
+    """
+    Yields (kind, payload tuple) from encoded bytes, starting at pos.
+    A truncated last event (e.g. the game was killed mid-write) is dropped.
+    """
+    end = len(data)
+    arities = EVENT_ARITY
+    while pos < end:
+        event_start = pos
+        try:
+            kind = data[pos]
+            if kind < 0x80: pos += 1
+            else: kind, pos = _read_varint(data, pos)
+            if kind not in arities: raise ValueError(f"Unknown event kind {kind} at byte {event_start}.")
+            arity = arities[kind]
+            if arity is None: arity, pos = _read_varint(data, pos)
+            chunk = data[pos:pos + arity]
+            if len(chunk) == arity and max(chunk, default=0) < 0x80:
+                payload = tuple(chunk) # Fast path: every value fits in one byte
+                pos += arity
+            else:
+                values = []
+                for _ in range(arity):
+                    value, pos = _read_varint(data, pos)
+                    values.append(value)
+                payload = tuple(values)
+        except EOFError:
+            _log.warning(f"Game log ends with a truncated event at byte {event_start}.")
+            return
+        yield kind, payload
+
+
+# --- Background Writer ---
+class GameLogWriter:
+    """
+    Appends events to a game log file from a background thread. The UI thread only puts
+    (kind, payload) tuples on a queue; encoding and all file I/O happen on the writer thread.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="jl-game-log", daemon=True)
+        self._thread.start()
+
+    def put(self, kind, payload):
+        self._queue.put((kind, payload))
+
+    def close(self, timeout=5.0):
+        """Writes out everything queued so far and stops the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "ab") as f:
+                if new_file: f.write(FILE_MAGIC)
+                while True:
+                    batch = [self._queue.get()] # Block for the first event...
+                    while True: # ...then take whatever else is already queued
+                        try: batch.append(self._queue.get_nowait())
+                        except queue.Empty: break
+                    out = bytearray()
+                    for item in batch:
+                        if item is not None: encode_event(item[0], item[1], out)
+                    f.write(out)
+                    f.flush()
+                    if None in batch: return
+        except OSError as e:
+            _log.error(f"Game log writer stopped, could not write {self.path}: {e}")
+
+
+def open_log(path=None):
+    """Returns a GameLogWriter appending to path (default config.GAME_LOG_FILE)."""
+    writer = GameLogWriter(path or config.GAME_LOG_FILE)
+    if _log.info_on: _log.info(f"Recording games to {writer.path}")
+    return writer
+
+
+# --- Reading ---
+def read_events(path):
+    """Yields (kind, payload) for every event in a log file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(FILE_MAGIC):
+        raise ValueError(f"{path} is not a game log (bad header).")
+    yield from decode_events(data, len(FILE_MAGIC))
+
+def read_games(path):
+    """Yields each game in a log file as a list of (kind, payload) events."""
+    game = None
+    for kind, payload in read_events(path):
+        if kind == EV_DEAL:
+            if game: yield game
+            game = []
+        if game is None:
+            _log.warning(f"Skipping {EVENT_NAMES[kind]} event before the first deal.")
+            continue
+        game.append((kind, payload))
+    if game: yield game
+
+def describe_event(kind, payload):
+    """Human-readable form of an event, for debugging."""
+    return f"{EVENT_NAMES.get(kind, kind)}{payload}"
+
+
+# --- Replay ---
+class ReplayMismatch(ValueError):
+    """The engine did not reproduce the recorded game."""
+
+def apply_input_event(engine, kind, payload):
+    """Feeds one recorded input event into a game_engine.GameEngine."""
+    if kind == EV_DEAL: engine.deal([card_from_uid(uid - 1) if uid else None for uid in payload])
+    elif kind == EV_REVEAL: engine.reveal(*position_of(payload[0]))
+    elif kind == EV_ACTION: engine.act(*position_of(payload[0]))
+    elif kind == EV_VALUE_CARD: # The log has the card's value: use the held card with that value
+        card = card_from_uid(payload[0] - 1) if payload[0] else None
+        engine.choose_value_card(card and (engine.hand.find_value(card) or card))
+    elif kind == EV_CANCEL: engine.cancel_combat()
+    elif kind == EV_DICE: engine.roll(list(payload[:-1]), payload[-1])
+    elif kind == EV_UNDO: engine.undo()
+    elif kind == EV_REDO: engine.redo()
+    else: raise ValueError(f"{EVENT_NAMES.get(kind, kind)} is not an input event.")
+
+def replay_game(events, player_suit=config.PLAYER_SUIT):
+    """
+    Replays one recorded game through a fresh GameEngine and checks that it produces exactly
+    the recorded event stream (derived events included). Returns the engine in its final state.
+    Raises ReplayMismatch at the first difference.
+    """
+    from game_engine import GameEngine # Imported here: the engine is only needed for replays
+    produced = []
+    engine = GameEngine(player_suit, on_event=lambda kind, *payload: produced.append((kind, payload)))
+    for index, (kind, payload) in enumerate(events):
+        if kind not in INPUT_EVENTS: continue # Derived events are checked below
+        start = len(produced)
+        try:
+            apply_input_event(engine, kind, payload)
+        except ValueError as e:
+            raise ReplayMismatch(f"Event {index} ({describe_event(kind, payload)}) is invalid: {e}") from e
+        expected = events[start:len(produced)]
+        if index != start or produced[start:] != expected:
+            raise ReplayMismatch(f"Event {index}: recorded {[describe_event(*ev) for ev in expected]}, "
+                                 f"engine produced {[describe_event(*ev) for ev in produced[start:]]}")
+    if len(produced) != len(events):
+        raise ReplayMismatch(f"Recorded {len(events)} events, engine produced {len(produced)}.")
+    return engine
+
+# --- END OF FILE game_record.py ---
@@ -0,0 +1,129 @@
+# --- START OF FILE game_session.py ---
+
+import config
+import utils
+import card_tracker
+import game_status
+import game_record
+import savegame
+import ui_batch
+import animation
+from card_logic import card_to_uid
+from hand_model import HandModel
+from player import Player
+from game_events import EV_DEAL
+import log
+
+_log = log.get_logger("game")
+
+# Everything that belongs to one live game. The game logic (game_logic, card_actions, combat)
+# reports to the session it is handed instead of to module-level hooks, so one process can
+# host several games at once (e.g. a tournament display), each with its own board, undo
+# history, combat views, dice, game log and autosave, all sharing one asset cache.
+
+
+class GameSession:
+    """
+    State and services of one game: grids, hand and player, the dice, the card tracker and
+    terminal status, the UiBatch for its widget updates, the AnimationContext (speed and running
+    flips / dice rolls) of its board, and - once the board is built - the
+    UndoManager, CombatManager and InputQueue. The game log and autosave are optional (open_log() / open_autosave()).
+    root: the Tk root the widget updates are scheduled on (None: applied immediately).
+    """
+    def __init__(self, player_suit=config.PLAYER_SUIT, dice_rng=None, root=None):
+        self.player_suit = player_suit
+        self.card_data_grid = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+        self.card_state_grid = [[config.STATE_FACE_DOWN for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+        self.button_grid = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+        self.hand_card_data = HandModel() # Slot grid + card index + free slots
+        self.player = Player(config.ROWS // 2, config.COLUMNS // 2)
+        self.player.suit = player_suit
+        self.dice_rng = dice_rng or utils.DiceRng()
+        self.tracker = card_tracker.CardTracker(player_suit)
+        self.status = game_status.GameStatus(player_suit)
+        self.ui = ui_batch.UiBatch(root)
+        self.animations = animation.AnimationContext()
+        self.undo = None   # undo_manager.UndoManager, once the buttons exist
+        self.combat = None # combat.manager.CombatManager, once the info panel exists
+        self.inputs = None # input_queue.InputQueue, once the buttons exist
+        self.flip_prefetch = None # animation.FlipPrefetcher, for a game on screen
+        self._log_writer = None
+        self._save_writer = None
+
+    # --- Setup ---
+    def deal(self, grid_cards):
+        """Places grid_cards (row-major) face down."""
+        for index, card in enumerate(grid_cards):
+            r, c = divmod(index, config.COLUMNS)
+            self.card_data_grid[r][c] = card
+            self.card_state_grid[r][c] = config.STATE_FACE_DOWN if card else config.STATE_ACTION_TAKEN
+        self.state_restored()
+
+    def load(self, snapshot, rng_state):
+        """Puts a saved game (savegame.load_autosave()) into the session."""
+        for r in range(config.ROWS):
+            self.card_data_grid[r][:] = snapshot.cards[r]
+            self.card_state_grid[r][:] = snapshot.states[r]
+        self.hand_card_data.restore(snapshot.hand)
+        self.player.set_position(*snapshot.position)
+        self.player.set_skip_turn(snapshot.skip_turn)
+        self.dice_rng.state = rng_state # Same dice as if the game had never been closed
+        self.state_restored()
+
+    def open_log(self, path=None):
+        """Records this game's events to path (default config.GAME_LOG_FILE), starting with its deal."""
+        self._log_writer = game_record.open_log(path)
+        self._log_writer.put(EV_DEAL, tuple(card_to_uid(card) + 1 if card else 0 for row in self.card_data_grid for card in row))
+
+    def open_autosave(self, path=None):
+        """Saves this game to path (default config.SAVE_FILE) after every completed move."""
+        self._save_writer = savegame.SaveWriter(path or config.SAVE_FILE)
+
+    def close(self):
+        """Flushes the game log and the last pending autosave."""
+        if self._log_writer is not None:
+            self._log_writer.close()
+            self._log_writer = None
+        if self._save_writer is not None:
+            self._save_writer.close()
+            self._save_writer = None
+
+    # --- Reports From The Game Logic ---
+    def record(self, kind, *payload):
+        """One game event (game_events): feeds the terminal status and the game log."""
+        self.status.apply(kind, *payload)
+        if self._log_writer is not None: self._log_writer.put(kind, payload)
+
+    def card_revealed(self, row, col, card):
+        self.tracker.reveal(row, col, card)
+
+    def state_restored(self):
+        """The whole state changed (deal, resume, undo/redo): recount the tracker and status."""
+        self.tracker.reset(self.card_data_grid, self.card_state_grid)
+        self.status.reset(self.card_data_grid, self.card_state_grid, self.hand_card_data, self.player.position)
+        if self.inputs is not None: self.inputs.clear() # Queued clicks were meant for the old state
+        self.prefetch_flips()
+
+    def checkpoint(self):
+        if self.undo is not None: self.undo.checkpoint()
+        self.prefetch_flips()
+
+    def combat_started(self):
+        if self.undo is not None: self.undo.combat_started()
+
+    def combat_finished(self):
+        if self.undo is not None: self.undo.combat_finished()
+        self.prefetch_flips() # The Jack may have moved
+
+    def prefetch_flips(self):
+        """Has the flip frames of the face-down cards the Jack can reach next built in idle time."""
+        if self.flip_prefetch is None: return
+        self.flip_prefetch.prefetch([self.card_data_grid[r][c] for r in range(config.ROWS) for c in range(config.COLUMNS)
+                                     if self.card_state_grid[r][c] == config.STATE_FACE_DOWN and self.card_data_grid[r][c] is not None
+                                     and self.player.can_interact(r, c)])
+
+    def autosave(self, snapshot):
+        """Queues snapshot (with this game's dice state) for saving. Does nothing unless autosave is open."""
+        if self._save_writer is not None: self._save_writer.put(snapshot, self.dice_rng.state)
+
+# --- END OF FILE game_session.py ---
@@ -0,0 +1,192 @@
+# --- START OF FILE game_status.py ---
+
+import config
+import card_tracker
+from card_logic import card_from_uid
+from game_events import (EV_DEAL, EV_REVEAL, EV_PICKUP, EV_DISABLE, EV_OUTCOME, EV_REMOVE, EV_MOVE,
+                         EV_CLEAR_HAND, cell_of, position_of)
+
+# Terminal-state detection and scoring, kept up to date from the game events instead of
+# rescanning the grids: simulators and search ask for it after every move.
+# The game ends when
+#   OUTCOME_WON         both Jokers are in the hand,
+#   OUTCOME_JOKER_LOST  a Joker can no longer be collected (left on the grid with a full hand,
+#                       or discarded with the hand after losing to a hostile Queen),
+#   OUTCOME_NO_MOVES    no card is left that can be revealed, picked up or fought, or
+#   OUTCOME_BOXED_IN    cards are left, but none next to the cleared area around the Jack
+#                       (only with config.ADJACENCY_RULE, the rulebook's rule that only
+#                       adjacent cards can be acted on; handle_card_click checks it with can_act_on()).
+# Face-up Aces are walls: their only action does nothing.
+# The Jack's area (cleared cells connected to his cell) only grows while cells are cleared,
+# so it is extended by a flood fill from each newly cleared cell: O(cells) over a whole game.
+
+OUTCOME_WON = "won"
+OUTCOME_JOKER_LOST = "joker_lost"
+OUTCOME_NO_MOVES = "no_moves"
+OUTCOME_BOXED_IN = "boxed_in"
+
+OUTCOME_TEXT = {
+    OUTCOME_WON: "Both Jokers collected - you escaped the Labyrinth!",
+    OUTCOME_JOKER_LOST: "A Joker was lost - the Labyrinth cannot be escaped.",
+    OUTCOME_NO_MOVES: "No moves left.",
+    OUTCOME_BOXED_IN: "Boxed in: no card left next to the Jack's cleared area.",
+}
+
+_NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_NUM_CELLS = config.ROWS * config.COLUMNS
+
+
+class GameStatus:
+    """
+    Counters for one game, fed with apply(kind, *payload) for every game event (undo and redo
+    reload the whole state with reset()). Listeners are called with the outcome whenever the
+    game turns terminal.
+    """
+    def __init__(self, player_suit=config.PLAYER_SUIT):
+        self.player_suit = player_suit
+        self.listeners = []
+        self._cards = [None] * _NUM_CELLS
+        self.reset([[None] * config.COLUMNS for _ in range(config.ROWS)],
+                   [[config.STATE_ACTION_TAKEN] * config.COLUMNS for _ in range(config.ROWS)], (), (0, 0))
+
+    def reset(self, card_data_grid, card_state_grid, hand_rows, position):
+        """Recounts from a full game state (deal, undo/redo, resume). hand_rows: a HandModel or snapshot hand."""
+        self._cards = [card_data_grid[r][c] for r in range(config.ROWS) for c in range(config.COLUMNS)]
+        self._useful = set()  # Cells that can still be revealed, picked up or fought
+        self._face_down = 0
+        self.cleared = 0
+        self.jokers_in_hand = sum(1 for row in hand_rows for card in row if card is not None and card.get_color() == "joker")
+        self.jokers_on_grid = 0
+        for cell, card in enumerate(self._cards):
+            r, c = position_of(cell)
+            state = card_state_grid[r][c]
+            if card is None:
+                self.cleared += 1
+                continue
+            if state == config.STATE_ACTION_TAKEN: continue
+            if state == config.STATE_FACE_DOWN: self._face_down += 1
+            if card.get_color() == "joker": self.jokers_on_grid += 1
+            if state == config.STATE_FACE_DOWN or not self._is_wall(card): self._useful.add(cell)
+        self.fights_won = self.fights_lost = 0 # Not part of a snapshot: counted from here on
+        self._move_to(cell_of(*position))
+        self._last_outcome = self.outcome()
+
+    def _is_wall(self, card):
+        return card_tracker.card_category(card, self.player_suit) == card_tracker.ACE
+
+    # --- Area Around The Jack ---
+    def _move_to(self, cell):
+        self.position = cell
+        self._area = set()
+        self._frontier = set() # Useful cells next to (or under) the area
+        if cell in self._useful: self._frontier.add(cell)
+        self._flood(cell)
+
+    def _flood(self, start):
+        stack = [start]
+        self._area.add(start)
+        while stack:
+            r, c = position_of(stack.pop())
+            for dr, dc in _NEIGHBOURS:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < config.ROWS and 0 <= nc < config.COLUMNS): continue
+                neighbour = nr * config.COLUMNS + nc
+                if neighbour in self._area: continue
+                if self._cards[neighbour] is None:
+                    self._area.add(neighbour)
+                    stack.append(neighbour)
+                elif neighbour in self._useful:
+                    self._frontier.add(neighbour)
+
+    def _touches_area(self, cell):
+        r, c = position_of(cell)
+        return any(0 <= r + dr < config.ROWS and 0 <= c + dc < config.COLUMNS
+                   and (r + dr) * config.COLUMNS + c + dc in self._area for dr, dc in _NEIGHBOURS)
+
+    def _done(self, cell):
+        """The card at cell can no longer be acted on."""
+        self._useful.discard(cell)
+        self._frontier.discard(cell)
+
+    def _clear(self, cell):
+        """The card at cell left the grid."""
+        self._done(cell)
+        self._cards[cell] = None
+        self.cleared += 1
+        if cell in self._area or self._touches_area(cell): self._flood(cell)
+
+    # --- Events ---
+    def apply(self, kind, *payload):
+        """Updates the counters for one game event (game_events kinds; others are ignored)."""
+        if kind == EV_REVEAL:
+            cell = payload[0]
+            self._face_down -= 1
+            if self._is_wall(self._cards[cell]): self._done(cell)
+        elif kind == EV_PICKUP:
+            cell = payload[0]
+            if self._cards[cell].get_color() == "joker":
+                self.jokers_in_hand += 1
+                self.jokers_on_grid -= 1
+            self._clear(cell)
+        elif kind == EV_DISABLE:
+            cell = payload[0]
+            if self._cards[cell].get_color() == "joker": self.jokers_on_grid -= 1 # No room in the hand
+            self._done(cell)
+        elif kind == EV_REMOVE:
+            self._clear(payload[0])
+        elif kind == EV_MOVE:
+            if payload[0] not in self._area: self._move_to(payload[0])
+            else: self.position = payload[0]
+        elif kind == EV_CLEAR_HAND:
+            self.jokers_in_hand = 0
+        elif kind == EV_OUTCOME:
+            if payload[0]: self.fights_won += 1
+            else: self.fights_lost += 1
+        elif kind == EV_DEAL:
+            grid = [[card_from_uid(uid - 1) if uid else None for uid in payload[r * config.COLUMNS:(r + 1) * config.COLUMNS]]
+                    for r in range(config.ROWS)]
+            states = [[config.STATE_FACE_DOWN if card else config.STATE_ACTION_TAKEN for card in row] for row in grid]
+            self.reset(grid, states, (), (config.ROWS // 2, config.COLUMNS // 2))
+            return
+        else:
+            return
+        outcome = self.outcome()
+        if outcome != self._last_outcome:
+            self._last_outcome = outcome
+            if outcome is not None:
+                for listener in self.listeners: listener(outcome)
+
+    # --- Queries ---
+    def can_act_on(self, row, col):
+        """True if the card at (row, col) is next to the Jack's cleared area (config.ADJACENCY_RULE). O(1)."""
+        return cell_of(row, col) in self._frontier
+
+    @property
+    def revealed(self):
+        """Cards turned face up so far (including those since taken off the grid)."""
+        return _NUM_CELLS - self._face_down
+
+    def outcome(self):
+        """None while the game goes on, otherwise one of the OUTCOME_* values. O(1)."""
+        if self.jokers_in_hand >= 2: return OUTCOME_WON
+        if self.jokers_in_hand + self.jokers_on_grid < 2: return OUTCOME_JOKER_LOST
+        if not self._useful: return OUTCOME_NO_MOVES
+        if config.ADJACENCY_RULE and not self._frontier: return OUTCOME_BOXED_IN
+        return None
+
+    def is_terminal(self):
+        return self.outcome() is not None
+
+    def score(self):
+        """Points for the game so far (weights in config, # --- Scoring ---). O(1)."""
+        return (config.SCORE_WIN * (self.jokers_in_hand >= 2) + config.SCORE_JOKER * self.jokers_in_hand
+                + config.SCORE_CLEARED * self.cleared + config.SCORE_REVEALED * self.revealed
+                - config.SCORE_FIGHT_LOST * self.fights_lost)
+
+    def summary(self):
+        """Dict with the outcome, score and counters, for the end-of-game display."""
+        return {"outcome": self.outcome(), "score": self.score(), "jokers": self.jokers_in_hand,
+                "revealed": self.revealed, "cleared": self.cleared,
+                "fights_won": self.fights_won, "fights_lost": self.fights_lost}
+
+# --- END OF FILE game_status.py ---
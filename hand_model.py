@@ -0,0 +1,121 @@
+# --- START OF FILE hand_model.py ---
+
+import heapq
+import config
+
+class HandModel:
+    """
+    The player's hand as data: a HAND_ROWS x HAND_COLS slot grid plus
+      - a card uid -> (row, col) index, so lookups and removals never scan the slots
+        (and never mix up equal-valued cards from different decks),
+      - a min-heap of free slots, so adding takes the first empty slot (row-major) directly,
+      - the card each hand label currently displays and a set of dirty slots, so
+        hand_manager only reconfigures labels whose card actually changed.
+    Rows stay compacted (cards fill a row from the left), as the hand display expects.
+    Reading hand[r][c] still works for code written against the old list-of-lists hand.
+    """
+    def __init__(self, rows=config.HAND_ROWS, cols=config.HAND_COLS):
+        self.rows = rows
+        self.cols = cols
+        self._slots = [[None for _ in range(cols)] for _ in range(rows)]
+        self._slot_of = {} # card.uid -> (row, col)
+        self._free_slots = [(r, c) for r in range(rows) for c in range(cols)] # Already a valid heap (sorted)
+        self._row_counts = [0] * rows
+        self.displayed = [[None for _ in range(cols)] for _ in range(rows)] # Card each label shows
+        self.dirty = set() # Slots whose card may differ from what is displayed
+
+    # --- Read Access ---
+    def __getitem__(self, row):
+        """Row access for hand[r][c] reads. Treat the returned row as read-only."""
+        return self._slots[row]
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __contains__(self, card):
+        return card is not None and card.uid in self._slot_of
+
+    def card_count(self):
+        return len(self._slot_of)
+
+    def is_full(self):
+        return not self._free_slots
+
+    def slot_of(self, card):
+        """Returns (row, col) of a card in the hand, or None."""
+        return self._slot_of.get(card.uid)
+
+    def find(self, predicate):
+        """Returns [(card, row, col), ...] for held cards matching predicate, in slot order."""
+        matches = [(self._slots[r][c], r, c) for r, c in self._slot_of.values() if predicate(self._slots[r][c])]
+        matches.sort(key=lambda match: (match[1], match[2]))
+        return matches
+
+    def find_value(self, card):
+        """Returns the first held card (slot order) with the same suit and rank as card, or None."""
+        matches = self.find(card.same_value)
+        return matches[0][0] if matches else None
+
+    # --- Mutations ---
+    def add(self, card):
+        """Puts a card in the first free slot. Returns (row, col), or None if the hand is full."""
+        if not self._free_slots: return None
+        r, c = heapq.heappop(self._free_slots)
+        self._slots[r][c] = card
+        self._slot_of[card.uid] = (r, c)
+        self._row_counts[r] += 1
+        self.dirty.add((r, c))
+        return (r, c)
+
+    def remove(self, card):
+        """Removes a card and compacts its row. Returns the row index, or None if not held."""
+        slot = self._slot_of.pop(card.uid, None)
+        if slot is None: return None
+        r, c = slot
+        row = self._slots[r]
+        last = self._row_counts[r] - 1
+        # Shift the cards to the right of the removed one left by one slot
+        for shift_c in range(c, last):
+            moved_card = row[shift_c + 1]
+            row[shift_c] = moved_card
+            self._slot_of[moved_card.uid] = (r, shift_c)
+            self.dirty.add((r, shift_c))
+        row[last] = None
+        self.dirty.add((r, last))
+        self._row_counts[r] = last
+        heapq.heappush(self._free_slots, (r, last))
+        return r
+
+    def snapshot(self):
+        """Returns the slot contents as a tuple of row tuples (for replays and saves)."""
+        return tuple(tuple(row) for row in self._slots)
+
+    def restore(self, rows):
+        """Replaces the contents with a snapshot() result. Changed slots are marked dirty."""
+        self._slot_of.clear()
+        self._free_slots = []
+        for r in range(self.rows):
+            for c in range(self.cols):
+                card = rows[r][c]
+                if self._slots[r][c] is not card: self.dirty.add((r, c))
+                self._slots[r][c] = card
+                if card is None: self._free_slots.append((r, c))
+                else: self._slot_of[card.uid] = (r, c)
+            self._row_counts[r] = sum(1 for card in rows[r] if card is not None)
+        # _free_slots was filled in row-major order, so it is already a valid heap
+
+    def clear(self):
+        """Removes every card. Returns how many were removed."""
+        cleared = len(self._slot_of)
+        for r, c in self._slot_of.values():
+            self._slots[r][c] = None
+            self.dirty.add((r, c))
+        self._slot_of.clear()
+        self._row_counts = [0] * self.rows
+        self._free_slots = [(r, c) for r in range(self.rows) for c in range(self.cols)]
+        return cleared
+
+# --- END OF FILE hand_model.py ---
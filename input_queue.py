@@ -0,0 +1,80 @@
+# --- START OF FILE input_queue.py ---
+
+from collections import deque
+import config
+import log
+
+_log = log.get_logger("game")
+
+# Input buffering. While the game is busy (a flip or dice animation running, or a fight on
+# screen) grid clicks are queued instead of being handled against a state that is about to
+# change. Each queued cell gets a coloured border (the button's highlight ring: the button
+# text belongs to the hazard odds overlay). Once the game is idle again the clicks are
+# replayed in order through the normal click handler, which checks them against
+# the state at that point (a click on a card that has since been taken is simply ignored).
+# A replayed click that starts a new animation pauses the queue until that one is done.
+
+
+class InputQueue:
+    """
+    Clicks waiting for one game. busy() says whether clicks must wait; wake() is called
+    whenever the game may have become idle (a card revealed, a fight closed).
+    idle_color: the border colour of cards that are not queued (the board background).
+    """
+    def __init__(self, root, button_grid, busy, idle_color, depth=config.INPUT_QUEUE_DEPTH):
+        self.root = root
+        self.button_grid = button_grid
+        self.busy = busy
+        self.idle_color = idle_color
+        self.depth = depth
+        self._queue = deque() # (row, col, replay function), oldest first
+        self._after_id = None
+        self.queued = self.dropped = self.replayed = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def accepts(self):
+        """True if a click arriving now has to wait."""
+        return self.depth > 0 and self.busy()
+
+    def push(self, row, col, replay):
+        """Queues a click on (row, col); replay() handles it later. False if the queue is full or the cell already waits."""
+        if len(self._queue) >= self.depth or any(r == row and c == col for r, c, _ in self._queue):
+            self.dropped += 1
+            if _log.debug_on: _log.debug(f"Input queue: click on ({row},{col}) dropped ({len(self._queue)} queued).")
+            return False
+        self._queue.append((row, col, replay))
+        self.queued += 1
+        self._mark(row, col, True)
+        if _log.debug_on: _log.debug(f"Input queue: click on ({row},{col}) queued at position {len(self._queue)}.")
+        return True
+
+    def wake(self):
+        """Replays the queued clicks on the next idle callback (if the game is idle by then)."""
+        if self._queue and self._after_id is None:
+            self._after_id = self.root.after_idle(self._drain)
+
+    def clear(self):
+        """Forgets every queued click (undo, redo and new state make them meaningless)."""
+        while self._queue:
+            row, col, _ = self._queue.popleft()
+            self._mark(row, col, False)
+
+    def _drain(self):
+        self._after_id = None
+        while self._queue and not self.busy():
+            row, col, replay = self._queue.popleft()
+            self._mark(row, col, False)
+            self.replayed += 1
+            if _log.debug_on: _log.debug(f"Input queue: replaying click on ({row},{col}).")
+            replay()
+
+    def _mark(self, row, col, queued):
+        """Shows or clears the queued border of a cell."""
+        button = self.button_grid[row][col]
+        if button is None or not button.winfo_exists(): return
+        color = config.INPUT_QUEUE_COLOR if queued else self.idle_color
+        button.config(highlightbackground=color, highlightcolor=color)
+
+# --- END OF FILE input_queue.py ---
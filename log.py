@@ -0,0 +1,99 @@
+# --- START OF FILE log.py ---
+
+import logging
+import os
+import sys
+import config
+
+# Leveled logging per subsystem ("game", "combat", "hand", "anim", "assets", "ui").
+# Hot paths guard their calls with a plain attribute check, so a disabled call costs one
+# attribute load and the message (f-string, repr of cards...) is never even built:
+#
+#     _log = log.get_logger("game")
+#     if _log.debug_on: _log.debug(f"Click on ({row},{col}). Card: {card}")
+#
+# Warnings and errors are rare and enabled by default, so they are called directly.
+# Levels come from config.LOG_LEVELS, overridden by the JOKERS_LOG environment variable,
+# e.g. JOKERS_LOG="debug" or JOKERS_LOG="warning,combat=debug,anim=info".
+
+LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR, "off": logging.CRITICAL + 10}
+
+_loggers = {} # subsystem name -> SubsystemLogger
+_default_level = logging.WARNING
+_overrides = {} # subsystem name -> level
+_handler = None
+
+
+class SubsystemLogger:
+    """Logger for one subsystem with cached *_on flags for near-zero-cost disabled calls."""
+    def __init__(self, name):
+        self.name = name
+        self._logger = logging.getLogger(f"jokers.{name}")
+        self._logger.propagate = False
+        self.debug_on = self.info_on = self.warning_on = self.error_on = False
+        self.set_level(_overrides.get(name, _default_level))
+
+    def set_level(self, level):
+        """Sets the level (a logging level int or a name from LEVELS) and refreshes the flags."""
+        if isinstance(level, str): level = LEVELS[level.lower()]
+        self._logger.setLevel(level)
+        self.debug_on = level <= logging.DEBUG
+        self.info_on = level <= logging.INFO
+        self.warning_on = level <= logging.WARNING
+        self.error_on = level <= logging.ERROR
+
+    def debug(self, message): self._logger.debug(message)
+    def info(self, message): self._logger.info(message)
+    def warning(self, message): self._logger.warning(message)
+    def error(self, message): self._logger.error(message)
+
+
+def _get_handler():
+    global _handler
+    if _handler is None:
+        log_file = os.environ.get("JOKERS_LOG_FILE") or config.LOG_FILE
+        # A file keeps console traffic (slow on Windows) away from the Tk loop
+        _handler = logging.FileHandler(log_file) if log_file else logging.StreamHandler(sys.stdout)
+        _handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s: %(message)s"))
+    return _handler
+
+
+def get_logger(subsystem):
+    """Returns the (shared) logger for a subsystem."""
+    logger = _loggers.get(subsystem)
+    if logger is None:
+        logger = SubsystemLogger(subsystem)
+        logger._logger.addHandler(_get_handler())
+        _loggers[subsystem] = logger
+    return logger
+
+
+def set_level(level, subsystem=None):
+    """Changes the level of one subsystem, or of all subsystems when subsystem is None."""
+    global _default_level
+    if isinstance(level, str): level = LEVELS[level.lower()]
+    if subsystem is None:
+        _default_level = level
+        _overrides.clear()
+        for logger in _loggers.values(): logger.set_level(level)
+    else:
+        _overrides[subsystem] = level
+        if subsystem in _loggers: _loggers[subsystem].set_level(level)
+
+
+def configure(spec):
+    """Applies a level spec like "warning,combat=debug" (bare level = default for all)."""
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        if "=" in part:
+            subsystem, level = part.split("=", 1)
+            set_level(level.strip(), subsystem.strip())
+        else:
+            set_level(part)
+
+
+# --- Initial configuration (at import, before any logger is created) ---
+configure(config.LOG_LEVELS)
+if os.environ.get("JOKERS_LOG"):
+    configure(os.environ["JOKERS_LOG"])
+
+# --- END OF FILE log.py ---
@@ -1,8 +1,7 @@
 # --- START OF FILE main.py ---
 
 import tkinter as tk
-from PIL import ImageTk
-import random
+import sys
 import time
 
 # --- Local Modules ---
@@ -11,23 +10,39 @@ import assets_manager
 import ui_manager
 # Removed animation, hand_manager, combat_manager direct imports here if not used directly in main
 import game_logic
+import animation
+import workers
+import log
+import flight_recorder
+import undo_manager
+import savegame
+import hand_manager
+import card_tracker
+import game_status
+import game_session
+import board_viewport
+import input_queue
+import tk_photo
+import board_scaler
+import deal_codes
 # import card_actions # Imported by game_logic
-import utils
-from card_logic import Card, create_shuffled_deck # Keep specific imports
-from player import Player
+from combat import manager as combat_manager
+from card_logic import create_grid_deal
+
+_log = log.get_logger("ui")
 
 # --- Helper Function to Create Tkinter Images (Cards & Dice) ---
 # (This function remains the same)
 def create_tk_images(root, pil_assets):
     """Creates Tkinter PhotoImage objects from loaded PIL images (cards and dice)."""
-    print("Creating Tkinter PhotoImages...")
+    if _log.debug_on: _log.debug("Creating Tkinter PhotoImages...")
     tk_images = {}
 
     # Card Back
     try:
         if "card_back_pil_scaled" not in pil_assets or pil_assets["card_back_pil_scaled"] is None:
              raise ValueError("Scaled PIL card back image is missing in assets.")
-        tk_images["tk_photo_back"] = ImageTk.PhotoImage(pil_assets["card_back_pil_scaled"], master=root)
+        tk_images["tk_photo_back"] = tk_photo.photo_image(pil_assets["card_back_pil_scaled"], master=root)
     except Exception as e: exit(f"FATAL ERROR creating Tkinter image for card back: {e}")
 
     # Card Faces
@@ -36,52 +51,49 @@ def create_tk_images(root, pil_assets):
     pil_faces = pil_assets.get("pil_faces_scaled", {})
     for key, pil_img in pil_faces.items():
         if pil_img is None: # Skip if PIL loading failed for this key
-             print(f"Skipping Tk image creation for face '{key}' due to missing PIL image.")
+             if _log.debug_on: _log.debug(f"Skipping Tk image creation for face '{key}' due to missing PIL image.")
              missing_faces.append(key)
              continue
         try:
-            tk_images["tk_faces"][key] = ImageTk.PhotoImage(pil_img, master=root)
+            tk_images["tk_faces"][key] = tk_photo.photo_image(pil_img, master=root)
         except Exception as e:
-            print(f"Warning: Could not create Tkinter image for face {key}: {e}")
+            _log.warning(f"Could not create Tkinter image for face {key}: {e}")
             missing_faces.append(key)
-    if missing_faces: print(f"Warning: Missing/failed Tk face images for: {', '.join(missing_faces)}")
-    print(f"- Tk Card Faces created ({len(tk_images['tk_faces'])}).")
+    if missing_faces: _log.warning(f"Missing/failed Tk face images for: {', '.join(missing_faces)}")
+    if _log.debug_on: _log.debug(f"- Tk Card Faces created ({len(tk_images['tk_faces'])}).")
 
     # Dice Faces (including icon)
     tk_images["tk_dice"] = {}
     pil_dice = pil_assets.get("pil_dice_scaled", {})
     for value, pil_img in pil_dice.items():
          if pil_img is None: # Skip if PIL loading failed for this key
-             print(f"Skipping Tk image creation for dice '{value}' due to missing PIL image.")
+             if _log.debug_on: _log.debug(f"Skipping Tk image creation for dice '{value}' due to missing PIL image.")
              continue
          try:
-            tk_images["tk_dice"][value] = ImageTk.PhotoImage(pil_img, master=root)
+            tk_images["tk_dice"][value] = tk_photo.photo_image(pil_img, master=root)
          except Exception as e:
-            print(f"Warning: Could not create Tkinter image for dice face {value}: {e}")
-    print(f"- Tk Dice Faces created ({len(tk_images['tk_dice'])}).")
+            _log.warning(f"Could not create Tkinter image for dice face {value}: {e}")
+    if _log.debug_on: _log.debug(f"- Tk Dice Faces created ({len(tk_images['tk_dice'])}).")
 
     return tk_images
 
 # --- UI State Management Helpers ---
-# Keep track of the currently displayed combat view frame
-current_combat_view = None
-
 def hide_hand(hand_frame):
     """Hides the hand display."""
     if hand_frame and hand_frame.winfo_ismapped():
-        print("Hiding hand frame.")
+        if _log.debug_on: _log.debug("Hiding hand frame.")
         hand_frame.pack_forget()
 
 def show_hand(hand_frame):
     """Shows the hand display."""
     if hand_frame and not hand_frame.winfo_ismapped():
-        print("Showing hand frame.")
+        if _log.debug_on: _log.debug("Showing hand frame.")
         # Re-pack it where it belongs (adjust if layout changes)
         hand_frame.pack(pady=(40, 20), anchor='n')
 
 def disable_grid(button_grid):
     """Disables all buttons currently in the grid."""
-    print("Disabling grid buttons.")
+    if _log.debug_on: _log.debug("Disabling grid buttons.")
     for r in range(config.ROWS):
         for c in range(config.COLUMNS):
             button = button_grid[r][c]
@@ -90,7 +102,7 @@ def disable_grid(button_grid):
 
 def enable_grid(button_grid, card_state_grid):
     """Enables grid buttons that are not in an ACTION_TAKEN state."""
-    print("Enabling active grid buttons.")
+    if _log.debug_on: _log.debug("Enabling active grid buttons.")
     for r in range(config.ROWS):
         for c in range(config.COLUMNS):
             button = button_grid[r][c]
@@ -103,48 +115,42 @@ def enable_grid(button_grid, card_state_grid):
                     # Ensure buttons for completed actions remain disabled
                     button.config(state=tk.DISABLED)
 
-def clear_combat_view(info_frame):
-    """Destroys any combat-related widgets in the info frame."""
-    global current_combat_view
-    print("Clearing combat view from info panel.")
-    if current_combat_view and current_combat_view.winfo_exists():
-        current_combat_view.destroy()
-    current_combat_view = None
-    # Alternative: Iterate through info_frame children if structure is simple
-    # for widget in info_frame.winfo_children():
-    #     # Be careful not to destroy permanent labels, separators etc.
-    #     # Maybe tag combat widgets specifically? Or destroy only frames?
-    #     if isinstance(widget, tk.Frame) and widget != hand_frame: # Example logic
-    #          widget.destroy()
-
-
-# --- Main Application Setup ---
-def main():
-    global current_combat_view # Allow modification by callbacks
-
-    # 1. Create Main Window
-    root = ui_manager.create_main_window()
 
-    # 2. Load PIL Assets (includes dice now)
+# --- Assets (shared by every game in the process) ---
+def load_assets(root):
+    """Loads the card and dice images once; every game board in the process shares them."""
+    # Load PIL Assets (includes dice now)
     pil_assets = assets_manager.load_pil_assets()
     if "width" not in pil_assets or "height" not in pil_assets:
          exit("FATAL ERROR: Card dimensions not loaded from assets.")
-    scaled_width = pil_assets["width"]
-    scaled_height = pil_assets["height"]
 
-    # 3. Create Tkinter Images (includes dice now)
+    # Create Tkinter Images (includes dice now) and combine
     tk_assets = create_tk_images(root, pil_assets)
-
-    # 4. Combine Assets
     assets = {**pil_assets, **tk_assets}
     if "tk_photo_back" not in assets: exit("FATAL ERROR: Tkinter card back image missing.")
+    return assets
+
+
+# --- One Game Board ---
+def create_game(root, parent, assets, grid_deal=None, saved=None, log_path=None, save_path=None, bind_keys=True, worker_service=None):
+    """
+    Builds one game board (grid + info panel) inside parent and returns its GameSession.
+    grid_deal: row-major deal (None = a new random deal); saved: (snapshot, dice RNG state) to resume.
+    log_path / save_path: game log and autosave files (None = off). bind_keys: the application-wide
+    shortcuts (Ctrl+Z/Y, Ctrl+H, Esc), only for a single game per window.
+    worker_service: workers.WorkerService for background rescaling when the window is resized
+    (None = fixed card size; only for a single game per window).
+    """
+    scaled_width = assets["width"]
+    scaled_height = assets["height"]
     tk_photo_back = assets["tk_photo_back"]
+    session = game_session.GameSession(config.PLAYER_SUIT, root=root)
 
-    # 5. Setup Layout
-    grid_frame, info_frame = ui_manager.setup_layout(root, scaled_width, scaled_height)
+    # 1. Setup Layout
+    grid_frame, info_frame = ui_manager.setup_layout(parent, scaled_width, scaled_height)
     info_frame_bg = info_frame.cget('bg') # Get background for consistency
 
-    # 6. Setup Info Panel (permanent elements)
+    # 2. Setup Info Panel (permanent elements)
     player_id_text = f"Playing as Jack of {config.PLAYER_SUIT.title()}"
     info_text_var = ui_manager.setup_info_panel_content(info_frame, player_id_text)
     # --- Store permanent info elements to avoid destroying them ---
@@ -152,123 +158,62 @@ def main():
     # Example: title_label, separator, info_content_label = ui_manager.setup_info_panel_content(...)
     # --------------------------------------------------------------
 
-    # 7. Setup Hand Display Frame (initially visible)
-    hand_frame, hand_card_slots = ui_manager.setup_hand_display(info_frame, scaled_width, scaled_height)
+    # Animation speed selector
+    ui_manager.setup_animation_speed_control(info_frame, session.animations.set_speed)
+    ui_manager.setup_undo_controls(info_frame, lambda: session.undo and session.undo.undo(),
+                                   lambda: session.undo and session.undo.redo())
 
-    # 8. Initialize Game State Components
-    card_data_grid = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
-    button_grid = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
-    card_state_grid = [[config.STATE_FACE_DOWN for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
-    hand_card_data = [[None for _ in range(config.HAND_COLS)] for _ in range(config.HAND_ROWS)]
+    # 3. Setup Hand Display Frame (initially visible)
+    hand_frame, hand_card_slots = ui_manager.setup_hand_display(info_frame, scaled_width, scaled_height)
 
-    # Create the Player
-    player_start_row, player_start_col = config.ROWS // 2, config.COLUMNS // 2 # Start middle? TBD by rules
-    player = Player(player_start_row, player_start_col)
-    player.suit = config.PLAYER_SUIT # Assign suit based on config
+    # 4. Game State Components (grids, hand, player) live in the session
+    card_data_grid = session.card_data_grid
+    button_grid = session.button_grid
+    card_state_grid = session.card_state_grid
+    hand_card_data = session.hand_card_data
+    player = session.player
+    session.combat = combat_manager.CombatManager(session)
+
+    # 5. Resume the saved game, or deal
+    if saved:
+        if _log.info_on: _log.info("Resuming saved game...")
+        session.load(*saved)
+        # Not recorded in the game log: a log game must start from its deal
+    else:
+        # Prepare Deck (rulebook setup: no Jacks, one black 10 removed, Black Joker shuffled in)
+        if grid_deal is None:
+            if _log.info_on: _log.info("Preparing deck for the Dungeon...")
+            grid_deal = create_grid_deal() # Row-major, Red Joker in the centre
+        deal_code = deal_codes.encode_deal(grid_deal)
+        if _log.info_on: _log.info(f"Deal code: {deal_code}")
+        ui_manager.setup_deal_code_display(info_frame, deal_code)
+
+        if _log.info_on: _log.info(f"Dealing cards onto the {config.ROWS}x{config.COLUMNS} grid...")
+        session.deal(grid_deal)
+        if _log.info_on: _log.info(f"- Placed {len(grid_deal)} cards.")
+        if log_path: session.open_log(log_path) # Starts this game in the log
     # Update player info display
     info_text_var.set(f"{player_id_text}\nPosition: {player.position}\nTurn: 1 | Actions: 2") # Example update
 
-    # 9. Prepare Deck (adjust according to rules PDF snapshot)
-    print("Preparing deck for the Dungeon...")
-    full_deck = create_shuffled_deck() # Standard 52 cards
-    # --- Rulebook Setup ---
-    # 1. Separate Jacks, one Joker. Shuffle rest.
-    jacks = [card for card in full_deck if card.get_rank() == 11]
-    other_cards = [card for card in full_deck if card.get_rank() != 11]
-
-    # Define the specific black 10 (e.g., 10 of Clubs)
-    # black_10_card = Card(suit="clubs", rank=10, rank_string="ten") # Assuming Clubs is black
-    black_joker_card = Card(config.BLACK_JOKER_SUIT, config.BLACK_JOKER_RANK, config.BLACK_JOKER_RANK_STR)
-    red_joker_card = Card(config.RED_JOKER_SUIT, config.RED_JOKER_RANK, config.RED_JOKER_RANK_STR)
-
-    # Remove the specific black 10 and one Joker (assume black joker for now) from 'other_cards'
-    cards_for_shuffle = []
-    black_10_removed = False
-    black_joker_removed = False
-    for card in other_cards:
-         is_black_10 = card.get_suit() in ["clubs", "spades"] and card.get_rank() == 10
-         # Use a more robust Joker check if suits/ranks vary
-         is_black_joker = card.get_suit() == config.BLACK_JOKER_SUIT and card.get_rank() == config.BLACK_JOKER_RANK
-
-         if is_black_10 and not black_10_removed:
-              print(f"- Separated Black 10: {card}")
-              black_10_separated = card # Keep ref if needed by rules later
-              black_10_removed = True
-         elif is_black_joker and not black_joker_removed:
-              print(f"- Separated Black Joker: {card}")
-              black_joker_separated = card
-              black_joker_removed = True
-         else:
-              cards_for_shuffle.append(card)
-
-    # Check if separation was successful (depends on Joker representation in deck)
-    if not black_10_removed: print("Warning: Black 10 specified in rules was not found in the initial deck.")
-    if not black_joker_removed: print("Warning: Black Joker specified in rules was not found in the initial deck.")
-
-
-    # Shuffle the remaining cards
-    random.shuffle(cards_for_shuffle)
-    print(f"- Shuffled {len(cards_for_shuffle)} cards for the grid.")
-
-    deck_for_grid = cards_for_shuffle # Use the shuffled cards
-
-    # Rule 2 & 3: Place Red Joker face-up, Black 10 face-up on top. Arrange rest face down.
-    # *Code currently places Red Joker middle face DOWN, adds Black Joker to shuffle pool.*
-    # *Let's stick to the code's current logic for now as per user request (Red middle, Black shuffled)*
-    # Add Black Joker back to the pool to be shuffled in
-    deck_for_grid.append(black_joker_card)
-    random.shuffle(deck_for_grid) # Shuffle again with black joker
-    print(f"- Added Black Joker and re-shuffled grid deck ({len(deck_for_grid)} cards).")
-    print(f"- Red Joker ({red_joker_card}) kept separate for center placement.")
-
-    # Verify deck size
-    expected_grid_deck_size = (config.ROWS * config.COLUMNS) - 1 # Grid size minus center
-    if len(deck_for_grid) != expected_grid_deck_size:
-        print(f"FATAL ERROR: Deck size for grid ({len(deck_for_grid)}) doesn't match expected ({expected_grid_deck_size}). Check setup logic.")
-        print(f"Deck Content: {deck_for_grid}") # Debugging
-        # sys.exit(1) # Or just print warning for testing
-
-    # 10. Deal Cards
-    print(f"Dealing cards onto the {config.ROWS}x{config.COLUMNS} grid...")
-    center_r, center_c = config.ROWS // 2, config.COLUMNS // 2
-    card_index = 0
-    for r in range(config.ROWS):
-        for c in range(config.COLUMNS):
-            if r == center_r and c == center_c:
-                # Place Red Joker in the center, face down (as per current code)
-                card_data_grid[r][c] = red_joker_card
-                card_state_grid[r][c] = config.STATE_FACE_DOWN
-            else:
-                # Deal from the shuffled deck
-                if card_index < len(deck_for_grid):
-                    card_data_grid[r][c] = deck_for_grid[card_index]
-                    card_state_grid[r][c] = config.STATE_FACE_DOWN
-                    card_index += 1
-                else:
-                    # Should not happen if deck size is correct
-                    print(f"Warning: Ran out of cards for grid at ({r},{c}). Leaving empty.")
-                    card_state_grid[r][c] = config.STATE_ACTION_TAKEN # Mark as empty/done
-
-    total_dealt = card_index + 1 # +1 for the center card
-    expected_total = config.ROWS * config.COLUMNS
-    print(f"- Placed {total_dealt} cards.")
-    if total_dealt != expected_total:
-        print(f"- Warning: Expected {expected_total} cards on grid.")
-
-    # 11. Create Grid Buttons
-    print("Creating button grid...")
+    # 6. Create Grid Buttons
+    if _log.info_on: _log.info("Creating button grid...")
     button_bg = grid_frame.cget('bg')
+    queue_border = config.INPUT_QUEUE_BORDER if config.INPUT_QUEUE_DEPTH > 0 else 0 # Ring for queued clicks (input_queue)
+    viewport = None
+    if config.VIEWPORT_ENABLED: # Canvas cells instead of one Button widget per card
+        viewport = board_viewport.BoardViewport(grid_frame, config.ROWS, config.COLUMNS, scaled_width, scaled_height, assets, bg=button_bg)
+        viewport.grid(row=0, column=0, sticky="nsew")
     buttons_created = 0
     for r in range(config.ROWS):
         for c in range(config.COLUMNS):
             card = card_data_grid[r][c]
             current_state = card_state_grid[r][c]
 
-            if card is not None and current_state == config.STATE_FACE_DOWN:
+            if card is not None: # Face down after a deal; any state when resuming
                 # --- Pass necessary UI frames and grids to click handler ---
                 click_command = lambda row=r, col=c: game_logic.handle_card_click(
                     row, col,
-                    root, player,
+                    root, player, session,
                     card_data_grid, button_grid, card_state_grid,
                     hand_card_data, hand_card_slots,
                     assets, # Pass the full assets dict
@@ -277,25 +222,90 @@ def main():
                     info_frame_bg # Pass bg color for consistency
                 )
                 # ---------------------------------------------------------
-                button = tk.Button(grid_frame, image=tk_photo_back, command=click_command,
-                                   borderwidth=0, highlightthickness=0, relief=tk.FLAT,
-                                   bg=button_bg, activebackground=button_bg, state=tk.NORMAL)
-                button.image = tk_photo_back # Keep reference
+                image = tk_photo_back
+                if current_state != config.STATE_FACE_DOWN:
+                    image = assets["tk_faces"].get(f"{str(card.get_suit()).lower()}_{str(card.get_rank_string()).lower()}") or ''
+                button_state = tk.DISABLED if current_state == config.STATE_ACTION_TAKEN else tk.NORMAL
+                if viewport:
+                    button = viewport.cell(r, c, image=image, command=click_command, state=button_state)
+                else:
+                    button = tk.Button(grid_frame, image=image, command=click_command,
+                                       borderwidth=0, highlightthickness=queue_border, highlightbackground=button_bg,
+                                       highlightcolor=button_bg, relief=tk.FLAT, bg=button_bg, activebackground=button_bg,
+                                       state=button_state)
+                button.image = image # Keep reference
                 button.grid(row=r, column=c, padx=1, pady=1)
                 button_grid[r][c] = button
                 buttons_created += 1
-            else:
+            elif not viewport:
                 # Create placeholder for empty/non-clickable slots (like center initially if face up)
                 placeholder = tk.Frame(grid_frame, width=scaled_width, height=scaled_height, bg=grid_frame.cget('bg'))
                 placeholder.grid(row=r, column=c, padx=1, pady=1)
                 button_grid[r][c] = None # No button for this slot
 
-    print(f"- Created {buttons_created} buttons.")
+    if _log.info_on: _log.info(f"- Created {buttons_created} buttons.")
+    if saved: hand_manager.sync_hand_display(hand_card_data, hand_card_slots, assets["tk_faces"], info_frame_bg)
+
+    # 7. Undo / redo (checkpoints are reported by the game logic through the session)
+    session.undo = undo_manager.UndoManager(session, hand_card_slots, assets, info_frame_bg)
+    if bind_keys: session.undo.bind_keys(root)
+    # Clicks during flips, dice rolls and fights are queued and replayed once the game is idle
+    session.inputs = input_queue.InputQueue(root, button_grid,
+                                            lambda: session.animations.is_running() or session.combat.current_view is not None,
+                                            button_bg)
+    # A click in this board skips its animations (Esc too, for a single game per window); a grid click is also queued
+    session.animations.bind_skip(root, (grid_frame, info_frame), escape=bind_keys)
+
+    # Cards follow the window size (images rescaled in the background, swapped when ready)
+    if worker_service is not None and config.LIVE_RESIZE_ENABLED and not viewport:
+        board_scaler.BoardScaler(root, worker_service, assets, session, grid_frame, info_frame, hand_frame, hand_card_slots)
+
+    # Flip frames of the cards next to the Jack are built in idle time, after every move
+    session.flip_prefetch = animation.FlipPrefetcher(root, assets, session.animations)
+    session.prefetch_flips()
+
+    # Card counting + hazard odds overlay on the face-down cards
+    overlay = card_tracker.HeatmapOverlay(session.tracker, button_grid, config.HAZARD_OVERLAY_ENABLED)
+    overlay_toggle = ui_manager.setup_hazard_overlay_toggle(info_frame, overlay)
+    overlay.refresh()
+    if bind_keys: root.bind_all("<Control-h>", overlay_toggle, add="+")
+
+    # End of game: checked after every event; the summary waits until the current move is done
+    status = session.status
+    status.listeners.append(lambda outcome: root.after_idle(
+        lambda: ui_manager.show_game_summary(root, game_status.OUTCOME_TEXT[outcome], status.summary())))
+    if save_path:
+        session.open_autosave(save_path)
+        session.autosave(session.undo.history.current) # A new game replaces the previous save
+    return session
 
-    # 12. Start Main Loop
-    print("Starting Tkinter main loop...")
+
+# --- Main Application Setup ---
+def main():
+    # Create Main Window
+    root = ui_manager.create_main_window()
+    # Background jobs (results are delivered on the Tk thread by a single poller)
+    worker_service = workers.WorkerService(root)
+    assets = load_assets(root)
+    flight_recorder.install_hooks(root) # Dump recent events on errors / F12
+
+    # Resume the saved game (python main.py --resume), or play a shared / daily-challenge deal (--deal CODE)
+    saved = savegame.load_autosave() if "--resume" in sys.argv[1:] else None
+    grid_deal = None
+    if not saved and "--deal" in sys.argv[1:-1]:
+        try: grid_deal = deal_codes.decode_deal(sys.argv[sys.argv.index("--deal") + 1])
+        except ValueError as e: _log.warning(f"Ignoring deal code: {e}")
+    session = create_game(root, root, assets, grid_deal, saved,
+                          log_path=config.GAME_LOG_FILE if config.GAME_LOG_ENABLED else None,
+                          save_path=config.SAVE_FILE if config.AUTOSAVE_ENABLED else None,
+                          worker_service=worker_service)
+
+    # Start Main Loop
+    if _log.info_on: _log.info("Starting Tkinter main loop...")
     root.mainloop()
-    print("Window closed.")
+    worker_service.shutdown()
+    session.close() # Flushes queued log events and the last pending autosave
+    if _log.info_on: _log.info("Window closed.")
 
 # --- Run ---
 if __name__ == "__main__":
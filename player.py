@@ -1,6 +1,9 @@
 # --- START OF FILE player.py ---
 
 import config
+import log
+
+_log = log.get_logger("game")
 
 class Player:
     """ Represents the player character in the game. """
@@ -8,7 +11,7 @@ class Player:
     def __init__(self, start_row, start_col):
         """ Initializes the player at a starting position. """
         if not (0 <= start_row < config.ROWS and 0 <= start_col < config.COLUMNS):
-            print(f"Warning: Invalid start position ({start_row}, {start_col}). Defaulting to center.")
+            _log.warning(f"Invalid start position ({start_row}, {start_col}). Defaulting to center.")
             self._row = config.ROWS // 2
             self._col = config.COLUMNS // 2
         else:
@@ -18,7 +21,7 @@ class Player:
         self.suit = None # Player's associated suit (e.g., "spades") - set in main.py
         self._skip_next_turn = False # Flag for King loss effect
 
-        print(f"Player initialized at position ({self._row}, {self._col})")
+        if _log.debug_on: _log.debug(f"Player initialized at position ({self._row}, {self._col})")
 
     @property
     def position(self):
@@ -28,10 +31,10 @@ class Player:
         if 0 <= row < config.ROWS and 0 <= col < config.COLUMNS:
             self._row = row
             self._col = col
-            print(f"Player moved to ({self._row}, {self._col})")
+            if _log.debug_on: _log.debug(f"Player moved to ({self._row}, {self._col})")
             # TODO: Trigger visual update of player on grid
         else:
-            print(f"Error: Attempted to move player to invalid position ({row}, {col})")
+            _log.error(f"Attempted to move player to invalid position ({row}, {col})")
 
     def move(self, d_row, d_col, card_data_grid): # Pass card_data_grid for collision checks
         """ Attempts to move the player by delta row/col. """
@@ -40,7 +43,7 @@ class Player:
 
         # Check bounds
         if not (0 <= new_row < config.ROWS and 0 <= new_col < config.COLUMNS):
-             print("Move blocked: Out of bounds.")
+             if _log.debug_on: _log.debug("Move blocked: Out of bounds.")
              return False
 
         # Check collision (basic: can't move into an unrevealed/uncleared card space)
@@ -67,7 +70,7 @@ class Player:
         """Sets or clears the skip turn flag."""
         self._skip_next_turn = bool(skip)
         if self._skip_next_turn:
-            print("Player flag set: Skip next turn.")
+            if _log.debug_on: _log.debug("Player flag set: Skip next turn.")
 
     def should_skip_turn(self):
         """Checks if the player should skip their upcoming turn."""
@@ -80,7 +83,7 @@ class Player:
 
     # --- Placeholder ---
     def perform_action_on_card(self, card, row, col, game_state_components):
-         print(f"Player interacting with {card} at ({row},{col})... (Logic TBD)")
+         if _log.debug_on: _log.debug(f"Player interacting with {card} at ({row},{col})... (Logic TBD)")
          pass
 
 # --- END OF FILE player.py ---
\ No newline at end of file
@@ -0,0 +1,368 @@
+# --- START OF FILE record_store.py ---
+
+import ast
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import config
+import utils
+import bot
+import game_record
+from card_logic import card_from_uid
+from combat import logic as combat_logic
+from game_events import EV_DEAL, EV_COMBAT_START, EV_VALUE_CARD, EV_DICE, EV_OUTCOME
+import log
+
+_log = log.get_logger("record")
+
+# Columnar store of per-game and per-combat records for analytics. A store is a directory
+# with one sub-directory per table and one .npy file per column (fixed-width dtype, one
+# value per record). Readers memory-map the columns, so a query only touches the columns
+# it filters or aggregates, at NumPy speed. Writers append in place: every column file
+# starts with a fixed-size .npy header that is rewritten with the new length on close.
+#
+#     python record_store.py build DIR GAMES [WORKERS]   add GAMES reference-bot games
+#     python record_store.py ingest DIR [LOG]            add the games of a game log
+#     python record_store.py query DIR                   print a few standard queries
+#
+#     combats = RecordStore(path).table("combats")
+#     combats.select(defender_rank=13, used_card=USED_NONE).mean("won")   # vs hostile Kings, no card
+#     combats.group_by("defender_value", fights=("won", "count"), win_rate=("won", "mean"))
+
+# --- Schema ---
+SOURCE_BOT = 0 # Reference bot (bot.py)
+SOURCE_LOG = 1 # Recorded live game (game_record log)
+
+USED_NONE = 0      # No value card
+USED_EQUIPMENT = 1 # Red number 2-10
+USED_QUEEN = 2     # Friendly Queen
+USED_KING = 3      # Friendly King
+
+SCHEMA = {
+    "games": {
+        "game_id": np.uint32, "source": np.uint8, "won": np.uint8,
+        "turns": np.uint16, # Reference bot turns (0 for live games: turns are not tracked there)
+        "fights": np.uint16, "fights_lost": np.uint16,
+    },
+    "combats": {
+        "game_id": np.uint32, "defender_value": np.uint8, "defender_rank": np.uint8,
+        "attacker_value": np.uint8, "used_card": np.uint8, "num_diff_dice": np.uint8,
+        "auto_win": np.uint8, "won": np.uint8, "danger_roll": np.uint8, # danger_roll 0 = no dice rolled
+    },
+}
+
+_HEADER_SIZE = 128 # Fixed .npy header size, so the length can be rewritten in place
+
+def _npy_header(dtype, length):
+    """A version 1.0 .npy header for a 1-D array, space-padded to _HEADER_SIZE bytes."""
+    header = repr({"descr": np.dtype(dtype).str, "fortran_order": False, "shape": (length,)})
+    header = header.ljust(_HEADER_SIZE - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + (len(header)).to_bytes(2, "little") + header.encode("latin1")
+
+def _npy_length(f):
+    """Number of records of a column file written by StoreWriter (file positioned anywhere)."""
+    f.seek(10)
+    header = f.read(_HEADER_SIZE - 10).decode("latin1")
+    return ast.literal_eval(header.strip())["shape"][0]
+
+
+# --- Writing ---
+class StoreWriter:
+    """
+    Appends records to a store, creating it if needed. Rows are buffered per column and
+    flushed in chunks; close() (or leaving a with block) updates the column headers.
+    """
+    def __init__(self, path, flush_rows=65536):
+        self.path = path
+        self.flush_rows = flush_rows
+        self._files = {}
+        self._buffers = {}
+        self._lengths = {}
+        for table, columns in SCHEMA.items():
+            os.makedirs(os.path.join(path, table), exist_ok=True)
+            lengths = set()
+            for column, dtype in columns.items():
+                file_path = os.path.join(path, table, column + ".npy")
+                if os.path.exists(file_path):
+                    f = open(file_path, "r+b")
+                    length = _npy_length(f)
+                    f.seek(_HEADER_SIZE + length * np.dtype(dtype).itemsize)
+                    f.truncate() # Drops records of a writer that was never closed
+                    lengths.add(length)
+                else:
+                    f = open(file_path, "w+b")
+                    f.write(_npy_header(dtype, 0))
+                    lengths.add(0)
+                self._files[table, column] = f
+                self._buffers[table, column] = []
+            if len(lengths) != 1: raise ValueError(f"Table '{table}' in {path} has columns of different lengths.")
+            self._lengths[table] = lengths.pop()
+        self._pending = dict.fromkeys(SCHEMA, 0)
+        self.next_game_id = self._lengths["games"] + self._pending["games"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, table, **values):
+        """Adds one record; every column of the table must be given."""
+        for column in SCHEMA[table]:
+            self._buffers[table, column].append(values[column])
+        self._pending[table] += 1
+        if self._pending[table] >= self.flush_rows: self._flush(table)
+
+    def append_columns(self, table, columns):
+        """Adds many records at once from a dict of equal-length sequences (e.g. a worker's results)."""
+        self._flush(table)
+        count = None
+        for column, dtype in SCHEMA[table].items():
+            data = np.asarray(columns[column], dtype=dtype)
+            if count is None: count = len(data)
+            elif len(data) != count: raise ValueError(f"Column '{column}' has {len(data)} values, expected {count}.")
+            self._files[table, column].write(data.tobytes())
+        self._lengths[table] += count or 0
+
+    def new_game_id(self):
+        game_id = self.next_game_id
+        self.next_game_id += 1
+        return game_id
+
+    def _flush(self, table):
+        count = self._pending[table]
+        if not count: return
+        for column, dtype in SCHEMA[table].items():
+            buffer = self._buffers[table, column]
+            self._files[table, column].write(np.asarray(buffer, dtype=dtype).tobytes())
+            buffer.clear()
+        self._lengths[table] += count
+        self._pending[table] = 0
+
+    def close(self):
+        for table, columns in SCHEMA.items():
+            self._flush(table)
+            for column, dtype in columns.items():
+                f = self._files[table, column]
+                f.seek(0)
+                f.write(_npy_header(dtype, self._lengths[table]))
+                f.close()
+        self._files.clear()
+
+
+class RecordCollector:
+    """
+    Turns a game's event stream into combat records (as an engine on_event handler, or fed
+    recorded log events). Call begin_game() before the deal and end_game() after the game.
+    """
+    def __init__(self, writer, source):
+        self.writer = writer
+        self.source = source
+        self.game_id = None
+        self._grid = ()
+        self._fight = None
+
+    def begin_game(self, grid_cards=None):
+        self.game_id = self.writer.new_game_id()
+        self._grid = grid_cards or ()
+        self.fights = self.fights_lost = 0
+
+    def __call__(self, kind, *payload):
+        if kind == EV_DEAL:
+            self._grid = [card_from_uid(uid - 1) if uid else None for uid in payload]
+        elif kind == EV_COMBAT_START:
+            defender = self._grid[payload[0]]
+            self._fight = {"defender_value": combat_logic.get_card_combat_value(defender),
+                           "defender_rank": defender.get_rank(), "danger_roll": 0}
+        elif kind == EV_VALUE_CARD and self._fight is not None:
+            card = card_from_uid(payload[0] - 1) if payload[0] else None
+            self._fight["attacker_value"] = combat_logic.get_card_combat_value(card)
+            self._fight["used_card"] = (USED_NONE if card is None else USED_QUEEN if card.get_rank() == 12
+                                        else USED_KING if card.get_rank() == 13 else USED_EQUIPMENT)
+            self._fight["num_diff_dice"] = combat_logic.get_num_diff_dice(self._fight["attacker_value"], self._fight["defender_value"])
+        elif kind == EV_DICE and self._fight is not None:
+            self._fight["danger_roll"] = payload[-1]
+        elif kind == EV_OUTCOME and self._fight is not None:
+            fight, self._fight = self._fight, None
+            self.fights += 1
+            self.fights_lost += not payload[0]
+            self.writer.append("combats", game_id=self.game_id, won=payload[0], auto_win=payload[1], **fight)
+
+    def end_game(self, won, turns=0):
+        self.writer.append("games", game_id=self.game_id, source=self.source, won=int(won), turns=turns,
+                           fights=self.fights, fights_lost=self.fights_lost)
+
+
+class _ColumnBuffer:
+    """Stands in for a StoreWriter inside worker processes: collects plain column lists."""
+    def __init__(self, first_game_id=0):
+        self.columns = {table: {column: [] for column in columns} for table, columns in SCHEMA.items()}
+        self.next_game_id = first_game_id
+
+    def new_game_id(self):
+        game_id = self.next_game_id
+        self.next_game_id += 1
+        return game_id
+
+    def append(self, table, **values):
+        for column, column_values in self.columns[table].items():
+            column_values.append(values[column])
+
+def simulate_records(num_games, seed):
+    """Plays num_games reference-bot games. Returns {table: {column: list}} with game ids from 0."""
+    from difficulty import candidate_deals
+    buffer = _ColumnBuffer()
+    collector = RecordCollector(buffer, SOURCE_BOT)
+    dice_rng = utils.DiceRng(seed)
+    deals = candidate_deals(seed)
+    for _ in range(num_games):
+        grid_cards = next(deals)
+        collector.begin_game(grid_cards)
+        result = bot.play_game(grid_cards, dice_rng, on_event=collector)
+        collector.end_game(result.won, result.turns)
+    return buffer.columns
+
+def build_from_simulation(path, num_games, max_workers=None, chunk_size=500, seed=0):
+    """Adds num_games reference-bot games to the store at path, simulated in a process pool."""
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = [(min(chunk_size, num_games - start), seed + index) for index, start in enumerate(range(0, num_games, chunk_size))]
+    with StoreWriter(path) as writer, ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for columns in pool.map(simulate_records, *zip(*chunks)):
+            offset = writer.next_game_id # Worker game ids start at 0
+            for table in SCHEMA:
+                columns[table]["game_id"] = np.asarray(columns[table]["game_id"], dtype=np.uint32) + offset
+                writer.append_columns(table, columns[table])
+            writer.next_game_id += len(columns["games"]["game_id"])
+
+def ingest_game_log(path, log_path=None):
+    """Adds every game of a game log to the store at path. Returns the number of games added."""
+    added = 0
+    with StoreWriter(path) as writer:
+        collector = RecordCollector(writer, SOURCE_LOG)
+        for events in game_record.read_games(log_path or config.GAME_LOG_FILE):
+            collector.begin_game()
+            for kind, payload in events: collector(kind, *payload)
+            try: won = bot.jokers_in_hand(game_record.replay_game(events)) == 2
+            except game_record.ReplayMismatch as e:
+                _log.warning(f"Game {added + 1} does not replay ({e}); stored as not won.")
+                won = False
+            collector.end_game(won)
+            added += 1
+    return added
+
+
+# --- Reading ---
+class Table:
+    """A set of equal-length columns (memory-mapped, or the result of a select())."""
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def select(self, **filters):
+        """
+        Records matching every filter: column=value, column=[values...] (any of them),
+        or column=function(array) -> boolean array.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, condition in filters.items():
+            values = self.columns[column]
+            if callable(condition): mask &= condition(values)
+            elif isinstance(condition, (list, tuple, set, frozenset)): mask &= np.isin(values, list(condition))
+            else: mask &= values == condition
+        return Table({column: values[mask] for column, values in self.columns.items()})
+
+    def count(self):
+        return len(self)
+
+    def mean(self, column):
+        values = self.columns[column]
+        return float(values.mean()) if len(values) else float("nan")
+
+    def group_by(self, key, **aggregates):
+        """
+        Aggregates per distinct value of key. aggregates: name=(column, "count" | "sum" | "mean" | "min" | "max").
+        Returns {key value: {name: result}}, sorted by key.
+        """
+        keys, inverse = np.unique(self.columns[key], return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(keys))
+        results = {}
+        for name, (column, how) in aggregates.items():
+            values = self.columns[column]
+            if how == "count": results[name] = counts
+            elif how in ("sum", "mean"):
+                sums = np.bincount(inverse, weights=values, minlength=len(keys))
+                results[name] = sums if how == "sum" else sums / np.maximum(counts, 1)
+            elif how in ("min", "max"):
+                out = np.full(len(keys), values.max() if how == "min" else values.min(), dtype=values.dtype)
+                (np.minimum if how == "min" else np.maximum).at(out, inverse, values)
+                results[name] = out
+            else: raise ValueError(f"Unknown aggregate '{how}' (use count, sum, mean, min or max).")
+        return {key_value.item(): {name: result[i].item() for name, result in results.items()}
+                for i, key_value in enumerate(keys)}
+
+
+class RecordStore:
+    """Read access to a store directory; tables are memory-mapped on first use."""
+    def __init__(self, path):
+        self.path = path
+        self._tables = {}
+
+    def table(self, name):
+        if name not in self._tables:
+            columns = {}
+            for column in SCHEMA[name]:
+                file_path = os.path.join(self.path, name, column + ".npy")
+                columns[column] = np.load(file_path, mmap_mode="r") if os.path.getsize(file_path) > _HEADER_SIZE \
+                    else np.zeros(0, dtype=SCHEMA[name][column])
+            self._tables[name] = Table(columns)
+        return self._tables[name]
+
+    @property
+    def games(self):
+        return self.table("games")
+
+    @property
+    def combats(self):
+        return self.table("combats")
+
+
+# --- Command Line ---
+def print_standard_queries(store):
+    combats, games = store.combats, store.games
+    print(f"{len(games)} games, {len(combats)} fights")
+    if not len(combats): return
+    vs_kings = combats.select(defender_rank=13, used_card=USED_NONE)
+    print(f"Win rate vs hostile Kings with no value card: {vs_kings.mean('won'):.1%} ({len(vs_kings)} fights)")
+    print("Win rate by defender value:")
+    for value, row in combats.group_by("defender_value", fights=("won", "count"), win_rate=("won", "mean")).items():
+        print(f"  {value:>2}: {row['win_rate']:6.1%} ({row['fights']} fights)")
+    print("Win rate by value card type:")
+    names = {USED_NONE: "none", USED_EQUIPMENT: "equipment", USED_QUEEN: "queen", USED_KING: "king"}
+    for used, row in combats.group_by("used_card", fights=("won", "count"), win_rate=("won", "mean")).items():
+        print(f"  {names.get(used, used):>9}: {row['win_rate']:6.1%} ({row['fights']} fights)")
+
+def main(argv):
+    if len(argv) >= 3 and argv[0] == "build":
+        start = time.perf_counter()
+        build_from_simulation(argv[1], int(argv[2]), int(argv[3]) if len(argv) > 3 else None)
+        print(f"Added {argv[2]} games in {time.perf_counter() - start:.1f} s.")
+    elif len(argv) >= 2 and argv[0] == "ingest":
+        print(f"Added {ingest_game_log(argv[1], argv[2] if len(argv) > 2 else None)} games.")
+    elif len(argv) == 2 and argv[0] == "query":
+        start = time.perf_counter()
+        print_standard_queries(RecordStore(argv[1]))
+        print(f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+    else:
+        print("Usage: python record_store.py build DIR GAMES [WORKERS] | ingest DIR [LOG] | query DIR")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+
+# --- END OF FILE record_store.py ---
@@ -0,0 +1,301 @@
+# --- START OF FILE replay.py ---
+
+# Replay viewer for recorded games. Run from the project folder:
+#   python replay.py [log file] [game number]
+# (defaults: config.GAME_LOG_FILE, the last game in it; game numbers start at 1)
+
+import sys
+import tkinter as tk
+import config
+import animation
+import ui_manager
+import game_record
+from card_logic import card_from_uid
+from game_engine import GameEngine
+from game_events import (EV_DEAL, EV_REVEAL, EV_ACTION, EV_VALUE_CARD, EV_CANCEL, EV_DICE, EV_UNDO, EV_REDO,
+                         INPUT_EVENTS, position_of)
+from combat.ui_roll import CombatRollView
+import log
+
+_log = log.get_logger("replay")
+
+
+class ReplayTimeline:
+    """
+    The input events (moves) of one recorded game plus keyframes: a full engine snapshot
+    every keyframe_interval moves. state_at() restores the nearest keyframe and replays at
+    most keyframe_interval - 1 moves, so seeking costs O(K) instead of O(game length).
+    Position p means "after the first p moves" (move 0 is the deal).
+    """
+    def __init__(self, events, keyframe_interval=config.REPLAY_KEYFRAME_INTERVAL, player_suit=config.PLAYER_SUIT):
+        self.player_suit = player_suit
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.moves = [(kind, payload) for kind, payload in events if kind in INPUT_EVENTS]
+        self.num_moves = len(self.moves)
+        self.keyframes = [] # keyframes[i] = snapshot at position i * keyframe_interval
+        engine = GameEngine(player_suit)
+        for index, (kind, payload) in enumerate(self.moves):
+            if index % self.keyframe_interval == 0: self.keyframes.append(engine.snapshot())
+            game_record.apply_input_event(engine, kind, payload)
+        if self.num_moves % self.keyframe_interval == 0: self.keyframes.append(engine.snapshot())
+
+    def state_at(self, position):
+        """Returns a new GameEngine in the state after the first position moves."""
+        position = max(0, min(position, self.num_moves))
+        keyframe_index = position // self.keyframe_interval
+        engine = GameEngine(self.player_suit)
+        engine.restore(self.keyframes[keyframe_index])
+        for kind, payload in self.moves[keyframe_index * self.keyframe_interval:position]:
+            game_record.apply_input_event(engine, kind, payload)
+        return engine
+
+
+def describe_move(kind, payload):
+    """Short text for the replay panel."""
+    if kind == EV_DEAL: return "Cards dealt"
+    if kind == EV_REVEAL: return f"Revealed card at {position_of(payload[0])}"
+    if kind == EV_ACTION: return f"Acted on card at {position_of(payload[0])}"
+    if kind == EV_VALUE_CARD: return f"Fights with {card_from_uid(payload[0] - 1) if payload[0] else 'no card'}"
+    if kind == EV_CANCEL: return "Fight cancelled"
+    if kind == EV_DICE: return f"Rolled {list(payload[:-1])} vs danger die {payload[-1]}"
+    if kind == EV_UNDO: return "Undo"
+    if kind == EV_REDO: return "Redo"
+    return game_record.describe_event(kind, payload)
+
+
+class ReplayViewer:
+    """
+    Shows a ReplayTimeline on a card grid with a hand display, playback controls and a
+    scrubber. Moves use the normal flip and dice animations at the current animation
+    speed ("Instant" steps without animating). Only cells and hand slots that differ
+    from what is on screen are redrawn.
+    """
+    def __init__(self, root, timeline, assets):
+        self.root = root
+        self.timeline = timeline
+        self.assets = assets
+        self.engine = None
+        self.position = 0
+        self.playing = False
+        self._busy = False # A move is animating
+        self._generation = 0 # Bumped on every seek; stale animation callbacks compare against it
+        self._after_id = None
+        self._roll_view = None
+        self.animations = animation.AnimationContext() # Speed and running flip / dice animation
+
+        width, height = assets["width"], assets["height"]
+        grid_frame, info_frame = ui_manager.setup_layout(root, width, height)
+        bg = info_frame.cget('bg')
+        self._grid_bg = grid_frame.cget('bg')
+        self._blank = tk.PhotoImage(width=width, height=height, master=root) # Keeps empty cells card-sized
+
+        # --- Info Panel ---
+        tk.Label(info_frame, text="Replay", font=("Arial", 24, "bold"), fg="white", bg=bg).pack(pady=10, anchor='n')
+        self.move_text = tk.StringVar()
+        tk.Label(info_frame, textvariable=self.move_text, justify=tk.LEFT, font=("Arial", 12), fg="light grey",
+                 bg=bg, wraplength=config.INFO_PANEL_WIDTH - 40).pack(pady=10, anchor='n', fill='x')
+
+        controls = tk.Frame(info_frame, bg=bg)
+        controls.pack(anchor='n', pady=5)
+        tk.Button(controls, text="|<", width=3, command=lambda: self.seek(0)).pack(side=tk.LEFT, padx=2)
+        tk.Button(controls, text="<", width=3, command=self.step_back).pack(side=tk.LEFT, padx=2)
+        self.play_button = tk.Button(controls, text="Play", width=6, command=self.toggle_play)
+        self.play_button.pack(side=tk.LEFT, padx=2)
+        tk.Button(controls, text=">", width=3, command=self.step).pack(side=tk.LEFT, padx=2)
+        tk.Button(controls, text=">|", width=3, command=lambda: self.seek(self.timeline.num_moves)).pack(side=tk.LEFT, padx=2)
+        self.scrubber = tk.Scale(info_frame, from_=0, to=timeline.num_moves, orient=tk.HORIZONTAL, showvalue=False,
+                                 length=config.INFO_PANEL_WIDTH - 60, command=self._on_scrub,
+                                 bg=bg, highlightthickness=0, troughcolor="grey30")
+        self.scrubber.pack(anchor='n', pady=5)
+        ui_manager.setup_animation_speed_control(info_frame, self.animations.set_speed)
+        self.hand_frame, self.hand_slots = ui_manager.setup_hand_display(info_frame, width, height)
+        self.combat_frame = tk.Frame(info_frame, bg=bg)
+        self.combat_frame.pack(fill='x')
+
+        # --- Card Grid (labels, nothing is clickable) ---
+        self.cells = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)]
+        for r in range(config.ROWS):
+            for c in range(config.COLUMNS):
+                cell = tk.Label(grid_frame, image=self._blank, bg=self._grid_bg, borderwidth=0,
+                                highlightthickness=2, highlightbackground=self._grid_bg)
+                cell.grid(row=r, column=c, padx=1, pady=1)
+                self.cells[r][c] = cell
+        self._shown_cells = [[None for _ in range(config.COLUMNS)] for _ in range(config.ROWS)] # (card, state) on screen
+        self._shown_hand = [[None for _ in range(config.HAND_COLS)] for _ in range(config.HAND_ROWS)]
+        self._shown_player = None
+
+        root.bind("<Left>", lambda e: self.step_back())
+        root.bind("<Right>", lambda e: self.step())
+        root.bind("<space>", lambda e: self.toggle_play())
+        self.animations.bind_skip(root, (grid_frame, info_frame)) # Click or Esc skips the move animation
+        self.seek(1 if timeline.num_moves else 0) # Start on the dealt board
+
+    # --- Navigation ---
+    def seek(self, position):
+        """Jumps to a position (restores the nearest keyframe, then replays < K moves)."""
+        self.pause()
+        self._generation += 1
+        self._stop_move_animation()
+        self.position = max(0, min(position, self.timeline.num_moves))
+        self.engine = self.timeline.state_at(self.position)
+        self._render()
+
+    def step_back(self):
+        self.seek(self.position - 1)
+
+    def step(self):
+        """Plays the next move (a running move animation is finished first)."""
+        self.pause()
+        if self._busy: self.animations.skip_all()
+        else: self._start_move()
+
+    def toggle_play(self):
+        if self.playing: self.pause()
+        else: self.play()
+
+    def play(self):
+        if self.position >= self.timeline.num_moves: return
+        self.playing = True
+        self.play_button.config(text="Pause")
+        if not self._busy: self._schedule_next()
+
+    def pause(self):
+        self.playing = False
+        self.play_button.config(text="Play")
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule_next(self):
+        self._after_id = self.root.after(self.animations.scaled_delay(config.REPLAY_MOVE_DELAY), self._play_next)
+
+    def _play_next(self):
+        self._after_id = None
+        if not self.playing: return
+        if self.position >= self.timeline.num_moves:
+            self.pause()
+            return
+        self._start_move()
+
+    def _on_scrub(self, value):
+        position = int(float(value))
+        if position != self.position: self.seek(position)
+
+    # --- Moves ---
+    def _start_move(self):
+        """Applies the next move, through the flip or dice animation when there is one."""
+        if self.position >= self.timeline.num_moves: return
+        kind, payload = self.timeline.moves[self.position]
+        generation = self._generation
+        finish = lambda *ignored: self._finish_move(generation, kind, payload)
+        if not self.animations.is_instant():
+            if kind == EV_REVEAL:
+                r, c = position_of(payload[0])
+                self._busy = True
+                self._shown_cells[r][c] = None # Flip frames replace the image: always repaint afterwards
+                animation.animate_flip(self.root, self.cells[r][c], self.engine.card_data_grid[r][c], self.assets, finish, r, c, self.animations)
+                return
+            if kind == EV_DICE and self.engine.combat is not None:
+                self._busy = True
+                self._show_dice(payload, finish)
+                return
+        finish()
+
+    def _finish_move(self, generation, kind, payload):
+        if generation != self._generation: return # Seeked away while animating
+        self._busy = False
+        game_record.apply_input_event(self.engine, kind, payload)
+        self.position += 1
+        self._hide_dice()
+        self._render()
+        if self.playing: self._schedule_next()
+
+    def _show_dice(self, payload, on_done):
+        combat = self.engine.combat
+        target = self.engine.card_data_grid[combat["row"]][combat["col"]]
+        used_card = combat["used_card"]
+        if self._roll_view is None:
+            self._roll_view = CombatRollView(self.combat_frame, self.assets.get("pil_dice_scaled", {}), self.animations)
+        self._roll_view.configure(self.engine.player, target, (used_card, None, None) if used_card else None,
+                                  None, combat["params"], on_done,
+                                  preset_rolls={"diff_rolls": list(payload[:-1]), "danger_roll": payload[-1]})
+        self._roll_view.display()
+        self._roll_view.play_preset()
+
+    def _hide_dice(self):
+        if self._roll_view: self._roll_view.hide()
+
+    def _stop_move_animation(self):
+        """Ends a running move animation; its callback is ignored (stale generation)."""
+        if self._busy: self.animations.skip_all()
+        self._busy = False
+        self._hide_dice()
+
+    # --- Drawing ---
+    def _render(self):
+        """Redraws only the cells, hand slots and player marker that changed."""
+        engine = self.engine
+        tk_faces = self.assets.get("tk_faces", {})
+        for r in range(config.ROWS):
+            for c in range(config.COLUMNS):
+                card, state = engine.card_data_grid[r][c], engine.card_state_grid[r][c]
+                shown = self._shown_cells[r][c]
+                if shown is not None and shown[0] == card and shown[1] == state: continue
+                if card is None: image = self._blank
+                elif state == config.STATE_FACE_DOWN: image = self.assets["tk_photo_back"]
+                else: image = tk_faces.get(f"{str(card.get_suit()).lower()}_{str(card.get_rank_string()).lower()}", self._blank)
+                self.cells[r][c].config(image=image)
+                self.cells[r][c].image = image
+                self._shown_cells[r][c] = (card, state)
+
+        player_position = engine.player.position
+        if player_position != self._shown_player:
+            if self._shown_player: self.cells[self._shown_player[0]][self._shown_player[1]].config(highlightbackground=self._grid_bg)
+            self.cells[player_position[0]][player_position[1]].config(highlightbackground="gold")
+            self._shown_player = player_position
+
+        hand_bg = self.hand_frame.cget('bg')
+        for r, row in enumerate(engine.hand.snapshot()):
+            for c, card in enumerate(row):
+                if self._shown_hand[r][c] == card: continue
+                label = self.hand_slots[r][c]
+                image = tk_faces.get(f"{str(card.get_suit()).lower()}_{str(card.get_rank_string()).lower()}") if card else None
+                label.config(image=image or '', bg=hand_bg)
+                label.image = image
+                if image: label.lift()
+                self._shown_hand[r][c] = card
+
+        status = f"Move {self.position}/{self.timeline.num_moves}"
+        if self.position > 0: status += f": {describe_move(*self.timeline.moves[self.position - 1])}"
+        status += f"\nPlayer at {player_position} | Hand: {engine.hand.card_count()} cards"
+        if engine.combat is not None: status += f"\nFight pending vs {engine.card_data_grid[engine.combat['row']][engine.combat['col']]}"
+        if engine.player.should_skip_turn(): status += "\nSkips next turn"
+        self.move_text.set(status)
+        self.scrubber.set(self.position)
+
+
+def main(argv):
+    import assets_manager
+    from main import create_tk_images
+    log_path = argv[0] if argv else config.GAME_LOG_FILE
+    games = list(game_record.read_games(log_path))
+    if not games: exit(f"No games found in {log_path}.")
+    game_number = int(argv[1]) if len(argv) > 1 else len(games)
+    if not 1 <= game_number <= len(games): exit(f"Game {game_number} not found ({len(games)} games in {log_path}).")
+    events = games[game_number - 1]
+    try:
+        game_record.replay_game(events)
+    except game_record.ReplayMismatch as e:
+        _log.warning(f"Game {game_number} does not replay exactly: {e}")
+
+    root = ui_manager.create_main_window()
+    root.title(f"Joker's Labyrinth - Replay of game {game_number}")
+    pil_assets = assets_manager.load_pil_assets()
+    assets = {**pil_assets, **create_tk_images(root, pil_assets)}
+    ReplayViewer(root, ReplayTimeline(events), assets)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+
+# --- END OF FILE replay.py ---
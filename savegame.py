@@ -0,0 +1,185 @@
+# --- START OF FILE savegame.py ---
+
+import os
+import struct
+import threading
+import zlib
+import config
+import game_history
+from card_logic import card_from_uid, card_to_uid
+import log
+
+_log = log.get_logger("record")
+
+# Save files: one game state packed into under a hundred bytes.
+#     FILE_MAGIC, header (format version, grid and hand dimensions), dice RNG state (u64),
+#     bit-packed body, CRC32 of everything before it.
+# The body is a little-endian bit string of
+#     card uid + 1 per cell (7 bits, 0 = empty), card state per cell (2 bits),
+#     card uid + 1 per hand slot (7 bits), player cell (6 bits), skip-turn flag (1 bit).
+# The uid keeps the card's deck (card_logic.card_to_uid), so two-deck games resume with the
+# same physical cards.
+# Only settled states are saved (undo_manager checkpoints: no fight pending), so the
+# pending fight and the undo history are not part of a save.
+
+FILE_MAGIC = b"JLSAVE"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<BBBBBQ") # version, rows, columns, hand rows, hand cols, dice RNG state
+_CRC = struct.Struct("<I")
+CARD_BITS = 7  # Card uid + 1 < 128: two decks of 54
+STATE_BITS = 2 # STATE_FACE_DOWN / FACE_UP / ACTION_TAKEN
+CELL_BITS = 6  # Player cell < 64 (7x7 grid)
+
+
+class SaveGameError(ValueError):
+    """A save file that cannot be loaded (wrong format, other grid size, corrupted)."""
+
+
+# --- Codec ---
+def encode_save(snapshot, rng_state):
+    """Packs a game_history.GameSnapshot plus the dice RNG state into bytes."""
+    rows, cols = len(snapshot.cards), len(snapshot.cards[0])
+    hand_rows, hand_cols = len(snapshot.hand), len(snapshot.hand[0])
+    bits = shift = 0
+    for row in snapshot.cards:
+        for card in row:
+            if card is not None: bits |= _card_field(card) << shift
+            shift += CARD_BITS
+    for row in snapshot.states:
+        for state in row:
+            bits |= state << shift
+            shift += STATE_BITS
+    for row in snapshot.hand:
+        for card in row:
+            if card is not None: bits |= _card_field(card) << shift
+            shift += CARD_BITS
+    bits |= (snapshot.position[0] * cols + snapshot.position[1]) << shift
+    shift += CELL_BITS
+    bits |= int(snapshot.skip_turn) << shift
+    shift += 1
+
+    data = bytearray(FILE_MAGIC)
+    data += _HEADER.pack(FORMAT_VERSION, rows, cols, hand_rows, hand_cols, rng_state)
+    data += bits.to_bytes((shift + 7) // 8, "little")
+    data += _CRC.pack(zlib.crc32(data))
+    return bytes(data)
+
+def _card_field(card):
+    value = card_to_uid(card) + 1
+    if value >> CARD_BITS: raise ValueError(f"Card {card!r} (uid {value - 1}) does not fit the {CARD_BITS}-bit card field of a save.")
+    return value
+
+def decode_save(data):
+    """Returns (GameSnapshot, dice RNG state) from encode_save() bytes. Raises SaveGameError."""
+    body_start = len(FILE_MAGIC) + _HEADER.size
+    if len(data) < body_start + _CRC.size or not data.startswith(FILE_MAGIC):
+        raise SaveGameError("Not a save file.")
+    if _CRC.unpack_from(data, len(data) - _CRC.size)[0] != zlib.crc32(data[:-_CRC.size]):
+        raise SaveGameError("Save file is corrupted (checksum mismatch).")
+    version, rows, cols, hand_rows, hand_cols, rng_state = _HEADER.unpack_from(data, len(FILE_MAGIC))
+    if version != FORMAT_VERSION:
+        raise SaveGameError(f"Unsupported save format version {version}.")
+    if (rows, cols, hand_rows, hand_cols) != (config.ROWS, config.COLUMNS, config.HAND_ROWS, config.HAND_COLS):
+        raise SaveGameError(f"Save is for a {rows}x{cols} grid / {hand_rows}x{hand_cols} hand, not the configured one.")
+
+    bits = int.from_bytes(data[body_start:-_CRC.size], "little")
+    card_mask, state_mask = (1 << CARD_BITS) - 1, (1 << STATE_BITS) - 1
+    cards = []
+    for _ in range(rows):
+        row = []
+        for _ in range(cols):
+            uid = bits & card_mask
+            row.append(card_from_uid(uid - 1) if uid else None)
+            bits >>= CARD_BITS
+        cards.append(row)
+    states = []
+    for _ in range(rows):
+        row = []
+        for _ in range(cols):
+            row.append(bits & state_mask)
+            bits >>= STATE_BITS
+        states.append(row)
+    hand = []
+    for _ in range(hand_rows):
+        row = []
+        for _ in range(hand_cols):
+            uid = bits & card_mask
+            row.append(card_from_uid(uid - 1) if uid else None)
+            bits >>= CARD_BITS
+        hand.append(row)
+    cell = bits & ((1 << CELL_BITS) - 1)
+    bits >>= CELL_BITS
+    skip_turn = bool(bits & 1)
+    if cell >= rows * cols or any(state > config.STATE_ACTION_TAKEN for row in states for state in row):
+        raise SaveGameError("Save file contains an invalid state.")
+    return game_history.capture(cards, states, hand, divmod(cell, cols), skip_turn), rng_state
+
+
+# --- File I/O ---
+def write_atomic(path, data):
+    """Writes data to path via a temporary file and os.replace, so a crash never leaves a half-written save."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def read_save(path):
+    """Returns (GameSnapshot, dice RNG state) from a save file. Raises OSError or SaveGameError."""
+    with open(path, "rb") as f:
+        return decode_save(f.read())
+
+
+class SaveWriter:
+    """
+    Write-behind saver. The UI thread hands over the latest state; a background thread
+    encodes and writes it. States handed over while a write is running replace each other,
+    so only the newest one is written next and a burst of moves costs one write.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._pending = None
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="jl-autosave", daemon=True)
+        self._thread.start()
+
+    def put(self, snapshot, rng_state):
+        with self._cond:
+            self._pending = (snapshot, rng_state)
+            self._cond.notify()
+
+    def close(self, timeout=5.0):
+        """Writes the last state handed over (if any) and stops the thread."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closing: self._cond.wait()
+                pending, self._pending = self._pending, None
+                closing = self._closing
+            if pending is not None:
+                try: write_atomic(self.path, encode_save(*pending))
+                except (OSError, ValueError) as e: _log.error(f"Autosave to {self.path} failed: {e}")
+            if closing and pending is None: return
+
+
+# --- Loading ---
+def load_autosave(path=None):
+    """Returns (GameSnapshot, dice RNG state) of the saved game, or None if there is no usable save."""
+    path = path or config.SAVE_FILE
+    try:
+        return read_save(path)
+    except FileNotFoundError:
+        if _log.info_on: _log.info(f"No saved game at {path}.")
+    except (OSError, SaveGameError) as e:
+        _log.warning(f"Could not load saved game {path}: {e}")
+    return None
+
+# --- END OF FILE savegame.py ---
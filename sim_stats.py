@@ -0,0 +1,331 @@
+# --- START OF FILE sim_stats.py ---
+
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import utils
+import bot
+from card_logic import card_from_uid
+from combat import logic as combat_logic
+from combat import advisor as combat_advisor
+from game_events import EV_COMBAT_START, EV_VALUE_CARD, EV_DICE, EV_OUTCOME
+import log
+
+_log = log.get_logger("workers")
+
+# Streaming statistics for batch simulations. Records are folded into fixed-size
+# accumulators as they are produced and never stored, so memory stays constant however
+# many games run. Every accumulator has merge(), so worker processes aggregate their own
+# share and the parent merges the partial results (they pickle as plain objects).
+#
+#     python sim_stats.py GAMES [WORKERS]    simulate GAMES reference-bot games and print the report
+
+
+# --- Accumulators ---
+class RunningStats:
+    """Count, mean, variance (Welford), min and max of a stream of numbers."""
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min: self.min = x
+        if x > self.max: self.max = x
+
+    def merge(self, other):
+        """Folds in another RunningStats (Chan et al. pairwise update)."""
+        if not other.count: return
+        if not self.count:
+            self.count, self.mean, self._m2, self.min, self.max = other.count, other.mean, other._m2, other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Sample variance (0 for fewer than two values)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def __getstate__(self):
+        return (self.count, self.mean, self._m2, self.min, self.max)
+
+    def __setstate__(self, state):
+        self.count, self.mean, self._m2, self.min, self.max = state
+
+
+class Histogram:
+    """Fixed-width bins over [low, high), plus underflow and overflow counts."""
+    def __init__(self, low, high, bins):
+        self.low = low
+        self.high = high
+        self.width = (high - low) / bins
+        self.counts = [0] * bins
+        self.underflow = self.overflow = 0
+
+    def add(self, x, weight=1):
+        if x < self.low: self.underflow += weight
+        elif x >= self.high: self.overflow += weight
+        else: self.counts[int((x - self.low) / self.width)] += weight
+
+    def merge(self, other):
+        if (other.low, other.high, len(other.counts)) != (self.low, self.high, len(self.counts)):
+            raise ValueError("Cannot merge histograms with different bins.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    def total(self):
+        return sum(self.counts) + self.underflow + self.overflow
+
+    def bin_edges(self, index):
+        return self.low + index * self.width, self.low + (index + 1) * self.width
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) for streaming quantiles. Values are buffered and merged
+    into at most ~compression centroids; centroids near the tails are kept small, so
+    extreme quantiles stay accurate.
+    """
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+        self._buffer_limit = 5 * compression
+
+    def add(self, x, weight=1):
+        self._buffer.append((x, weight))
+        self.count += weight
+        if x < self.min: self.min = x
+        if x > self.max: self.max = x
+        if len(self._buffer) >= self._buffer_limit: self._compress()
+
+    def merge(self, other):
+        other._compress()
+        self._buffer.extend(zip(other.means, other.weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _k(self, q):
+        """Scale function k1: centroid size limit shrinks towards q = 0 and q = 1."""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self):
+        if not self._buffer: return
+        points = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+        means, weights = [], []
+        mean, weight = points[0]
+        cumulative = 0 # Weight before the current centroid
+        k_low = self._k(0.0)
+        for x, w in points[1:]:
+            if self._k((cumulative + weight + w) / total) - k_low <= 1:
+                weight += w
+                mean += (x - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                cumulative += weight
+                k_low = self._k(cumulative / total)
+                mean, weight = x, w
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q):
+        """Estimated q-quantile (0 <= q <= 1), interpolating between centroid centres."""
+        self._compress()
+        if not self.means: return math.nan
+        if len(self.means) == 1: return self.means[0]
+        target = q * self.count
+        cumulative = 0.0
+        previous_centre, previous_mean = 0.0, self.min
+        for mean, weight in zip(self.means, self.weights):
+            centre = cumulative + weight / 2
+            if target < centre:
+                if centre == previous_centre: return mean
+                return previous_mean + (mean - previous_mean) * (target - previous_centre) / (centre - previous_centre)
+            previous_centre, previous_mean = centre, mean
+            cumulative += weight
+        if cumulative == previous_centre: return self.max
+        return previous_mean + (self.max - previous_mean) * (target - previous_centre) / (cumulative - previous_centre)
+
+    def __getstate__(self):
+        self._compress()
+        return {key: value for key, value in self.__dict__.items()}
+
+
+# --- Simulation Aggregate ---
+MAX_COMBAT_VALUE = combat_advisor.MAX_COMBAT_VALUE
+
+class SimulationStats:
+    """
+    Everything a batch simulation reports, in constant memory:
+      - per defender value: fights and wins as histograms over the attacker value,
+      - per number of difference dice: win rate (RunningStats of 0/1) and a histogram of
+        how many distinct faces the difference dice showed,
+      - per game: win count, turns (RunningStats + t-digest quantiles) and lost fights.
+    """
+    def __init__(self):
+        self.fights_by_defender = {}
+        self.wins_by_defender = {}
+        self.wins_by_dice = {}
+        self.faces_by_dice = {}
+        self.auto_wins = 0
+        self.games = 0
+        self.games_won = 0
+        self.turns = RunningStats()
+        self.turn_quantiles = TDigest()
+        self.fights_lost = RunningStats()
+
+    def add_combat(self, attacker_total, defender_total, num_diff_dice, won, diff_rolls=()):
+        if defender_total not in self.fights_by_defender:
+            self.fights_by_defender[defender_total] = Histogram(0, MAX_COMBAT_VALUE + 1, MAX_COMBAT_VALUE + 1)
+            self.wins_by_defender[defender_total] = Histogram(0, MAX_COMBAT_VALUE + 1, MAX_COMBAT_VALUE + 1)
+        self.fights_by_defender[defender_total].add(attacker_total)
+        if won: self.wins_by_defender[defender_total].add(attacker_total)
+        if num_diff_dice == 0:
+            self.auto_wins += 1
+            return
+        if num_diff_dice not in self.wins_by_dice:
+            self.wins_by_dice[num_diff_dice] = RunningStats()
+            self.faces_by_dice[num_diff_dice] = Histogram(1, 7, 6)
+        self.wins_by_dice[num_diff_dice].add(1.0 if won else 0.0)
+        self.faces_by_dice[num_diff_dice].add(len(set(diff_rolls)))
+
+    def add_game(self, result):
+        """Folds in a bot.GameResult."""
+        self.games += 1
+        self.games_won += result.won
+        self.turns.add(result.turns)
+        self.turn_quantiles.add(result.turns)
+        self.fights_lost.add(result.fights_lost)
+
+    def merge(self, other):
+        for defender, histogram in other.fights_by_defender.items():
+            if defender in self.fights_by_defender:
+                self.fights_by_defender[defender].merge(histogram)
+                self.wins_by_defender[defender].merge(other.wins_by_defender[defender])
+            else:
+                self.fights_by_defender[defender] = histogram
+                self.wins_by_defender[defender] = other.wins_by_defender[defender]
+        for dice, stats in other.wins_by_dice.items():
+            if dice in self.wins_by_dice:
+                self.wins_by_dice[dice].merge(stats)
+                self.faces_by_dice[dice].merge(other.faces_by_dice[dice])
+            else:
+                self.wins_by_dice[dice] = stats
+                self.faces_by_dice[dice] = other.faces_by_dice[dice]
+        self.auto_wins += other.auto_wins
+        self.games += other.games
+        self.games_won += other.games_won
+        self.turns.merge(other.turns)
+        self.turn_quantiles.merge(other.turn_quantiles)
+        self.fights_lost.merge(other.fights_lost)
+        return self
+
+    def report(self):
+        """The aggregate as a plain-text report."""
+        lines = [f"Games: {self.games}, won {self.games_won} ({self.games_won / max(self.games, 1):.1%})"]
+        if self.turns.count:
+            quantiles = ", ".join(f"p{int(q * 100)} {self.turn_quantiles.quantile(q):.1f}" for q in (0.1, 0.5, 0.9, 0.99))
+            lines.append(f"Turns: mean {self.turns.mean:.2f} (sd {self.turns.stddev:.2f}, min {self.turns.min}, max {self.turns.max}); {quantiles}")
+            lines.append(f"Lost fights per game: mean {self.fights_lost.mean:.2f} (sd {self.fights_lost.stddev:.2f})")
+        lines.append(f"Fights won automatically: {self.auto_wins}")
+        lines.append("Dice fights by difference dice:  fights  win rate (exact)  distinct faces 1..6")
+        for dice in sorted(self.wins_by_dice):
+            stats = self.wins_by_dice[dice]
+            faces = " ".join(f"{count:>6}" for count in self.faces_by_dice[dice].counts)
+            lines.append(f"  {dice} dice: {stats.count:>12}  {stats.mean:7.2%} ({(5 / 6) ** dice:6.2%})  {faces}")
+        lines.append("Win rate by defender value (fights):")
+        for defender in sorted(self.fights_by_defender):
+            fights = self.fights_by_defender[defender]
+            wins = self.wins_by_defender[defender]
+            cells = [f"{attacker}: {wins.counts[attacker] / count:.0%} ({count})"
+                     for attacker, count in enumerate(fights.counts) if count]
+            lines.append(f"  vs {defender:>2}: " + ", ".join(cells))
+        return "\n".join(lines)
+
+
+# --- Simulation ---
+class CombatCollector:
+    """on_event handler for bot.play_game: turns the engine's events into add_combat() calls."""
+    def __init__(self, stats, grid_cards):
+        self.stats = stats
+        self.grid_cards = grid_cards # Cards never move on the grid, so the dealt card is the defender
+        self._defender = self._attacker = 0
+        self._rolls = ()
+
+    def __call__(self, kind, *payload):
+        if kind == EV_COMBAT_START:
+            self._defender = combat_logic.get_card_combat_value(self.grid_cards[payload[0]])
+        elif kind == EV_VALUE_CARD:
+            self._attacker = combat_logic.get_card_combat_value(card_from_uid(payload[0] - 1)) if payload[0] else 0
+            self._rolls = ()
+        elif kind == EV_DICE:
+            self._rolls = payload[:-1]
+        elif kind == EV_OUTCOME:
+            num_diff_dice = combat_logic.get_num_diff_dice(self._attacker, self._defender)
+            self.stats.add_combat(self._attacker, self._defender, num_diff_dice, bool(payload[0]), self._rolls)
+
+def simulate_games(num_games, seed):
+    """Plays num_games reference-bot games (deals and dice from seed). Returns their SimulationStats."""
+    from difficulty import candidate_deals
+    stats = SimulationStats()
+    dice_rng = utils.DiceRng(seed)
+    deals = candidate_deals(seed)
+    for _ in range(num_games):
+        grid_cards = next(deals)
+        stats.add_game(bot.play_game(grid_cards, dice_rng, on_event=CombatCollector(stats, grid_cards)))
+    return stats
+
+def run_simulation(num_games, max_workers=None, chunk_size=250, seed=0):
+    """Splits num_games over a process pool and merges the partial stats as they come back."""
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = [(min(chunk_size, num_games - start), seed + index) for index, start in enumerate(range(0, num_games, chunk_size))]
+    total = SimulationStats()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for partial in pool.map(simulate_games, *zip(*chunks)):
+            total.merge(partial)
+    return total
+
+def main(argv):
+    if not argv:
+        print("Usage: python sim_stats.py GAMES [WORKERS]")
+        return
+    start = time.perf_counter()
+    stats = run_simulation(int(argv[0]), int(argv[1]) if len(argv) > 1 else None)
+    print(stats.report())
+    print(f"({time.perf_counter() - start:.1f} s)")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+
+# --- END OF FILE sim_stats.py ---
@@ -0,0 +1,86 @@
+# --- START OF FILE tk_photo.py ---
+
+import io
+import time
+import tkinter as tk
+from PIL import Image, ImageTk
+import config
+import log
+
+_log = log.get_logger("assets")
+
+# PIL -> Tk image conversion. ImageTk.PhotoImage hands the pixels to Tk through its own
+# photo-block path; Tk can also decode a whole image from bytes in one call, as binary PPM
+# (opaque images only: a header plus the raw RGB bytes, no encoding work) or as
+# uncompressed PNG (keeps the alpha channel). Which is fastest depends on the platform and
+# Tk build, so with TK_IMAGE_CONVERSION = "auto" each path is timed once per process on a
+# card-sized sample and the fastest one is used from then on (separately for opaque images
+# and images with transparency).
+
+METHODS = ("imagetk", "ppm", "png")
+ALPHA_METHODS = ("imagetk", "png") # PPM has no alpha channel
+
+_chosen = {} # has alpha -> method
+
+
+def has_alpha(image):
+    """True if some pixel of image is not fully opaque."""
+    if image.mode not in ("RGBA", "LA", "PA"): return "transparency" in image.info
+    return image.getchannel("A").getextrema()[0] < 255
+
+def encode(image, method):
+    """The bytes Tk decodes for method "ppm" or "png"."""
+    if method == "ppm":
+        rgb = image if image.mode == "RGB" else image.convert("RGB")
+        return b"P6 %d %d 255\n" % rgb.size + rgb.tobytes()
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=0) # Stored, not deflated: Tk inflates nothing
+    return buffer.getvalue()
+
+def convert(image, method, master=None):
+    """PhotoImage of a PIL image by one specific method."""
+    if method == "imagetk": return ImageTk.PhotoImage(image, master=master)
+    return tk.PhotoImage(master=master, data=encode(image, method), format=method)
+
+def photo_image(image, master=None):
+    """PhotoImage of a PIL image by the fastest conversion here (see config.TK_IMAGE_CONVERSION)."""
+    alpha = has_alpha(image)
+    method = config.TK_IMAGE_CONVERSION
+    if method == "auto":
+        method = _chosen.get(alpha)
+        if method is None: method = _chosen[alpha] = choose_method(alpha, master)
+    elif method == "ppm" and alpha:
+        method = "png"
+    return convert(image, method, master)
+
+
+# --- Choosing The Path ---
+def sample_image(size, alpha):
+    """Noise image of size (compresses like a card, not like a flat colour), with transparent corners if alpha."""
+    image = Image.effect_noise(size, 64).convert("RGBA" if alpha else "RGB")
+    if alpha:
+        mask = Image.new("L", size, 255)
+        for x, y in ((0, 0), (size[0] - 1, 0), (0, size[1] - 1), (size[0] - 1, size[1] - 1)): mask.putpixel((x, y), 0)
+        image.putalpha(mask)
+    return image
+
+def time_method(method, image, master=None, repeats=5):
+    """Best time (seconds) of repeats conversions of image by method, encoding included."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        convert(image, method, master)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def choose_method(alpha, master=None, size=(160, 232)):
+    """Times every usable method on a card-sized sample and returns the fastest."""
+    sample = sample_image(size, alpha)
+    timings = {method: time_method(method, sample, master) for method in (ALPHA_METHODS if alpha else METHODS)}
+    best = min(timings, key=timings.get)
+    if _log.info_on:
+        _log.info(f"Tk image conversion ({'with' if alpha else 'no'} alpha): {best} "
+                  f"({', '.join(f'{m} {t * 1e3:.2f} ms' for m, t in timings.items())})")
+    return best
+
+# --- END OF FILE tk_photo.py ---
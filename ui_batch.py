@@ -0,0 +1,82 @@
+# --- START OF FILE ui_batch.py ---
+
+import log
+
+_log = log.get_logger("ui")
+
+# Batched widget updates. Rule code (e.g. combat.effects resolving a fight) records its
+# widget changes in the game's UiBatch instead of touching the widgets; the batch applies
+# them all in one idle callback, so a whole fight resolution reaches the screen in a single
+# frame. Repeated changes to the same widget are merged (the last value of each option
+# wins, the last geometry call wins), and coalesced calls with the same key - e.g. one hand
+# redraw for several hand changes - run once, after the widget changes.
+# Without a root (headless sessions) every change is applied immediately.
+
+
+class UiBatch:
+    """Pending widget changes of one game, applied together by flush() (scheduled on idle)."""
+    def __init__(self, root=None):
+        self.root = root
+        self._widgets = {} # id(widget) -> [widget, options, geometry] (geometry: None, ("grid", options) or ("grid_forget",))
+        self._calls = {}   # key -> function
+        self._after_id = None
+        self.requested = 0 # Changes recorded / widget writes made, since creation
+        self.applied = 0
+
+    # --- Recording ---
+    def config(self, widget, **options):
+        """widget.config(**options), merged with any pending options for the widget."""
+        self._entry(widget)[1].update(options)
+        self._changed()
+
+    def grid(self, widget, **options):
+        self._entry(widget)[2] = ("grid", options)
+        self._changed()
+
+    def grid_forget(self, widget):
+        self._entry(widget)[2] = ("grid_forget",)
+        self._changed()
+
+    def call(self, key, function):
+        """Runs function() once in the next flush, however often it is requested under key."""
+        self._calls[key] = function
+        self._changed()
+
+    def _entry(self, widget):
+        entry = self._widgets.get(id(widget))
+        if entry is None:
+            entry = self._widgets[id(widget)] = [widget, {}, None]
+        return entry
+
+    def _changed(self):
+        self.requested += 1
+        if self.root is None:
+            self.flush()
+        elif self._after_id is None:
+            self._after_id = self.root.after_idle(self.flush)
+
+    # --- Applying ---
+    def flush(self):
+        """Applies every pending change now. Call before code that writes the same widgets directly."""
+        if self._after_id is not None:
+            if self.root is not None: self.root.after_cancel(self._after_id)
+            self._after_id = None
+        widgets, calls = self._widgets, self._calls
+        self._widgets, self._calls = {}, {}
+        writes = 0
+        for widget, options, geometry in widgets.values():
+            if not widget.winfo_exists(): continue
+            if options:
+                widget.config(**options)
+                writes += 1
+            if geometry is not None:
+                if geometry[0] == "grid": widget.grid(**geometry[1])
+                else: widget.grid_forget()
+                writes += 1
+        for function in calls.values():
+            function()
+            writes += 1
+        self.applied += writes
+        if _log.debug_on and writes: _log.debug(f"UI batch: {writes} widget updates applied ({self.requested} requested so far, {self.applied} applied).")
+
+# --- END OF FILE ui_batch.py ---
@@ -1,7 +1,7 @@
 # --- START OF FILE ui_manager.py ---
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import config
 
 # (create_main_window, setup_layout remain the same)
@@ -52,6 +52,60 @@ def setup_info_panel_content(info_frame, player_identity_text="Player Info"):
 
     return info_text_var # Return the StringVar for future updates
 
+def setup_animation_speed_control(info_frame, on_change):
+    """Adds the 1x / 2x / Instant animation speed selector. Returns its StringVar."""
+    speed_frame = tk.Frame(info_frame, bg=info_frame.cget('bg'))
+    speed_frame.pack(anchor='n', pady=(0, 5))
+    tk.Label(speed_frame, text="Animation speed:", font=("Arial", 10), fg="light grey", bg=info_frame.cget('bg')).pack(side=tk.LEFT, padx=(0, 5))
+
+    speed_var = tk.StringVar(value=config.DEFAULT_ANIMATION_SPEED)
+    for speed_name in config.ANIMATION_SPEEDS:
+        tk.Radiobutton(speed_frame, text=speed_name, variable=speed_var, value=speed_name,
+                       command=lambda: on_change(speed_var.get()),
+                       font=("Arial", 10), fg="light grey", bg=info_frame.cget('bg'),
+                       selectcolor="grey30", activebackground=info_frame.cget('bg'),
+                       highlightthickness=0).pack(side=tk.LEFT)
+    tk.Label(info_frame, text="(Click or press Esc to skip an animation)", font=("Arial", 9),
+             fg="grey60", bg=info_frame.cget('bg')).pack(anchor='n')
+    return speed_var
+
+def setup_undo_controls(info_frame, on_undo, on_redo):
+    """Adds Undo / Redo buttons (also on Ctrl+Z / Ctrl+Y)."""
+    undo_frame = tk.Frame(info_frame, bg=info_frame.cget('bg'))
+    undo_frame.pack(anchor='n', pady=(5, 0))
+    tk.Button(undo_frame, text="Undo (Ctrl+Z)", command=on_undo, font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+    tk.Button(undo_frame, text="Redo (Ctrl+Y)", command=on_redo, font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+
+def setup_deal_code_display(info_frame, deal_code):
+    """Shows the deal code in a read-only entry, so it can be selected and copied."""
+    code_frame = tk.Frame(info_frame, bg=info_frame.cget('bg'))
+    code_frame.pack(anchor='n', pady=(5, 0))
+    tk.Label(code_frame, text="Deal:", font=("Arial", 10), fg="light grey", bg=info_frame.cget('bg')).pack(side=tk.LEFT)
+    code_var = tk.StringVar(value=deal_code)
+    tk.Entry(code_frame, textvariable=code_var, state="readonly", width=len(deal_code) + 1,
+             font=("Courier", 9), relief=tk.FLAT).pack(side=tk.LEFT, padx=5)
+
+def setup_hazard_overlay_toggle(info_frame, overlay):
+    """Adds a checkbox for the hazard odds overlay (also on Ctrl+H). Returns the toggle function."""
+    show_var = tk.BooleanVar(value=overlay.enabled)
+    tk.Checkbutton(info_frame, text="Show hazard odds (Ctrl+H)", variable=show_var,
+                   command=lambda: overlay.set_enabled(show_var.get()), font=("Arial", 10),
+                   fg="light grey", bg=info_frame.cget('bg'), selectcolor=info_frame.cget('bg'),
+                   activebackground=info_frame.cget('bg')).pack(anchor='n', pady=(5, 0))
+    def toggle(event=None):
+        show_var.set(not show_var.get())
+        overlay.set_enabled(show_var.get())
+    return toggle
+
+def show_game_summary(root, outcome_text, summary):
+    """End-of-game summary (a game_status.GameStatus.summary() dict) in a message box."""
+    messagebox.showinfo("Game Over", f"{outcome_text}\n\n"
+                        f"Score: {summary['score']}\n"
+                        f"Jokers collected: {summary['jokers']} / 2\n"
+                        f"Cards revealed: {summary['revealed']}\n"
+                        f"Cards cleared: {summary['cleared']}\n"
+                        f"Fights won / lost: {summary['fights_won']} / {summary['fights_lost']}", parent=root)
+
 # (setup_hand_display remains the same)
 def setup_hand_display(info_frame, scaled_width, scaled_height):
     """Creates the hand frame and invisible placeholder slots."""
@@ -0,0 +1,125 @@
+# --- START OF FILE undo_manager.py ---
+
+import tkinter as tk
+import config
+import hand_manager
+import game_history
+import flight_recorder
+from game_events import EV_UNDO, EV_REDO
+import log
+
+_log = log.get_logger("game")
+
+# Unlimited undo/redo for the live game. The game state is checkpointed as an immutable
+# game_history.GameSnapshot after every completed move (reveal, pickup, fight result,
+# cancelled fight); unchanged rows are shared between snapshots. Undo restores the
+# previous snapshot and re-syncs the Tk view, touching only cells and hand slots that differ.
+# Checkpoints are taken at the same points as in game_engine.GameEngine, so undo/redo are
+# recorded in the game log (EV_UNDO / EV_REDO) and replay exactly. Every checkpoint and
+# every undo/redo also autosaves the restored state (see savegame.py) through the GameSession.
+
+
+class UndoManager:
+    """Owns the undo history of one game (a game_session.GameSession) and the view re-sync."""
+    def __init__(self, session, hand_card_slots, assets, hand_bg):
+        self.session = session
+        self.player = session.player
+        self.card_data_grid = session.card_data_grid
+        self.card_state_grid = session.card_state_grid
+        self.button_grid = session.button_grid
+        self.cell_buttons = [row[:] for row in session.button_grid] # Every button ever created (removed ones are only grid_forget-ed)
+        self.hand_card_data = session.hand_card_data
+        self.hand_card_slots = hand_card_slots
+        self.assets = assets
+        self.hand_bg = hand_bg
+        self.combat_pending = False
+        self.history = game_history.UndoHistory()
+        self.history.reset(self._capture())
+
+    def _capture(self):
+        return game_history.capture(self.card_data_grid, self.card_state_grid, self.hand_card_data,
+                                    self.player.position, self.player.should_skip_turn(), self.history.current)
+
+    # --- Checkpoints ---
+    def checkpoint(self):
+        """Records the current state as an undo step (not while a fight is pending)."""
+        if self.combat_pending: return
+        if self.history.commit(self._capture()):
+            if _log.debug_on: _log.debug("Undo checkpoint taken.")
+            self.session.autosave(self.history.current)
+
+    def combat_started(self):
+        self.combat_pending = True
+
+    def combat_finished(self):
+        """Called once a fight is resolved or cancelled (its effects applied)."""
+        self.combat_pending = False
+        self.checkpoint()
+
+    # --- Undo / Redo ---
+    def can_step(self):
+        """Undo/redo wait until no fight is on screen and no flip or dice animation runs."""
+        combat = self.session.combat
+        return (not self.combat_pending and (combat is None or combat.current_view is None)
+                and not self.session.animations.is_running())
+
+    def undo(self, event=None):
+        if not (self.history.can_undo() and self.can_step()): return
+        self.session.record(EV_UNDO)
+        flight_recorder.record("undo")
+        self._apply(self.history.undo())
+
+    def redo(self, event=None):
+        if not (self.history.can_redo() and self.can_step()): return
+        self.session.record(EV_REDO)
+        flight_recorder.record("redo")
+        self._apply(self.history.redo())
+
+    def bind_keys(self, root):
+        """Ctrl+Z undoes, Ctrl+Y / Ctrl+Shift+Z redoes (application-wide: only for a single game per window)."""
+        root.bind_all("<Control-z>", self.undo, add="+")
+        root.bind_all("<Control-y>", self.redo, add="+")
+        root.bind_all("<Control-Z>", self.redo, add="+") # Shift held
+
+    # --- View Re-sync ---
+    def _apply(self, snapshot):
+        """Loads a snapshot into the live grids, hand and player, updating only what differs."""
+        self.session.ui.flush() # Pending batched changes first, so they cannot overwrite the restored view
+        changed_cells = 0
+        for r in range(config.ROWS):
+            card_row, state_row = snapshot.cards[r], snapshot.states[r]
+            for c in range(config.COLUMNS):
+                card, state = card_row[c], state_row[c]
+                if self.card_data_grid[r][c] is card and self.card_state_grid[r][c] == state: continue
+                self.card_data_grid[r][c] = card
+                self.card_state_grid[r][c] = state
+                self._sync_button(r, c, card, state)
+                changed_cells += 1
+
+        self.hand_card_data.restore(snapshot.hand) # Marks differing slots dirty
+        changed_slots = hand_manager.sync_hand_display(self.hand_card_data, self.hand_card_slots,
+                                                       self.assets.get("tk_faces", {}), self.hand_bg)
+        self.player.set_position(*snapshot.position)
+        self.player.set_skip_turn(snapshot.skip_turn)
+        self.session.state_restored() # Tracker (redraws the overlay) and terminal status
+        self.session.autosave(snapshot)
+        if _log.debug_on: _log.debug(f"Restored snapshot: {changed_cells} cells, {changed_slots} hand slots updated.")
+
+    def _sync_button(self, r, c, card, state):
+        button = self.cell_buttons[r][c]
+        if button is None or not button.winfo_exists(): return
+        if card is None: # Card taken off the grid
+            button.grid_forget()
+            self.button_grid[r][c] = None
+            return
+        if self.button_grid[r][c] is None: # Card is back on the grid
+            button.grid(row=r, column=c, padx=1, pady=1)
+            self.button_grid[r][c] = button
+        if state == config.STATE_FACE_DOWN:
+            image = self.assets.get("tk_photo_back")
+        else:
+            image = self.assets.get("tk_faces", {}).get(f"{str(card.get_suit()).lower()}_{str(card.get_rank_string()).lower()}")
+        button.config(image=image or '', text='', state=tk.DISABLED if state == config.STATE_ACTION_TAKEN else tk.NORMAL)
+        button.image = image
+
+# --- END OF FILE undo_manager.py ---
@@ -34,13 +34,41 @@ def simple_print_grid(grid_to_print, title="Grid", cols=None):
         print()
     print("-" * (num_cols * (max_len + 2) + 5) + "\n")
 
-# --- ADDED Missing Dice Rolling Function ---
-def roll_dice(num_dice):
-    """ Rolls a specified number of standard 6-sided dice. """
+# --- Dice RNG ---
+class DiceRng:
+    """
+    xorshift64* generator for the combat dice. Its whole state is one 64-bit int,
+    so savegame can store it in 8 bytes and a resumed game rolls the same dice.
+    """
+    _MASK = (1 << 64) - 1
+
+    def __init__(self, seed=None):
+        self.state = 0
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        if seed is None: seed = random.getrandbits(64)
+        self.state = (seed & self._MASK) or 0x9E3779B97F4A7C15 # Zero is a fixed point of xorshift
+
+    def next64(self):
+        x = self.state
+        x ^= x >> 12
+        x ^= (x << 25) & self._MASK
+        x ^= x >> 27
+        self.state = x
+        return (x * 0x2545F4914F6CDD1D) & self._MASK
+
+    def randint(self, low, high):
+        """Uniform int in [low, high] (the modulo bias is below 2**-58 for dice)."""
+        return low + (self.next64() >> 11) % (high - low + 1)
+
+DICE_RNG = DiceRng() # Default dice for callers without a game_session.GameSession
+
+def roll_dice(num_dice, rng=None):
+    """ Rolls a specified number of standard 6-sided dice (from DICE_RNG by default). """
     if num_dice <= 0:
         return []
-    # Ensure random is imported at the top
-    return [random.randint(1, 6) for _ in range(num_dice)]
-# -----------------------------------------
+    rng = rng or DICE_RNG
+    return [rng.randint(1, 6) for _ in range(num_dice)]
 
 # --- END OF FILE utils.py ---
\ No newline at end of file
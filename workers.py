@@ -0,0 +1,156 @@
+# --- START OF FILE workers.py ---
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError
+import config
+import log
+
+_log = log.get_logger("workers")
+
+# Tkinter is NOT thread safe: worker code must never touch widgets. Results, errors and
+# progress updates are queued here and delivered on the main thread by a single
+# root.after poller (WorkerService._pump), so callbacks may freely update the UI.
+
+
+class JobContext:
+    """Handed to thread jobs that ask for it (with_context=True): progress + cancellation."""
+    def __init__(self, job):
+        self._job = job
+
+    def report_progress(self, value):
+        """Queues a progress value; on_progress runs later on the main thread."""
+        if self._job.on_progress and not self._job.is_cancelled():
+            self._job.service._results.put((self._job, "progress", value))
+
+    def is_cancelled(self):
+        """Long-running jobs should poll this and return early when True."""
+        return self._job.is_cancelled()
+
+
+class Job:
+    """Handle for a submitted job: wraps the concurrent.futures Future."""
+    def __init__(self, service, name, on_done, on_error, on_progress):
+        self.service = service
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Cancels the job. Queued jobs never start; running thread jobs see is_cancelled()."""
+        self._cancel_event.set()
+        if self.future: self.future.cancel()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class WorkerService:
+    """Small executor service (thread + process pools) with a main-thread result pump."""
+    def __init__(self, root, max_threads=None, max_processes=None):
+        self.root = root
+        self.max_threads = max_threads or config.WORKER_MAX_THREADS
+        self.max_processes = max_processes or config.WORKER_MAX_PROCESSES
+        self._thread_pool = None # Created lazily
+        self._process_pool = None # Created lazily (spawning processes is slow)
+        self._results = queue.Queue()
+        self._pending = 0
+        self._after_id = None
+        self._shut_down = False
+
+    # --- Submitting Work ---
+    def submit(self, fn, *args, name=None, on_done=None, on_error=None, on_progress=None,
+               use_process=False, with_context=False, **kwargs):
+        """
+        Runs fn(*args, **kwargs) off the main thread.
+        Args:
+            on_done(result) / on_error(exception) / on_progress(value): main-thread callbacks.
+            use_process: Run in the process pool (CPU-heavy work; fn and args must pickle).
+            with_context: Pass a JobContext as the 'context' keyword (thread jobs only).
+        Returns:
+            Job: handle with cancel() / done().
+        """
+        if self._shut_down: raise RuntimeError("WorkerService has been shut down.")
+        job = Job(self, name or getattr(fn, "__name__", "job"), on_done, on_error, on_progress)
+        if use_process:
+            if with_context: raise ValueError("Process jobs cannot receive a JobContext.")
+            job.future = self._get_process_pool().submit(fn, *args, **kwargs)
+        else:
+            if with_context: kwargs["context"] = JobContext(job)
+            job.future = self._get_thread_pool().submit(fn, *args, **kwargs)
+        self._pending += 1
+        job.future.add_done_callback(lambda future, j=job: self._results.put((j, "done", future)))
+        self._schedule_pump()
+        return job
+
+    def _get_thread_pool(self):
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="jl-worker")
+        return self._thread_pool
+
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_processes)
+        return self._process_pool
+
+    # --- Main-Thread Result Pump ---
+    def _schedule_pump(self):
+        """Ensures exactly one poller is scheduled while jobs are outstanding."""
+        if self._after_id is None and not self._shut_down:
+            self._after_id = self.root.after(config.WORKER_POLL_INTERVAL, self._pump)
+
+    def _pump(self):
+        """Delivers queued results, but stops after a time budget so animations keep their frame rate."""
+        self._after_id = None
+        deadline = time.perf_counter() + config.WORKER_PUMP_BUDGET_MS / 1000.0
+        while time.perf_counter() < deadline:
+            try: job, kind, payload = self._results.get_nowait()
+            except queue.Empty: break
+            if kind == "progress":
+                if not job.is_cancelled(): self._call(job.on_progress, payload, job)
+                continue
+            self._pending -= 1
+            self._deliver(job, payload)
+        if self._pending > 0 or not self._results.empty():
+            self._schedule_pump()
+
+    def _deliver(self, job, future):
+        if future.cancelled() or job.is_cancelled():
+            return # Cancelled jobs get no callbacks
+        try:
+            result = future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if job.on_error: self._call(job.on_error, e, job)
+            else: _log.warning(f"Background job '{job.name}' failed: {e!r}")
+            return
+        self._call(job.on_done, result, job)
+
+    def _call(self, callback, value, job):
+        if not callback: return
+        try:
+            callback(value)
+        except Exception as e:
+            _log.error(f"Callback for background job '{job.name}' failed: {e!r}")
+
+    # --- Shutdown ---
+    def shutdown(self, wait=False):
+        """Stops the pump and the pools. Call when the main window closes."""
+        self._shut_down = True
+        if self._after_id is not None:
+            try: self.root.after_cancel(self._after_id)
+            except Exception: pass
+            self._after_id = None
+        for pool in (self._thread_pool, self._process_pool):
+            if pool: pool.shutdown(wait=wait, cancel_futures=True)
+        self._thread_pool = self._process_pool = None
+
+# --- END OF FILE workers.py ---